@@ -0,0 +1,80 @@
+"""Compare JSON decode/encode cost of the available codecs on a large invoice list.
+
+Run with ``python benchmarks/json_codec.py [invoices]``.
+"""
+
+import json
+import sys
+import timeit
+
+from dolibarr_mcp.json_codec import CODECS, get_codec
+
+
+def make_invoices(count: int):
+    """Build a list shaped like a Dolibarr ``GET /invoices`` response."""
+    return [
+        {
+            "id": str(i),
+            "ref": f"FA2401-{i:05d}",
+            "socid": str(i % 500),
+            "statut": "1",
+            "date": 1704067200 + i * 3600,
+            "total_ht": f"{i * 10.5:.8f}",
+            "total_tva": f"{i * 2.1:.8f}",
+            "total_ttc": f"{i * 12.6:.8f}",
+            "note_public": "Facture générée automatiquement",
+            "array_options": {},
+            "lines": [
+                {
+                    "id": str(i * 10 + n),
+                    "fk_product": str(n),
+                    "desc": f"Line {n} of invoice {i}",
+                    "qty": "2",
+                    "subprice": "5.25000000",
+                    "tva_tx": "20.000",
+                    "total_ht": "10.50000000",
+                }
+                for n in range(8)
+            ],
+        }
+        for i in range(count)
+    ]
+
+
+def bench(label: str, func, number: int = 5) -> float:
+    seconds = min(timeit.repeat(func, number=number, repeat=3)) / number
+    print(f"  {label:<38} {seconds * 1000:8.1f} ms")
+    return seconds
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    invoices = make_invoices(count)
+    body = json.dumps(invoices).encode("utf-8")
+    print(f"{count} invoices, {len(body) / 1e6:.1f} MB response body\n")
+
+    # Baseline: what the client and server did before the codec layer
+    print("stdlib (previous behaviour)")
+    bench("decode: bytes -> text -> json.loads", lambda: json.loads(body.decode("utf-8")))
+    bench("encode: json.dumps(indent=2)", lambda: json.dumps(invoices, indent=2))
+
+    for name in CODECS:
+        try:
+            codec = get_codec(name)
+        except RuntimeError as exc:
+            print(f"\n{name}: skipped ({exc})")
+            continue
+        if codec.name != name:
+            continue
+        print(f"\n{name}")
+        bench("decode: loads(bytes)", lambda: codec.loads(body))
+        bench("encode: pretty", lambda: codec.dumps(invoices))
+        bench("encode: compact", lambda: codec.dumps(invoices, compact=True))
+        pretty = len(codec.dumps(invoices).encode("utf-8"))
+        compact = len(codec.dumps(invoices, compact=True).encode("utf-8"))
+        print(f"  payload: pretty {pretty / 1e6:.1f} MB, compact {compact / 1e6:.1f} MB "
+              f"({100 * (1 - compact / pretty):.0f}% smaller)")
+
+
+if __name__ == "__main__":
+    main()
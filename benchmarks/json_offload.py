@@ -0,0 +1,71 @@
+"""Measure how long the event loop stalls while a large payload is decoded and re-encoded.
+
+A 1 ms ticker runs next to three decode/encode round trips of a large invoice
+list; the longest gap between ticks is the latency a concurrent small request
+would see. Run with ``python benchmarks/json_offload.py [invoices]``.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from json_codec import make_invoices  # noqa: E402
+
+from dolibarr_mcp.json_codec import CODECS, JsonOffloader, get_codec  # noqa: E402
+
+
+async def measure(offloader: JsonOffloader, body: bytes) -> None:
+    gaps = []
+    done = False
+
+    async def ticker():
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+            if done:
+                break
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    for _ in range(3):
+        data = await offloader.loads(body)
+        await offloader.dumps(data)
+    elapsed = time.perf_counter() - start
+    done = True
+    await task
+
+    mode = offloader.executor if offloader.threshold else "inline"
+    print(f"  {offloader.codec.name:<7} {mode:<8} total {elapsed * 1000:7.0f} ms   "
+          f"max loop stall {max(gaps) * 1000:7.1f} ms")
+
+
+async def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    body = json.dumps(make_invoices(count)).encode("utf-8")
+    print(f"{count} invoices, {len(body) / 1e6:.1f} MB, 3 decode/encode round trips\n")
+
+    for name in CODECS:
+        try:
+            codec = get_codec(name)
+        except RuntimeError:
+            continue
+        if codec.name != name:
+            continue
+        for threshold, executor in ((0, "thread"), (1, "thread"), (1, "process")):
+            offloader = JsonOffloader(codec, threshold=threshold, executor=executor)
+            try:
+                await measure(offloader, body)
+            finally:
+                offloader.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,99 @@
+"""Measure the per-session cost of ``tools/list`` over the HTTP transport.
+
+Each session runs ``initialize``, ``notifications/initialized`` and
+``tools/list`` against the Streamable HTTP app in process, once with the tool
+list rebuilt on every request (the previous behaviour) and once served from
+the prebuilt list. It also times the server-side part alone: the list
+handler plus serializing its result. Run with ``python benchmarks/list_tools.py [sessions]``.
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+import warnings
+
+import httpx
+from mcp import types
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+
+from dolibarr_mcp.dolibarr_mcp_server import _build_http_app, server
+from dolibarr_mcp.tools import TOOLS
+
+PROTOCOL_VERSION = "2025-06-18"
+HEADERS = {"accept": "application/json, text/event-stream", "content-type": "application/json"}
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": PROTOCOL_VERSION,
+        "capabilities": {},
+        "clientInfo": {"name": "benchmark", "version": "0"},
+    },
+}
+
+
+async def run_session(client: httpx.AsyncClient) -> float:
+    """Run one MCP session and return the time spent in ``tools/list``."""
+    response = await client.post("/mcp", json=INITIALIZE, headers=HEADERS)
+    headers = dict(
+        HEADERS,
+        **{"mcp-session-id": response.headers["mcp-session-id"], "mcp-protocol-version": PROTOCOL_VERSION},
+    )
+    await client.post("/mcp", json={"jsonrpc": "2.0", "method": "notifications/initialized"}, headers=headers)
+    start = time.perf_counter()
+    response = await client.post("/mcp", json={"jsonrpc": "2.0", "id": 2, "method": "tools/list"}, headers=headers)
+    elapsed = time.perf_counter() - start
+    assert TOOLS[-1].name in response.text
+    await client.delete("/mcp", headers=headers)
+    return elapsed
+
+
+async def measure(label: str, handler, sessions: int) -> None:
+    server.request_handlers[types.ListToolsRequest] = handler
+    session_manager = StreamableHTTPSessionManager(server, json_response=False, stateless=False)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        app = _build_http_app(session_manager)
+    transport = httpx.ASGITransport(app=app)
+    async with session_manager.run(), httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(20):
+            await run_session(client)
+        start = time.perf_counter()
+        list_times = [await run_session(client) for _ in range(sessions)]
+        total = time.perf_counter() - start
+    print(f"  {label:<8} session {total / sessions * 1000:6.2f} ms   "
+          f"tools/list median {statistics.median(list_times) * 1000:6.3f} ms")
+
+
+async def measure_handler(label: str, handler, number: int = 2000) -> None:
+    request = types.ListToolsRequest(method="tools/list")
+    start = time.perf_counter()
+    for _ in range(number):
+        result = await handler(request)
+        result.model_dump(by_alias=True, mode="json", exclude_none=True)
+    elapsed = (time.perf_counter() - start) / number
+    print(f"  {label:<8} handler + serialization {elapsed * 1000:6.3f} ms")
+
+
+async def main() -> None:
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    prebuilt = server.request_handlers[types.ListToolsRequest]
+
+    @server.list_tools()
+    async def rebuild_tool_list():
+        return [spec.to_tool() for spec in TOOLS]
+
+    rebuilt = server.request_handlers[types.ListToolsRequest]
+    print(f"{len(TOOLS)} tools, {sessions} HTTP sessions\n")
+    for label, handler in (("rebuilt", rebuilt), ("prebuilt", prebuilt)):
+        await measure_handler(label, handler)
+    print()
+    for _ in range(3):
+        await measure("rebuilt", rebuilt, sessions)
+        await measure("prebuilt", prebuilt, sessions)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
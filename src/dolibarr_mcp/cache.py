@@ -0,0 +1,200 @@
+"""In-process response cache for Dolibarr GET requests."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+def split_endpoint(endpoint: str) -> Tuple[str, Optional[str]]:
+    """Return ``(family, entity_path)`` for an endpoint.
+
+    ``invoices/12/lines`` gives ``("invoices", "invoices/12")`` while collection
+    endpoints such as ``invoices`` or ``thirdparties?limit=1`` have no entity.
+    """
+    path = endpoint.split("?", 1)[0].strip("/")
+    parts = path.split("/")
+    family = parts[0] or "root"
+    if len(parts) > 1 and parts[1].isdigit():
+        return family, f"{family}/{parts[1]}"
+    return family, None
+
+
+# Hits after which an entry counts as hot for refresh-ahead
+HOT_ENTRY_HITS = 2
+
+
+class NegativeResult:
+    """Cached marker for a lookup that found nothing, holding the original error."""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: Optional[BaseException] = None):
+        self.error = error
+
+
+class _Entry:
+    """A cached value with its freshness bookkeeping."""
+
+    __slots__ = ("value", "ttl", "expires_at", "stale_until", "hits", "refreshing")
+
+    def __init__(self, value: Any, ttl: float, expires_at: float, stale_until: float):
+        self.value = value
+        self.ttl = ttl
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+        self.hits = 0
+        self.refreshing = False
+
+
+class ResponseCache:
+    """Bounded LRU cache of parsed responses with per-entry expiry.
+
+    Keys are ``(endpoint, params)`` tuples as built by the client. Cached
+    values are shared between callers and must not be mutated.
+
+    Expired entries are still served for ``stale_ttl`` seconds so the caller
+    gets an immediate answer while :meth:`claim_refresh` lets the client
+    revalidate in the background. With ``refresh_ahead`` (a fraction of the
+    TTL) hot entries are refreshed shortly before they expire.
+
+    :class:`NegativeResult` values record not-found lookups. They are never
+    served stale and any write to their resource family drops them.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        stale_ttl: float = 0.0,
+        refresh_ahead: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self.refresh_ahead = refresh_ahead
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple[str, Hashable], _Entry]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple[str, Hashable]) -> Tuple[bool, Any]:
+        """Return ``(found, value)`` for a fresh or still-servable stale entry."""
+        entry = self._entries.get(key)
+        now = self._clock()
+        if entry is None or entry.stale_until <= now:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        entry.hits += 1
+        self.hits += 1
+        if entry.expires_at <= now:
+            self.stale_hits += 1
+        if isinstance(entry.value, NegativeResult):
+            self.negative_hits += 1
+        return True, entry.value
+
+    def claim_refresh(self, key: Tuple[str, Hashable]) -> bool:
+        """Return True once when an entry is stale or hot and close to expiry.
+
+        The caller that gets True owns the refresh and must either store the
+        new value or call :meth:`release_refresh`.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry.refreshing:
+            return False
+        remaining = entry.expires_at - self._clock()
+        hot_and_expiring = (
+            entry.hits >= HOT_ENTRY_HITS and remaining <= entry.ttl * self.refresh_ahead
+        )
+        if remaining > 0 and not hot_and_expiring:
+            return False
+        entry.refreshing = True
+        self.refreshes += 1
+        return True
+
+    def release_refresh(self, key: Tuple[str, Hashable]) -> None:
+        """Allow another refresh after a failed background revalidation."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.refreshing = False
+
+    def generation(self, endpoint: str) -> int:
+        """Return the invalidation counter of the endpoint's family."""
+        return self._generations.get(split_endpoint(endpoint)[0], 0)
+
+    def set(
+        self,
+        key: Tuple[str, Hashable],
+        value: Any,
+        ttl: float,
+        generation: Optional[int] = None,
+    ) -> None:
+        """Store a value for ``ttl`` seconds, evicting the least recently used entries.
+
+        Passing the ``generation`` observed before fetching skips the store when
+        a write invalidated the family in the meantime.
+        """
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        if generation is not None and generation != self.generation(key[0]):
+            return
+        expires_at = self._clock() + ttl
+        stale_ttl = 0.0 if isinstance(value, NegativeResult) else self.stale_ttl
+        self._entries[key] = _Entry(value, ttl, expires_at, expires_at + stale_ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, endpoint: str) -> int:
+        """Drop entries a write to ``endpoint`` may have made stale.
+
+        This covers the written entity and its sub-resources, every collection
+        or search of the same family and all cached not-found results of the
+        family, since the write may have created the missing record. Other
+        entities are kept. Returns the number of dropped entries.
+        """
+        family, entity = split_endpoint(endpoint)
+        self._generations[family] = self._generations.get(family, 0) + 1
+        stale = []
+        for key, entry in self._entries.items():
+            key_family, key_entity = split_endpoint(key[0])
+            if key_family != family:
+                continue
+            if (
+                key_entity is None
+                or key_entity == entity
+                or isinstance(entry.value, NegativeResult)
+            ):
+                stale.append(key)
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss counters for diagnostics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "background_refreshes": self.refreshes,
+            "invalidations": self.invalidations,
+        }
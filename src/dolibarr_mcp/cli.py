@@ -6,7 +6,10 @@ from typing import Optional
 
 import click
 
+from .config import Config
+from .dolibarr_client import DolibarrAPIError, DolibarrClient
 from .dolibarr_mcp_server import main as server_main
+from .export import EXPORT_FORMATS, EXPORT_RESOURCES, export_resource
 from .testing import test_connection as run_test_connection
 
 
@@ -40,6 +43,54 @@ def serve(host: str, port: int):
     asyncio.run(server_main())
 
 
+@cli.command()
+@click.argument("resource", type=click.Choice(sorted(EXPORT_RESOURCES)))
+@click.option("--format", "fmt", type=click.Choice(sorted(EXPORT_FORMATS)), default="ndjson", help="Output format")
+@click.option("--output", "-o", type=click.Path(dir_okay=False), help="Output file (default: <resource>.<format>)")
+@click.option("--fields", help="Comma-separated fields to export (output columns)")
+@click.option("--filter", "sqlfilters", help="Dolibarr SQL filter, e.g. \"(t.fk_statut:=:1)\"")
+@click.option("--page-size", type=int, help="Records per request")
+@click.option("--workers", type=int, default=1, help="Concurrent rowid-range shards (exports with more than 1 cannot be resumed)")
+@click.option("--resume", is_flag=True, help="Continue an interrupted export of the same output file")
+def export(
+    resource: str,
+    fmt: str,
+    output: Optional[str],
+    fields: Optional[str],
+    sqlfilters: Optional[str],
+    page_size: Optional[int],
+    workers: int,
+    resume: bool,
+):
+    """Stream every record of RESOURCE to an NDJSON, CSV, Parquet or Arrow file."""
+    output = output or f"{resource}.{EXPORT_FORMATS[fmt].extension}"
+
+    def report(count: int) -> None:
+        click.echo(f"\r📦 {count} {resource} exported", nl=False, err=True)
+
+    async def run() -> dict:
+        async with DolibarrClient(Config()) as client:
+            return await export_resource(
+                client,
+                resource,
+                output,
+                fmt=fmt,
+                fields=[f.strip() for f in fields.split(",")] if fields else None,
+                sqlfilters=sqlfilters,
+                page_size=page_size,
+                workers=workers,
+                resume=resume,
+                progress=report,
+            )
+
+    try:
+        result = asyncio.run(run())
+    except (DolibarrAPIError, ValueError, RuntimeError) as exc:
+        raise click.ClickException(str(exc)) from exc
+    click.echo(err=True)
+    click.echo(f"✅ Exported {result['records']} {resource} to {result['path']}")
+
+
 @cli.command()
 def version():
     """Show version information."""
@@ -0,0 +1,98 @@
+"""HTTP content-encoding negotiation and incremental decompression."""
+
+import sys
+import zlib
+from typing import Iterator, List, Optional
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the installed extras
+    brotli = None
+
+# Encodings the client can decode, in order of preference
+SUPPORTED_ENCODINGS = ("br", "gzip", "deflate")
+
+# Largest piece of decoded output produced per step, bounding decompression bombs
+MAX_DECODED_PIECE = 256 * 1024
+
+
+def accepted_encodings(setting: str) -> List[str]:
+    """Resolve a ``DOLIBARR_HTTP_COMPRESSION`` value to the encodings to request.
+
+    ``auto`` requests every supported encoding, with brotli only when the
+    package is installed; ``none`` requests uncompressed responses; anything
+    else is a comma-separated list such as ``gzip,deflate``.
+    """
+    setting = (setting or "auto").lower()
+    if setting == "none":
+        return []
+    requested = SUPPORTED_ENCODINGS if setting == "auto" else [e.strip() for e in setting.split(",")]
+    encodings = []
+    for encoding in requested:
+        if encoding == "br" and brotli is None:
+            if setting != "auto":
+                print("⚠️ brotli is not installed, not requesting br responses", file=sys.stderr)
+            continue
+        encodings.append(encoding)
+    return encodings
+
+
+def accept_encoding_header(encodings: List[str]) -> str:
+    """Return the ``Accept-Encoding`` header value for ``encodings``."""
+    return ", ".join(encodings) if encodings else "identity"
+
+
+class ContentDecoder:
+    """Incrementally decode a response body sent with ``Content-Encoding``.
+
+    Unknown or missing encodings are passed through unchanged.
+    """
+
+    def __init__(self, encoding: Optional[str]):
+        self.encoding = (encoding or "identity").strip().lower()
+        if self.encoding == "gzip":
+            self._decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif self.encoding == "deflate":
+            self._decoder = None  # zlib-wrapped or raw, decided on the first chunk
+        elif self.encoding == "br" and brotli is not None:
+            self._decoder = brotli.Decompressor()
+        else:
+            self.encoding = "identity"
+            self._decoder = None
+
+    @property
+    def compressed(self) -> bool:
+        """Whether the body is actually being decompressed."""
+        return self.encoding != "identity"
+
+    def decompress(self, chunk: bytes) -> Iterator[bytes]:
+        """Yield the decoded bytes of ``chunk`` in pieces of bounded size.
+
+        Brotli output is not bounded per piece.
+        """
+        if self.encoding == "identity":
+            yield chunk
+            return
+        if self.encoding == "deflate" and self._decoder is None:
+            # Servers disagree on whether "deflate" carries a zlib header
+            wrapped = len(chunk) >= 2 and (chunk[0] & 0x0F) == 8 and ((chunk[0] << 8) | chunk[1]) % 31 == 0
+            self._decoder = zlib.decompressobj(zlib.MAX_WBITS if wrapped else -zlib.MAX_WBITS)
+        try:
+            if self.encoding == "br":
+                yield self._decoder.process(chunk)
+                return
+            yield self._decoder.decompress(chunk, MAX_DECODED_PIECE)
+            while self._decoder.unconsumed_tail:
+                yield self._decoder.decompress(self._decoder.unconsumed_tail, MAX_DECODED_PIECE)
+        except zlib.error as e:
+            raise ValueError(f"Invalid {self.encoding} response body: {e}") from e
+        except Exception as e:
+            if brotli is not None and isinstance(e, brotli.error):
+                raise ValueError(f"Invalid br response body: {e}") from e
+            raise
+
+    def flush(self) -> bytes:
+        """Return any decoded bytes still buffered at end of body."""
+        if self.encoding in ("gzip", "deflate") and self._decoder is not None:
+            return self._decoder.flush()
+        return b""
@@ -2,13 +2,45 @@
 
 import os
 import sys
+from typing import Dict, Optional
 
 from pydantic import AliasChoices, Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from dotenv import load_dotenv
+from dotenv import dotenv_values, find_dotenv, load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+from .profiles import DEFAULT_TOOL_PROFILE, TOOL_PROFILES
+
+# Load environment variables from .env file; variables already set in the
+# process environment take precedence and are never overwritten
+_DOTENV_PATH = find_dotenv()
+_PROCESS_ENV = frozenset(os.environ)
+load_dotenv(_DOTENV_PATH)
+_dotenv_keys = {key for key in dotenv_values(_DOTENV_PATH) if key not in _PROCESS_ENV} if _DOTENV_PATH else set()
+
+
+def env_file_path() -> Optional[str]:
+    """Return the path of the .env file the configuration is read from, if any."""
+    if _DOTENV_PATH:
+        return _DOTENV_PATH
+    return os.path.abspath(".env") if os.path.exists(".env") else None
+
+
+def reload_env_file() -> None:
+    """Re-read the .env file into the environment before a configuration reload.
+
+    Variables defined by the process environment at startup keep precedence;
+    variables removed from the file are removed from the environment.
+    """
+    global _dotenv_keys
+    path = env_file_path()
+    values = dotenv_values(path) if path else {}
+    loaded = {key for key in values if key not in _PROCESS_ENV}
+    for key in _dotenv_keys - loaded:
+        os.environ.pop(key, None)
+    for key in loaded:
+        if values[key] is not None:
+            os.environ[key] = values[key]
+    _dotenv_keys = loaded
 
 
 class Config(BaseSettings):
@@ -53,6 +85,201 @@ class Config(BaseSettings):
         default=8080,
     )
 
+    mcp_config_watch_interval: float = Field(
+        description="Seconds between checks of the .env file for changes that trigger a reload (0 = disabled)",
+        default=0.0,
+    )
+
+    mcp_tool_profile: str = Field(
+        description="Named set of tools exposed by the server (full, readonly, invoicing, crm)",
+        default=DEFAULT_TOOL_PROFILE,
+    )
+
+    dolibarr_http_pool_limit: int = Field(
+        description="Maximum number of simultaneous connections to Dolibarr (0 = unlimited)",
+        default=100,
+    )
+
+    dolibarr_http_pool_limit_per_host: int = Field(
+        description="Maximum number of simultaneous connections per Dolibarr host (0 = unlimited)",
+        default=0,
+    )
+
+    dolibarr_http_keepalive_timeout: float = Field(
+        description="Seconds an idle keep-alive connection to Dolibarr stays in the pool",
+        default=15.0,
+    )
+
+    dolibarr_http_dns_cache_ttl: int = Field(
+        description="Seconds resolved Dolibarr host addresses are cached (0 = disabled)",
+        default=10,
+    )
+
+    dolibarr_http_verify_ssl: bool = Field(
+        description="Verify the Dolibarr TLS certificate",
+        default=True,
+    )
+
+    dolibarr_http_compression: str = Field(
+        description="Response encodings to request: auto, none, or a list such as gzip,deflate,br",
+        default="auto",
+    )
+
+    dolibarr_http_timeout: float = Field(
+        description="Total timeout in seconds for a single Dolibarr request",
+        default=30.0,
+    )
+
+    dolibarr_http_connect_timeout: float = Field(
+        description="Timeout in seconds for acquiring a connection to Dolibarr",
+        default=10.0,
+    )
+
+    dolibarr_retry_max_retries: int = Field(
+        description="Maximum retries for transient Dolibarr failures (0 = disabled)",
+        default=3,
+    )
+
+    dolibarr_retry_backoff_base: float = Field(
+        description="Base delay in seconds for exponential retry backoff",
+        default=0.5,
+    )
+
+    dolibarr_retry_backoff_max: float = Field(
+        description="Upper bound in seconds for a single retry delay, including Retry-After",
+        default=10.0,
+    )
+
+    dolibarr_retry_max_elapsed: float = Field(
+        description="Seconds after the first attempt past which no retry is started (0 = no limit)",
+        default=30.0,
+    )
+
+    dolibarr_retry_post: bool = Field(
+        description="Allow retrying POST requests when Dolibarr cannot have processed them",
+        default=False,
+    )
+
+    dolibarr_circuit_failure_threshold: int = Field(
+        description="Consecutive failures that open the circuit for a resource family (0 = disabled)",
+        default=5,
+    )
+
+    dolibarr_circuit_recovery_timeout: float = Field(
+        description="Seconds an open circuit fails fast before probing Dolibarr again",
+        default=30.0,
+    )
+
+    dolibarr_rate_limit_reads: float = Field(
+        description="Sustained GET requests per second sent to Dolibarr (0 = unlimited)",
+        default=0.0,
+    )
+
+    dolibarr_rate_limit_writes: float = Field(
+        description="Sustained POST/PUT/DELETE requests per second sent to Dolibarr (0 = unlimited)",
+        default=0.0,
+    )
+
+    dolibarr_rate_limit_burst: int = Field(
+        description="Requests that may be sent back-to-back before rate limiting applies",
+        default=10,
+    )
+
+    dolibarr_coalesce_gets: bool = Field(
+        description="Share one in-flight request between identical concurrent GETs",
+        default=True,
+    )
+
+    dolibarr_cache_ttl: float = Field(
+        description="Seconds GET responses are cached in-process (0 = caching disabled)",
+        default=0.0,
+    )
+
+    dolibarr_cache_resource_ttls: str = Field(
+        description="Per-resource cache TTL overrides, e.g. 'products=300,invoices=0'",
+        default="",
+    )
+
+    dolibarr_cache_max_entries: int = Field(
+        description="Maximum number of cached GET responses",
+        default=1024,
+    )
+
+    dolibarr_cache_negative_ttl: float = Field(
+        description="Seconds not-found lookups (HTTP 404, empty filtered searches) are cached (0 = disabled)",
+        default=0.0,
+    )
+
+    dolibarr_cache_stale_ttl: float = Field(
+        description="Seconds an expired cache entry is still served while it is refreshed in the background",
+        default=0.0,
+    )
+
+    dolibarr_cache_refresh_ahead: float = Field(
+        description="Fraction of the TTL before expiry at which hot entries are refreshed (0 = disabled)",
+        default=0.0,
+    )
+
+    dolibarr_page_size: int = Field(
+        description="Records requested per page when iterating over list endpoints",
+        default=100,
+    )
+
+    dolibarr_pagination_mode: str = Field(
+        description="Pagination for list scans: offset (page/limit) or keyset (t.rowid filter)",
+        default="offset",
+    )
+
+    dolibarr_page_prefetch: int = Field(
+        description="Page requests kept in flight ahead of the consumer during list scans (1 = sequential)",
+        default=1,
+    )
+
+    dolibarr_stream_records: bool = Field(
+        description="Parse sequential list scans incrementally as each page downloads",
+        default=False,
+    )
+
+    dolibarr_export_workers: int = Field(
+        description="Concurrent rowid-range shards scanned by sharded exports",
+        default=4,
+    )
+
+    dolibarr_export_dir: str = Field(
+        description="Directory the export_resource tool writes files to (default: system temp dir)",
+        default="",
+    )
+
+    dolibarr_json_backend: str = Field(
+        description="JSON codec: auto (orjson when installed), orjson or json",
+        default="auto",
+    )
+
+    mcp_json_output: str = Field(
+        description="Tool result formatting: pretty (indented) or compact",
+        default="pretty",
+    )
+
+    dolibarr_json_offload_threshold: int = Field(
+        description="Body size in bytes above which JSON parsing and tool result encoding run in a worker pool (0 = never)",
+        default=1_048_576,
+    )
+
+    dolibarr_json_offload_executor: str = Field(
+        description="Worker pool for large JSON payloads: thread or process",
+        default="thread",
+    )
+
+    dolibarr_max_body_size: int = Field(
+        description="Response bytes kept in memory; larger bodies are spilled to a temporary file (0 = no limit)",
+        default=32 * 1024 * 1024,
+    )
+
+    dolibarr_max_response_size: int = Field(
+        description="Responses larger than this many bytes are rejected (0 = no limit)",
+        default=64 * 1024 * 1024,
+    )
+
     @field_validator("dolibarr_url")
     @classmethod
     def validate_dolibarr_url(cls, v: str) -> str:
@@ -159,6 +386,146 @@ class Config(BaseSettings):
             raise ValueError("MCP_HTTP_PORT must be between 1 and 65535")
         return port
 
+    @field_validator(
+        "dolibarr_http_pool_limit",
+        "dolibarr_http_pool_limit_per_host",
+        "dolibarr_http_keepalive_timeout",
+        "dolibarr_http_dns_cache_ttl",
+        "dolibarr_retry_max_retries",
+        "dolibarr_retry_backoff_base",
+        "dolibarr_retry_backoff_max",
+        "dolibarr_retry_max_elapsed",
+        "dolibarr_circuit_failure_threshold",
+        "dolibarr_circuit_recovery_timeout",
+        "dolibarr_rate_limit_reads",
+        "dolibarr_rate_limit_writes",
+        "dolibarr_rate_limit_burst",
+        "dolibarr_cache_ttl",
+        "dolibarr_cache_max_entries",
+        "dolibarr_cache_stale_ttl",
+        "dolibarr_cache_negative_ttl",
+        "dolibarr_json_offload_threshold",
+        "dolibarr_max_body_size",
+        "dolibarr_max_response_size",
+        "mcp_config_watch_interval",
+    )
+    @classmethod
+    def validate_non_negative(cls, v):
+        """Validate connection pool, retry, circuit breaker, rate limit and cache settings."""
+        if v < 0:
+            raise ValueError("Client tuning settings must not be negative")
+        return v
+
+    @field_validator("dolibarr_http_timeout", "dolibarr_http_connect_timeout")
+    @classmethod
+    def validate_http_timeout(cls, v: float) -> float:
+        """Validate Dolibarr request timeouts."""
+        if v <= 0:
+            raise ValueError("Dolibarr HTTP timeouts must be greater than 0")
+        return v
+
+    @field_validator("dolibarr_page_size", "dolibarr_page_prefetch", "dolibarr_export_workers")
+    @classmethod
+    def validate_page_setting(cls, v: int) -> int:
+        """Validate the pagination page size, prefetch window and export workers."""
+        if v < 1:
+            raise ValueError("Pagination and export settings must be at least 1")
+        return v
+
+    @field_validator("dolibarr_http_compression")
+    @classmethod
+    def validate_http_compression(cls, v: str) -> str:
+        """Validate the requested response encodings."""
+        normalized = (v or "auto").lower().replace(" ", "")
+        if normalized in {"auto", "none"}:
+            return normalized
+        if not set(normalized.split(",")) <= {"br", "gzip", "deflate"}:
+            print(f"⚠️ Invalid DOLIBARR_HTTP_COMPRESSION '{v}', defaulting to auto", file=sys.stderr)
+            return "auto"
+        return normalized
+
+    @field_validator("dolibarr_pagination_mode")
+    @classmethod
+    def validate_pagination_mode(cls, v: str) -> str:
+        """Validate the list scan pagination mode."""
+        normalized = (v or "offset").lower()
+        if normalized not in {"offset", "keyset"}:
+            print(f"⚠️ Invalid DOLIBARR_PAGINATION_MODE '{v}', defaulting to offset", file=sys.stderr)
+            return "offset"
+        return normalized
+
+    @field_validator("dolibarr_json_backend")
+    @classmethod
+    def validate_json_backend(cls, v: str) -> str:
+        """Validate the JSON codec selection."""
+        normalized = (v or "auto").lower()
+        if normalized not in {"auto", "orjson", "json"}:
+            print(f"⚠️ Invalid DOLIBARR_JSON_BACKEND '{v}', defaulting to auto", file=sys.stderr)
+            return "auto"
+        return normalized
+
+    @field_validator("dolibarr_json_offload_executor")
+    @classmethod
+    def validate_json_offload_executor(cls, v: str) -> str:
+        """Validate the JSON offload pool type."""
+        normalized = (v or "thread").lower()
+        if normalized not in {"thread", "process"}:
+            print(f"⚠️ Invalid DOLIBARR_JSON_OFFLOAD_EXECUTOR '{v}', defaulting to thread", file=sys.stderr)
+            return "thread"
+        return normalized
+
+    @field_validator("mcp_tool_profile")
+    @classmethod
+    def validate_tool_profile(cls, v: str) -> str:
+        """Validate the tool profile name."""
+        normalized = (v or DEFAULT_TOOL_PROFILE).strip().lower()
+        if normalized not in TOOL_PROFILES:
+            print(f"⚠️ Invalid MCP_TOOL_PROFILE '{v}', defaulting to {DEFAULT_TOOL_PROFILE}", file=sys.stderr)
+            return DEFAULT_TOOL_PROFILE
+        return normalized
+
+    @field_validator("mcp_json_output")
+    @classmethod
+    def validate_json_output(cls, v: str) -> str:
+        """Validate the tool result formatting."""
+        normalized = (v or "pretty").lower()
+        if normalized not in {"pretty", "compact"}:
+            print(f"⚠️ Invalid MCP_JSON_OUTPUT '{v}', defaulting to pretty", file=sys.stderr)
+            return "pretty"
+        return normalized
+
+    @field_validator("dolibarr_cache_refresh_ahead")
+    @classmethod
+    def validate_refresh_ahead(cls, v: float) -> float:
+        """Validate the refresh-ahead fraction."""
+        if not 0 <= v <= 1:
+            raise ValueError("DOLIBARR_CACHE_REFRESH_AHEAD must be between 0 and 1")
+        return v
+
+    @field_validator("dolibarr_cache_resource_ttls")
+    @classmethod
+    def validate_cache_resource_ttls(cls, v: str) -> str:
+        """Validate the ``resource=seconds`` list of cache TTL overrides."""
+        cls.parse_resource_ttls(v)
+        return v
+
+    @staticmethod
+    def parse_resource_ttls(value: str) -> Dict[str, float]:
+        """Parse ``'products=300,invoices=0'`` into a mapping of resource to TTL."""
+        ttls: Dict[str, float] = {}
+        for item in filter(None, (part.strip() for part in value.split(","))):
+            resource, sep, ttl = item.partition("=")
+            try:
+                seconds = float(ttl)
+            except ValueError:
+                seconds = -1.0
+            if not sep or not resource.strip() or seconds < 0:
+                raise ValueError(
+                    f"Invalid cache TTL override '{item}', expected resource=seconds"
+                )
+            ttls[resource.strip().lower()] = seconds
+        return ttls
+
     @classmethod
     def from_env(cls) -> "Config":
         """Create configuration from environment variables with validation."""
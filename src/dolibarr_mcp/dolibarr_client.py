@@ -1,25 +1,80 @@
 """Professional Dolibarr API client with comprehensive CRUD operations."""
 
-import json
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+import os
+import ssl
+import tempfile
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
 
 import aiohttp
-from aiohttp import ClientSession, ClientTimeout
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
 
+from .cache import NegativeResult, ResponseCache, split_endpoint
+from .compression import ContentDecoder, accept_encoding_header, accepted_encodings
 from .config import Config
+from .json_codec import JsonOffloader, get_codec
+from .json_stream import ArrayItemParser
+from .resilience import (
+    BACKEND_FAILURE_STATUS_CODES,
+    RETRYABLE_STATUS_CODES,
+    CircuitBreaker,
+    RetryPolicy,
+    TokenBucket,
+    parse_retry_after,
+)
 
 
 class DolibarrAPIError(Exception):
     """Custom exception for Dolibarr API errors."""
     
-    def __init__(self, message: str, status_code: Optional[int] = None, response_data: Optional[Dict] = None):
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        response_data: Optional[Dict] = None,
+        retry_after: Optional[float] = None,
+    ):
         self.message = message
         self.status_code = status_code
         self.response_data = response_data
+        self.retry_after = retry_after
         super().__init__(self.message)
 
 
+class DolibarrCircuitOpenError(DolibarrAPIError):
+    """Raised without contacting Dolibarr while a resource family's circuit is open."""
+
+    def __init__(self, family: str, retry_in: float):
+        self.family = family
+        super().__init__(
+            f"Dolibarr '{family}' endpoints are failing; "
+            f"requests suspended for another {retry_in:.0f}s",
+            retry_after=retry_in,
+        )
+
+
+class DolibarrResponseTooLargeError(DolibarrAPIError):
+    """Raised when a response body exceeds ``DOLIBARR_MAX_RESPONSE_SIZE``."""
+
+    def __init__(self, endpoint: str, limit: int):
+        self.limit = limit
+        super().__init__(
+            f"Response from '{endpoint}' exceeds the {limit}-byte limit "
+            f"(DOLIBARR_MAX_RESPONSE_SIZE); request fewer records with limit/sqlfilters "
+            f"or use the export_resource tool"
+        )
+
+
+# Bytes read from the network per chunk when streaming response bodies
+BODY_CHUNK_SIZE = 64 * 1024
+
+# Bytes of a spilled body kept for logging and non-JSON error responses
+BODY_PREVIEW_SIZE = 1000
+
+
 class DolibarrClient:
     """Professional Dolibarr API client with comprehensive functionality."""
     
@@ -32,7 +87,50 @@ class DolibarrClient:
         self.logger = logging.getLogger(__name__)
         
         # Configure timeout
-        self.timeout = ClientTimeout(total=30, connect=10)
+        self.timeout = ClientTimeout(
+            total=config.dolibarr_http_timeout,
+            connect=config.dolibarr_http_connect_timeout,
+        )
+
+        # One SSL context per client so TLS sessions can be resumed across connections
+        self._ssl_context: Any = (
+            ssl.create_default_context() if config.dolibarr_http_verify_ssl else False
+        )
+
+        self.codec = get_codec(config.dolibarr_json_backend)
+        self.json_offload = JsonOffloader(
+            self.codec,
+            threshold=config.dolibarr_json_offload_threshold,
+            executor=config.dolibarr_json_offload_executor,
+        )
+        self.accepted_encodings = accepted_encodings(config.dolibarr_http_compression)
+        self._bytes_on_wire = 0
+        self._bytes_decoded = 0
+        self._compressed_responses = 0
+        self._spilled_responses = 0
+        self._rejected_responses = 0
+        self.retry_policy = RetryPolicy.from_config(config)
+        self._circuits: Dict[str, CircuitBreaker] = {}
+
+        # Separate budgets so bulk reads cannot starve writes and vice versa
+        self._read_limiter = TokenBucket(
+            config.dolibarr_rate_limit_reads, config.dolibarr_rate_limit_burst
+        )
+        self._write_limiter = TokenBucket(
+            config.dolibarr_rate_limit_writes, config.dolibarr_rate_limit_burst
+        )
+
+        # In-flight GETs keyed by endpoint and params, shared by identical concurrent calls
+        self._inflight: Dict[Tuple[str, Tuple], "asyncio.Future[Any]"] = {}
+        self._coalesced_requests = 0
+
+        self.cache = ResponseCache(
+            max_entries=config.dolibarr_cache_max_entries,
+            stale_ttl=config.dolibarr_cache_stale_ttl,
+            refresh_ahead=config.dolibarr_cache_refresh_ahead,
+        )
+        self._cache_ttls = Config.parse_resource_ttls(config.dolibarr_cache_resource_ttls)
+        self._background: Set["asyncio.Future[Any]"] = set()
     
     async def __aenter__(self):
         """Async context manager entry."""
@@ -43,23 +141,44 @@ class DolibarrClient:
         """Async context manager exit."""
         await self.close_session()
     
+    def _build_connector(self) -> TCPConnector:
+        """Create the pooled connector used for all Dolibarr requests."""
+        return TCPConnector(
+            limit=self.config.dolibarr_http_pool_limit,
+            limit_per_host=self.config.dolibarr_http_pool_limit_per_host,
+            keepalive_timeout=self.config.dolibarr_http_keepalive_timeout,
+            ttl_dns_cache=self.config.dolibarr_http_dns_cache_ttl or None,
+            use_dns_cache=self.config.dolibarr_http_dns_cache_ttl > 0,
+            ssl=self._ssl_context,
+        )
+
     async def start_session(self):
         """Start the HTTP session."""
         if not self.session:
             self.session = aiohttp.ClientSession(
+                connector=self._build_connector(),
                 timeout=self.timeout,
+                json_serialize=lambda obj: self.codec.dumps(obj, compact=True),
+                # Bodies are decoded in _iter_body so wire and decoded sizes can be measured
+                auto_decompress=False,
                 headers={
                     "DOLAPIKEY": self.api_key,
                     "Content-Type": "application/json",
-                    "Accept": "application/json"
+                    "Accept": "application/json",
+                    "Accept-Encoding": accept_encoding_header(self.accepted_encodings),
                 }
             )
     
     async def close_session(self):
         """Close the HTTP session."""
+        for task in list(self._background):
+            task.cancel()
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
         if self.session:
             await self.session.close()
             self.session = None
+        self.json_offload.shutdown()
 
     @staticmethod
     def _extract_identifier(response: Any) -> Any:
@@ -88,10 +207,67 @@ class DolibarrClient:
         method: str,
         endpoint: str,
         params: Optional[Dict] = None,
-        data: Optional[Dict] = None
+        data: Optional[Dict] = None,
+        idempotent: Optional[bool] = None,
     ) -> Dict[str, Any]:
-        """Public helper retained for compatibility with legacy integrations and tests."""
-        return await self._make_request(method, endpoint, params=params, data=data)
+        """Public helper retained for compatibility with legacy integrations and tests.
+
+        ``idempotent`` overrides the method-based retry decision, e.g. to let a
+        POST that is known to be safe be retried like a GET.
+        """
+        return await self._make_request(
+            method, endpoint, params=params, data=data, idempotent=idempotent
+        )
+
+    @staticmethod
+    def _resource_family(endpoint: str) -> str:
+        """Return the resource family of an endpoint, e.g. ``invoices`` for ``invoices/1/lines``."""
+        path = endpoint.split("?", 1)[0].strip("/")
+        return path.split("/", 1)[0] or "root"
+
+    def _circuit_for(self, endpoint: str) -> CircuitBreaker:
+        """Return the circuit breaker guarding the endpoint's resource family."""
+        family = self._resource_family(endpoint)
+        circuit = self._circuits.get(family)
+        if circuit is None:
+            circuit = CircuitBreaker(
+                family,
+                failure_threshold=self.config.dolibarr_circuit_failure_threshold,
+                recovery_timeout=self.config.dolibarr_circuit_recovery_timeout,
+            )
+            self._circuits[family] = circuit
+        return circuit
+
+    def get_diagnostics(self) -> Dict[str, Any]:
+        """Return client-side health information for troubleshooting."""
+        return {
+            "circuits": {
+                family: circuit.snapshot()
+                for family, circuit in sorted(self._circuits.items())
+            },
+            "rate_limits": {
+                "read": self._read_limiter.snapshot(),
+                "write": self._write_limiter.snapshot(),
+            },
+            "coalesced_requests": self._coalesced_requests,
+            "cache": self.cache.stats(),
+            "json": self.json_offload.stats(),
+            "transfer": {
+                "accept_encoding": accept_encoding_header(self.accepted_encodings),
+                "compressed_responses": self._compressed_responses,
+                "bytes_on_wire": self._bytes_on_wire,
+                "bytes_decoded": self._bytes_decoded,
+                "compression_ratio": (
+                    round(self._bytes_decoded / self._bytes_on_wire, 2) if self._bytes_on_wire else None
+                ),
+            },
+            "large_responses": {
+                "max_body_size": self.config.dolibarr_max_body_size,
+                "max_response_size": self.config.dolibarr_max_response_size,
+                "spilled": self._spilled_responses,
+                "rejected": self._rejected_responses,
+            },
+        }
 
     def _build_url(self, endpoint: str) -> str:
         """Build full API URL."""
@@ -104,89 +280,398 @@ class DolibarrClient:
 
         return f"{base}/{endpoint}"
 
+    @staticmethod
+    def _request_key(endpoint: str, params: Optional[Dict]) -> Tuple[str, Tuple]:
+        """Return a hashable identity for a GET request."""
+        items = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+        return endpoint.strip("/"), items
+
     async def _make_request(
         self, 
         method: str, 
         endpoint: str, 
         params: Optional[Dict] = None,
-        data: Optional[Dict] = None
+        data: Optional[Dict] = None,
+        idempotent: Optional[bool] = None,
     ) -> Dict[str, Any]:
-        """Make HTTP request to Dolibarr API."""
+        """Make HTTP request to Dolibarr API.
+
+        GET responses are served from the in-process cache when the resource
+        has a TTL, and concurrent identical GETs share a single in-flight
+        request. Both hand out the same parsed result object to every caller,
+        so results must not be mutated. Any other method invalidates the cached
+        entries of the written entity and its collections.
+        """
         if not self.session:
             await self.start_session()
-        
+
+        method = method.upper()
+        if method != "GET":
+            try:
+                return await self._request_with_retries(method, endpoint, params, data, idempotent)
+            finally:
+                self._invalidate(endpoint)
+
+        key = self._request_key(endpoint, params)
+        ttl = self._cache_ttl(endpoint)
+        if ttl > 0 or self.config.dolibarr_cache_negative_ttl > 0:
+            found, value = self.cache.get(key)
+            if found:
+                if isinstance(value, NegativeResult):
+                    error = value.error
+                    raise DolibarrAPIError(
+                        error.message, error.status_code, error.response_data
+                    )
+                if self.cache.claim_refresh(key):
+                    self._revalidate(key, endpoint, params, ttl)
+                return value
+
+        if not self.config.dolibarr_coalesce_gets:
+            return await self._fetch(key, endpoint, params, ttl)
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key, endpoint, params, ttl))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_inflight(key, done))
+        else:
+            self._coalesced_requests += 1
+
+        # Shield so one caller being cancelled does not cancel the others
+        return await asyncio.shield(task)
+
+    def _cache_ttl(self, endpoint: str) -> float:
+        """Return the cache TTL configured for the endpoint's resource family."""
+        family = split_endpoint(endpoint)[0].lower()
+        return self._cache_ttls.get(family, self.config.dolibarr_cache_ttl)
+
+    async def _fetch(
+        self,
+        key: Tuple[str, Tuple],
+        endpoint: str,
+        params: Optional[Dict],
+        ttl: float,
+    ) -> Any:
+        """GET an endpoint and cache the result unless a write raced with it.
+
+        Not-found outcomes, a 404 or an empty list for a ``sqlfilters`` search,
+        are cached for the shorter negative TTL instead.
+        """
+        negative_ttl = self.config.dolibarr_cache_negative_ttl
+        generation = self.cache.generation(endpoint)
+        try:
+            result = await self._request_with_retries("GET", endpoint, params)
+        except DolibarrAPIError as e:
+            if e.status_code == 404:
+                self.cache.set(key, NegativeResult(e), negative_ttl, generation=generation)
+            raise
+
+        if result == [] and params and "sqlfilters" in params:
+            self.cache.set(key, result, negative_ttl, generation=generation)
+        else:
+            self.cache.set(key, result, ttl, generation=generation)
+        return result
+
+    def _revalidate(
+        self,
+        key: Tuple[str, Tuple],
+        endpoint: str,
+        params: Optional[Dict],
+        ttl: float,
+    ) -> None:
+        """Refresh a cached entry in the background while callers get the cached value."""
+        if key in self._inflight:
+            self.cache.release_refresh(key)
+            return
+
+        async def refresh() -> Any:
+            try:
+                return await self._fetch(key, endpoint, params, ttl)
+            except Exception as e:
+                self.logger.debug(f"Background refresh of {endpoint} failed: {e}")
+                self.cache.release_refresh(key)
+                raise
+
+        task = asyncio.ensure_future(refresh())
+        self._inflight[key] = task
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        task.add_done_callback(lambda done: self._finish_inflight(key, done))
+
+    def _invalidate(self, endpoint: str) -> None:
+        """Forget cached and in-flight reads made stale by a write to ``endpoint``."""
+        self.cache.invalidate(endpoint)
+        family = split_endpoint(endpoint)[0]
+        for key in [k for k in self._inflight if split_endpoint(k[0])[0] == family]:
+            # Later callers start a fresh request instead of joining a pre-write one
+            del self._inflight[key]
+
+    def _finish_inflight(self, key: Tuple[str, Tuple], task: "asyncio.Future[Any]") -> None:
+        """Forget a completed in-flight GET."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved in case every waiter was cancelled
+            task.exception()
+
+    async def _request_with_retries(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        data: Optional[Dict] = None,
+        idempotent: Optional[bool] = None,
+        send: Optional[Callable[..., Awaitable[Any]]] = None,
+    ) -> Any:
+        """Send a request, retrying transient failures within circuit and rate limits.
+
+        ``send`` performs one attempt and defaults to :meth:`_send_request`.
+        """
+        send = send or self._send_request
         url = self._build_url(endpoint)
+        circuit = self._circuit_for(endpoint)
+        limiter = self._read_limiter if method in ("GET", "HEAD") else self._write_limiter
+        attempt = 0
+        started = time.monotonic()
+
+        while True:
+            # Fail fast on an open circuit before queueing for a rate-limit token
+            if not circuit.allow_request():
+                raise DolibarrCircuitOpenError(circuit.name, circuit.retry_in())
+            probe_id = circuit.probe_id
+
+            try:
+                await limiter.acquire()
+                result = await send(method, url, params=params, data=data)
+            except DolibarrResponseTooLargeError:
+                # Dolibarr answered; repeating the request would return the same body
+                circuit.record_success()
+                raise
+            except DolibarrAPIError as e:
+                if e.status_code in BACKEND_FAILURE_STATUS_CODES:
+                    circuit.record_failure()
+                else:
+                    circuit.record_success()
+                delay = self.retry_policy.compute_delay(attempt, e.retry_after)
+                if (
+                    circuit.state == CircuitBreaker.OPEN
+                    or not self.retry_policy.is_retryable(method, attempt, status=e.status_code, idempotent=idempotent)
+                    or not self.retry_policy.within_deadline(time.monotonic() - started, delay)
+                ):
+                    raise
+                reason = f"HTTP {e.status_code}"
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                circuit.record_failure()
+                delay = self.retry_policy.compute_delay(attempt)
+                if (
+                    circuit.state == CircuitBreaker.OPEN
+                    or not self.retry_policy.is_retryable(method, attempt, error=e, idempotent=idempotent)
+                    or not self.retry_policy.within_deadline(time.monotonic() - started, delay)
+                ):
+                    if isinstance(e, aiohttp.ClientError):
+                        return await self._handle_client_error(endpoint, url)
+                    raise DolibarrAPIError(f"Request timed out: {endpoint}") from e
+                reason = type(e).__name__
+            except Exception as e:
+                circuit.record_failure()
+                raise DolibarrAPIError(f"Unexpected error: {str(e)}") from e
+            except BaseException:
+                # Cancelled while queued or mid-request: no outcome, so do not hold a half-open probe
+                circuit.release_probe(probe_id)
+                raise
+            else:
+                circuit.record_success()
+                return result
+
+            attempt += 1
+            self.logger.warning(
+                f"{method} {endpoint} failed ({reason}), retry {attempt}/"
+                f"{self.retry_policy.max_retries} in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+
+    async def _send_request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict] = None,
+        data: Optional[Dict] = None,
+    ) -> Dict[str, Any]:
+        """Perform a single HTTP exchange and decode the Dolibarr response."""
+        self.logger.debug(f"Making {method} request to {url}")
+        
+        kwargs = {
+            "params": params or {},
+        }
         
+        if data and method in ["POST", "PUT"]:
+            kwargs["json"] = data
+        
+        async with self.session.request(method, url, **kwargs) as response:
+            response_data = await self._decode_body(response, url)
+            if response.status >= 400:
+                raise self._response_error(response, response_data)
+            return response_data
+
+    async def _open_stream(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict] = None,
+        data: Optional[Dict] = None,
+    ) -> aiohttp.ClientResponse:
+        """Send a request and return the response with its body still unread.
+
+        Error responses are read, released and raised like in
+        :meth:`_send_request`; on success the caller must release the response.
+        """
+        self.logger.debug(f"Opening {method} stream to {url}")
+        response = await self.session.request(method, url, params=params or {})
+        if response.status >= 400:
+            try:
+                response_data = await self._decode_body(response, url)
+            finally:
+                response.release()
+            raise self._response_error(response, response_data)
+        return response
+
+    async def _decode_body(self, response: aiohttp.ClientResponse, url: str) -> Any:
+        """Read and decode a response body, keeping non-JSON bodies as ``raw_response``."""
+        body, spill_path = await self._read_body(response, url)
+        
+        # Log response for debugging
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Response status: {response.status}")
+            self.logger.debug(f"Response text: {body[:500].decode('utf-8', 'replace')}...")
+        
+        # Try to parse JSON response straight from the raw bytes
         try:
-            self.logger.debug(f"Making {method} request to {url}")
-            
-            kwargs = {
-                "params": params or {},
-            }
-            
-            if data and method.upper() in ["POST", "PUT"]:
-                kwargs["json"] = data
-            
-            async with self.session.request(method, url, **kwargs) as response:
-                response_text = await response.text()
-                
-                # Log response for debugging
-                self.logger.debug(f"Response status: {response.status}")
-                self.logger.debug(f"Response text: {response_text[:500]}...")
-                
-                # Try to parse JSON response
-                try:
-                    response_data = json.loads(response_text) if response_text else {}
-                except json.JSONDecodeError:
-                    response_data = {"raw_response": response_text}
-                
-                # Handle error responses
-                if response.status >= 400:
-                    error_msg = f"HTTP {response.status}: {response.reason}"
-                    if isinstance(response_data, dict):
-                        if "error" in response_data:
-                            error_details = response_data["error"]
-                            if isinstance(error_details, dict):
-                                error_msg = error_details.get("message", error_msg)
-                                if "code" in error_details:
-                                    error_msg = f"{error_msg} (Code: {error_details['code']})"
-                            else:
-                                error_msg = str(error_details)
-                        elif "message" in response_data:
-                            error_msg = response_data["message"]
-                    
-                    raise DolibarrAPIError(
-                        message=error_msg,
-                        status_code=response.status,
-                        response_data=response_data
+            if spill_path:
+                return await self.json_offload.load_file(spill_path)
+            return await self.json_offload.loads(body) if body else {}
+        except ValueError:
+            response_data = {"raw_response": body.decode("utf-8", "replace")}
+            if spill_path:
+                response_data["truncated"] = True
+            return response_data
+        finally:
+            if spill_path:
+                os.remove(spill_path)
+
+    @staticmethod
+    def _response_error(response: aiohttp.ClientResponse, response_data: Any) -> DolibarrAPIError:
+        """Build the DolibarrAPIError for an error response."""
+        error_msg = f"HTTP {response.status}: {response.reason}"
+        if isinstance(response_data, dict):
+            if "error" in response_data:
+                error_details = response_data["error"]
+                if isinstance(error_details, dict):
+                    error_msg = error_details.get("message", error_msg)
+                    if "code" in error_details:
+                        error_msg = f"{error_msg} (Code: {error_details['code']})"
+                else:
+                    error_msg = str(error_details)
+            elif "message" in response_data:
+                error_msg = response_data["message"]
+
+        retry_after = None
+        if response.status in RETRYABLE_STATUS_CODES:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        
+        return DolibarrAPIError(
+            message=error_msg,
+            status_code=response.status,
+            response_data=response_data,
+            retry_after=retry_after,
+        )
+
+    async def _iter_body(self, response: aiohttp.ClientResponse) -> AsyncIterator[bytes]:
+        """Yield the decoded body in chunks, counting bytes on the wire and after decoding."""
+        decoder = ContentDecoder(response.headers.get("Content-Encoding"))
+        if decoder.compressed:
+            self._compressed_responses += 1
+        async for chunk in response.content.iter_chunked(BODY_CHUNK_SIZE):
+            self._bytes_on_wire += len(chunk)
+            for piece in decoder.decompress(chunk):
+                if piece:
+                    self._bytes_decoded += len(piece)
+                    yield piece
+        tail = decoder.flush()
+        if tail:
+            self._bytes_decoded += len(tail)
+            yield tail
+
+    async def _read_body(
+        self,
+        response: aiohttp.ClientResponse,
+        url: str,
+    ) -> Tuple[bytes, Optional[str]]:
+        """Read a response body within the configured size limits.
+
+        Bodies up to ``DOLIBARR_MAX_BODY_SIZE`` are returned as bytes with no
+        path. Larger ones are streamed to a temporary file whose path is
+        returned together with the first bytes of the body; the caller must
+        delete it. Bodies above ``DOLIBARR_MAX_RESPONSE_SIZE`` raise
+        :class:`DolibarrResponseTooLargeError` before they are fully read.
+        """
+        memory_limit = self.config.dolibarr_max_body_size
+        hard_limit = self.config.dolibarr_max_response_size
+        chunks: List[bytes] = []
+        preview = b""
+        size = 0
+        spill = None
+        try:
+            async for chunk in self._iter_body(response):
+                size += len(chunk)
+                if len(preview) < BODY_PREVIEW_SIZE:
+                    preview += chunk[:BODY_PREVIEW_SIZE - len(preview)]
+                if hard_limit and size > hard_limit:
+                    self._rejected_responses += 1
+                    raise DolibarrResponseTooLargeError(url[len(self.base_url):].lstrip("/"), hard_limit)
+                if spill is None and memory_limit and size > memory_limit:
+                    spill = tempfile.NamedTemporaryFile(
+                        prefix="dolibarr-mcp-", suffix=".json", delete=False
                     )
+                    spill.writelines(chunks)
+                    chunks = []
+                if spill is None:
+                    chunks.append(chunk)
+                else:
+                    spill.write(chunk)
+        except BaseException:
+            if spill is not None:
+                spill.close()
+                os.remove(spill.name)
+            raise
+
+        if spill is None:
+            return b"".join(chunks), None
+        spill.close()
+        self._spilled_responses += 1
+        self.logger.info(f"Spilled {size}-byte response from {url} to {spill.name}")
+        return preview, spill.name
+
+    async def _handle_client_error(self, endpoint: str, url: str) -> Dict[str, Any]:
+        """Fall back to an alternative status probe or raise for a failed request."""
+        # For status endpoint, try alternative URL if first attempt fails
+        if endpoint == "status" and not url.endswith("/api/status"):
+            try:
+                # Try with /api/index.php/setup/modules as alternative
+                alt_url = f"{self.base_url}/setup/modules"
+                self.logger.debug(f"Status failed, trying alternative: {alt_url}")
                 
-                return response_data
-                
-        except aiohttp.ClientError as e:
-            # For status endpoint, try alternative URL if first attempt fails
-            if endpoint == "status" and not url.endswith("/api/status"):
-                try:
-                    # Try with /api/index.php/setup/modules as alternative
-                    alt_url = f"{self.base_url}/setup/modules"
-                    self.logger.debug(f"Status failed, trying alternative: {alt_url}")
-                    
-                    async with self.session.get(alt_url) as response:
-                        if response.status == 200:
-                            # Return a status-like response
-                            return {
-                                "success": 1,
-                                "dolibarr_version": "API Available",
-                                "api_version": "1.0"
-                            }
-                except:
-                    pass
-            
-            raise DolibarrAPIError(f"HTTP client error: {endpoint}")
-        except Exception as e:
-            if isinstance(e, DolibarrAPIError):
-                raise
-            raise DolibarrAPIError(f"Unexpected error: {str(e)}")
+                async with self.session.get(alt_url) as response:
+                    if response.status == 200:
+                        # Return a status-like response
+                        return {
+                            "success": 1,
+                            "dolibarr_version": "API Available",
+                            "api_version": "1.0"
+                        }
+            except:
+                pass
+        
+        raise DolibarrAPIError(f"HTTP client error: {endpoint}")
     
     # ============================================================================
     # SYSTEM ENDPOINTS
@@ -201,6 +686,9 @@ class DolibarrClient:
         try:
             # First try the standard status endpoint
             return await self.request("GET", "status")
+        except DolibarrCircuitOpenError:
+            # Dolibarr is known to be down; don't walk the fallbacks
+            raise
         except DolibarrAPIError:
             # If status fails, try to get module list as a connectivity test
             try:
@@ -235,7 +723,7 @@ class DolibarrClient:
         """Get list of users."""
         params = {"limit": limit}
         if page > 1:
-            params["page"] = page
+            params["page"] = page - 1  # Dolibarr pages are 0-based
         
         result = await self.request("GET", "users", params=params)
         return result if isinstance(result, list) else []
@@ -282,7 +770,7 @@ class DolibarrClient:
         """Get list of customers/third parties."""
         params = {"limit": limit}
         if page > 1:
-            params["page"] = page
+            params["page"] = page - 1  # Dolibarr pages are 0-based
         
         result = await self.request("GET", "thirdparties", params=params)
         return result if isinstance(result, list) else []
@@ -342,9 +830,12 @@ class DolibarrClient:
         result = await self.request("GET", "products", params=params)
         return result if isinstance(result, list) else []
 
-    async def get_products(self, limit: int = 100) -> List[Dict[str, Any]]:
+    async def get_products(self, limit: int = 100, page: int = 1) -> List[Dict[str, Any]]:
         """Get list of products."""
         params = {"limit": limit}
+        if page > 1:
+            params["page"] = page - 1  # Dolibarr pages are 0-based
+        
         result = await self.request("GET", "products", params=params)
         return result if isinstance(result, list) else []
     
@@ -514,9 +1005,12 @@ class DolibarrClient:
     # CONTACT MANAGEMENT
     # ============================================================================
     
-    async def get_contacts(self, limit: int = 100) -> List[Dict[str, Any]]:
+    async def get_contacts(self, limit: int = 100, page: int = 1) -> List[Dict[str, Any]]:
         """Get list of contacts."""
         params = {"limit": limit}
+        if page > 1:
+            params["page"] = page - 1  # Dolibarr pages are 0-based
+        
         result = await self.request("GET", "contacts", params=params)
         return result if isinstance(result, list) else []
     
@@ -554,7 +1048,9 @@ class DolibarrClient:
     
     async def get_projects(self, limit: int = 100, page: int = 1, status: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get list of projects."""
-        params: Dict[str, Any] = {"limit": limit, "page": page}
+        params: Dict[str, Any] = {"limit": limit}
+        if page > 1:
+            params["page"] = page - 1  # Dolibarr pages are 0-based
         if status is not None:
             params["status"] = status
         result = await self.request("GET", "projects", params=params)
@@ -585,6 +1081,384 @@ class DolibarrClient:
         """Delete a project."""
         return await self.request("DELETE", f"projects/{project_id}")
 
+    # ============================================================================
+    # PAGINATED ITERATION
+    # ============================================================================
+
+    def iter_pages(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        page_size: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        mode: Optional[str] = None,
+        after_id: Optional[int] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield successive pages of a list endpoint until a short or empty page.
+
+        Pages are requested sorted by ``t.rowid`` so records do not shift
+        between pages. ``mode`` selects ``offset`` paging (``page``/``limit``,
+        optionally prefetched) or ``keyset`` paging, which filters on
+        ``t.rowid`` greater than the last seen id so every page costs the same
+        however deep the scan is. ``after_id`` starts the scan past that rowid
+        in both modes.
+        """
+        return self._scan(endpoint, params, page_size, prefetch, mode, after_id, self._fetch_page)
+
+    def _scan(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        page_size: Optional[int],
+        prefetch: Optional[int],
+        mode: Optional[str],
+        after_id: Optional[int],
+        fetch: Callable[[str, Dict[str, Any]], AsyncIterator[List[Dict[str, Any]]]],
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Resolve the scan options and return the matching page loop.
+
+        ``fetch`` yields the records of one page in chunks. Prefetched offset
+        scans always fetch whole pages with :meth:`_get_page`.
+        """
+        mode = (mode or self.config.dolibarr_pagination_mode).lower()
+        if mode not in ("offset", "keyset"):
+            raise ValueError(f"Unknown pagination mode '{mode}', expected 'offset' or 'keyset'")
+        page_size = page_size or self.config.dolibarr_page_size
+        base_params: Dict[str, Any] = {"sortfield": "t.rowid", "sortorder": "ASC"}
+        base_params.update(params or {})
+
+        window = max(1, prefetch if prefetch is not None else self.config.dolibarr_page_prefetch)
+        if mode == "offset" and window > 1:
+            return self._iter_offset_pages(endpoint, base_params, page_size, window, after_id)
+        return self._iter_sequential_pages(endpoint, base_params, page_size, mode, after_id, fetch)
+
+    @staticmethod
+    def _combine_sqlfilters(*filters: Optional[str]) -> str:
+        """AND together Dolibarr ``sqlfilters`` expressions, skipping empty ones."""
+        present = [f for f in filters if f]
+        if len(present) <= 1:
+            return present[0] if present else ""
+        return "(" + " AND ".join(present) + ")"
+
+    def _page_params(
+        self,
+        base_params: Dict[str, Any],
+        page_size: int,
+        last_id: Optional[int],
+        page: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Return the query for one page: past rowid ``last_id`` and, for offset paging, page number ``page``."""
+        page_params = dict(base_params, limit=page_size)
+        page_params.pop("sqlfilters", None)
+        rowid_filter = f"(t.rowid:>:{int(last_id)})" if last_id is not None else None
+        sqlfilters = self._combine_sqlfilters(base_params.get("sqlfilters"), rowid_filter)
+        if sqlfilters:
+            page_params["sqlfilters"] = sqlfilters
+        if page is not None:
+            page_params["page"] = page
+        return page_params
+
+    async def _iter_offset_pages(
+        self,
+        endpoint: str,
+        base_params: Dict[str, Any],
+        page_size: int,
+        window: int,
+        after_id: Optional[int],
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Page with ``page``/``limit``, keeping ``window`` requests in flight.
+
+        Dolibarr numbers pages from 0. Pages are yielded in order; up to
+        ``window - 1`` requests past the last page are wasted.
+        """
+        pending: Deque["asyncio.Future[List[Dict[str, Any]]]"] = deque()
+        next_page = 0
+
+        try:
+            while True:
+                while len(pending) < window:
+                    page_params = self._page_params(base_params, page_size, after_id, next_page)
+                    pending.append(asyncio.ensure_future(self._get_page(endpoint, page_params)))
+                    next_page += 1
+
+                batch = await pending.popleft()
+                if batch:
+                    yield batch
+                if len(batch) < page_size:
+                    return
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _iter_sequential_pages(
+        self,
+        endpoint: str,
+        base_params: Dict[str, Any],
+        page_size: int,
+        mode: str,
+        after_id: Optional[int],
+        fetch: Callable[[str, Dict[str, Any]], AsyncIterator[List[Dict[str, Any]]]],
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Request one page at a time, by page number or past the last rowid seen (keyset).
+
+        The chunks ``fetch`` yields for each page are passed through as they
+        arrive; the scan ends on a page with fewer than ``page_size`` records.
+        """
+        last_id = after_id
+        page = 0
+
+        while True:
+            page_params = self._page_params(base_params, page_size, last_id, page if mode == "offset" else None)
+            page += 1
+            count = 0
+            last_record = None
+            async for chunk in fetch(endpoint, page_params):
+                count += len(chunk)
+                last_record = chunk[-1]
+                yield chunk
+            if count < page_size:
+                return
+            if mode == "keyset":
+                try:
+                    last_id = int(last_record["id"])
+                except (KeyError, TypeError, ValueError) as e:
+                    raise DolibarrAPIError(
+                        f"Keyset pagination needs a numeric 'id' in {endpoint} records"
+                    ) from e
+
+    @staticmethod
+    def _past_end(error: DolibarrAPIError) -> bool:
+        """Return whether ``error`` is the 404 older Dolibarr versions answer instead of [] past the last record."""
+        return error.status_code == 404
+
+    async def _get_page(self, endpoint: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Fetch one page of a list endpoint, treating Dolibarr's 404 as an empty page.
+
+        Pages bypass the cache and coalescing: a scan would otherwise fill the
+        cache with pages nobody reads twice, and negatively cache its last one.
+        """
+        await self.start_session()
+        try:
+            result = await self._request_with_retries("GET", endpoint, params=params)
+        except DolibarrAPIError as e:
+            if self._past_end(e):
+                return []
+            raise
+        return result if isinstance(result, list) else []
+
+    async def _fetch_page(self, endpoint: str, params: Dict[str, Any]) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield one page as a single chunk, or nothing when it is empty."""
+        batch = await self._get_page(endpoint, params)
+        if batch:
+            yield batch
+
+    async def _stream_page(self, endpoint: str, params: Dict[str, Any]) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield one page record by record as it downloads, treating Dolibarr's 404 as an empty page."""
+        try:
+            async for record in self.stream_list(endpoint, params):
+                yield [record]
+        except DolibarrAPIError as e:
+            if not self._past_end(e):
+                raise
+
+    async def stream_list(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Any]:
+        """Yield the elements of a JSON array response as they are downloaded.
+
+        Only one element and one network chunk are held in memory at a time.
+        The request honours the read rate limit, circuit breaker and retries
+        up to the response headers, but bypasses the cache and coalescing.
+        Once elements have been yielded a failure is raised, not retried,
+        since a retry would repeat them.
+        """
+        await self.start_session()
+        response = await self._request_with_retries(
+            "GET", endpoint, params=params, send=self._open_stream
+        )
+        parser = ArrayItemParser()
+        try:
+            async for chunk in self._iter_body(response):
+                for item in parser.feed(chunk):
+                    yield item
+            for item in parser.close():
+                yield item
+        except ValueError as e:
+            raise DolibarrAPIError(f"Expected a JSON array from {endpoint}: {e}") from e
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self._circuit_for(endpoint).record_failure()
+            raise DolibarrAPIError(
+                f"Response stream from {endpoint} failed after {parser.items_parsed} records: {e}"
+            ) from e
+        finally:
+            response.release()
+
+    async def iter_records(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        page_size: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        mode: Optional[str] = None,
+        after_id: Optional[int] = None,
+        stream: Optional[bool] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield every record of a list endpoint, holding at most the prefetch window in memory.
+
+        With ``stream`` (default ``DOLIBARR_STREAM_RECORDS``) sequential scans
+        parse each page as it downloads via :meth:`stream_list`, so records are
+        yielded before their page is complete and only one is held at a time.
+        Scans with a prefetch window above 1 always fetch whole pages.
+        """
+        stream = self.config.dolibarr_stream_records if stream is None else stream
+        window = prefetch if prefetch is not None else self.config.dolibarr_page_prefetch
+        fetch = self._stream_page if stream and window <= 1 else self._fetch_page
+        chunks = self._scan(endpoint, params, page_size, prefetch, mode, after_id, fetch)
+        async for chunk in chunks:
+            for record in chunk:
+                yield record
+
+    async def get_rowid_range(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Tuple[int, int]]:
+        """Return the lowest and highest rowid of a list endpoint, or None when it is empty."""
+        bounds = []
+        for order in ("ASC", "DESC"):
+            probe = dict(params or {}, sortfield="t.rowid", sortorder=order, limit=1)
+            batch = await self._get_page(endpoint, probe)
+            if not batch:
+                return None
+            bounds.append(int(batch[0]["id"]))
+        return bounds[0], bounds[1]
+
+    async def iter_records_sharded(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        workers: Optional[int] = None,
+        shards: Optional[int] = None,
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Scan a list endpoint as concurrent rowid-range shards merged into one stream.
+
+        The rowid span is split into ``shards`` ranges (default four per
+        worker) that ``workers`` tasks scan with keyset pagination. Records are
+        yielded as pages arrive, so their order is only guaranteed within a
+        shard. At most ``workers`` pages are buffered ahead of the consumer.
+        """
+        workers = workers or self.config.dolibarr_export_workers
+        shards = shards or workers * 4
+        page_size = page_size or self.config.dolibarr_page_size
+
+        bounds = await self.get_rowid_range(endpoint, params)
+        if bounds is None:
+            return
+        low, high = bounds
+        step = max(1, -(-(high - low + 1) // shards))
+        ranges: Deque[Tuple[int, int]] = deque(
+            (start, min(start + step - 1, high)) for start in range(low, high + 1, step)
+        )
+
+        base_params: Dict[str, Any] = {"sortfield": "t.rowid", "sortorder": "ASC"}
+        base_params.update(params or {})
+        user_filters = base_params.pop("sqlfilters", None)
+        queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=workers)
+        shard_done = object()
+
+        async def scan_shards() -> None:
+            try:
+                while ranges:
+                    start, end = ranges.popleft()
+                    shard_params = dict(base_params)
+                    shard_params["sqlfilters"] = self._combine_sqlfilters(
+                        user_filters, f"(t.rowid:<=:{end})"
+                    )
+                    pages = self._iter_sequential_pages(
+                        endpoint, shard_params, page_size, "keyset", start - 1, self._fetch_page
+                    )
+                    async for batch in pages:
+                        await queue.put(batch)
+            except Exception as e:
+                await queue.put(e)
+            else:
+                await queue.put(shard_done)
+
+        tasks = [asyncio.ensure_future(scan_shards()) for _ in range(min(workers, len(ranges)))]
+        running = len(tasks)
+        try:
+            while running:
+                item = await queue.get()
+                if item is shard_done:
+                    running -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    for record in item:
+                        yield record
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def iter_users(self, page_size: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all users."""
+        return self.iter_records("users", page_size=page_size)
+
+    def iter_customers(
+        self,
+        sqlfilters: Optional[str] = None,
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all customers/third parties, optionally filtered."""
+        params = {"sqlfilters": sqlfilters} if sqlfilters else None
+        return self.iter_records("thirdparties", params=params, page_size=page_size)
+
+    def iter_products(
+        self,
+        sqlfilters: Optional[str] = None,
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all products, optionally filtered."""
+        params = {"sqlfilters": sqlfilters} if sqlfilters else None
+        return self.iter_records("products", params=params, page_size=page_size)
+
+    def iter_invoices(
+        self,
+        status: Optional[str] = None,
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all invoices, optionally restricted to a status."""
+        params = {"status": status} if status else None
+        return self.iter_records("invoices", params=params, page_size=page_size)
+
+    def iter_orders(
+        self,
+        status: Optional[str] = None,
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all orders, optionally restricted to a status."""
+        params = {"status": status} if status else None
+        return self.iter_records("orders", params=params, page_size=page_size)
+
+    def iter_contacts(self, page_size: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all contacts."""
+        return self.iter_records("contacts", page_size=page_size)
+
+    def iter_projects(
+        self,
+        status: Optional[int] = None,
+        page_size: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all projects, optionally restricted to a status."""
+        params = {"status": status} if status is not None else None
+        return self.iter_records("projects", params=params, page_size=page_size)
+
     # ============================================================================
     # RAW API CALL
     # ============================================================================
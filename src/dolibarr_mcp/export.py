@@ -0,0 +1,503 @@
+"""Streaming export of Dolibarr list endpoints to NDJSON, CSV, Parquet and Arrow files."""
+
+import csv
+import json
+import os
+import re
+import tempfile
+import time
+from typing import IO, Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from .dolibarr_client import DolibarrClient
+
+# Resource names accepted by the export tool and CLI, mapped to API endpoints
+EXPORT_RESOURCES = {
+    "users": "users",
+    "customers": "thirdparties",
+    "thirdparties": "thirdparties",
+    "products": "products",
+    "invoices": "invoices",
+    "invoice_lines": "invoices",
+    "orders": "orders",
+    "contacts": "contacts",
+    "projects": "projects",
+}
+
+
+def _invoice_lines(invoices: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Flatten the ``lines`` of each invoice into rows that reference their invoice."""
+    rows = []
+    for invoice in invoices:
+        for line in invoice.get("lines") or []:
+            rows.append({
+                **line,
+                "fk_facture": line.get("fk_facture") or invoice.get("id"),
+                "invoice_ref": invoice.get("ref"),
+            })
+    return rows
+
+
+# Exports whose rows are derived from the fetched records
+RECORD_EXPANDERS: Dict[str, Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]] = {
+    "invoice_lines": _invoice_lines,
+}
+
+# Typed columns written by the columnar formats. Dolibarr returns most numbers
+# as strings and dates as Unix timestamps; values that cannot be converted are
+# written as nulls. Other resources are exported as string columns.
+COLUMNAR_SCHEMAS: Dict[str, List[Tuple[str, str]]] = {
+    "invoices": [
+        ("id", "int"),
+        ("ref", "str"),
+        ("ref_client", "str"),
+        ("socid", "int"),
+        ("type", "int"),
+        ("status", "int"),
+        ("paye", "bool"),
+        ("date", "timestamp"),
+        ("date_lim_reglement", "timestamp"),
+        ("date_validation", "timestamp"),
+        ("total_ht", "float"),
+        ("total_tva", "float"),
+        ("total_ttc", "float"),
+        ("multicurrency_code", "str"),
+        ("fk_project", "int"),
+        ("mode_reglement_code", "str"),
+        ("cond_reglement_code", "str"),
+        ("note_public", "str"),
+    ],
+    "invoice_lines": [
+        ("id", "int"),
+        ("fk_facture", "int"),
+        ("invoice_ref", "str"),
+        ("rang", "int"),
+        ("fk_product", "int"),
+        ("product_ref", "str"),
+        ("product_type", "int"),
+        ("desc", "str"),
+        ("qty", "float"),
+        ("subprice", "float"),
+        ("remise_percent", "float"),
+        ("tva_tx", "float"),
+        ("total_ht", "float"),
+        ("total_tva", "float"),
+        ("total_ttc", "float"),
+        ("date_start", "timestamp"),
+        ("date_end", "timestamp"),
+    ],
+    "products": [
+        ("id", "int"),
+        ("ref", "str"),
+        ("label", "str"),
+        ("type", "int"),
+        ("price", "float"),
+        ("price_ttc", "float"),
+        ("price_base_type", "str"),
+        ("tva_tx", "float"),
+        ("status", "bool"),
+        ("status_buy", "bool"),
+        ("stock_reel", "float"),
+        ("barcode", "str"),
+        ("weight", "float"),
+        ("date_creation", "timestamp"),
+        ("date_modification", "timestamp"),
+    ],
+    "thirdparties": [
+        ("id", "int"),
+        ("name", "str"),
+        ("name_alias", "str"),
+        ("client", "int"),
+        ("fournisseur", "int"),
+        ("code_client", "str"),
+        ("code_fournisseur", "str"),
+        ("email", "str"),
+        ("phone", "str"),
+        ("address", "str"),
+        ("zip", "str"),
+        ("town", "str"),
+        ("country_code", "str"),
+        ("tva_intra", "str"),
+        ("status", "int"),
+        ("date_creation", "timestamp"),
+        ("date_modification", "timestamp"),
+    ],
+}
+COLUMNAR_SCHEMAS["customers"] = COLUMNAR_SCHEMAS["thirdparties"]
+
+# Minimum rows buffered before a Parquet row group or Arrow record batch is written
+ROW_GROUP_SIZE = 10_000
+
+
+class NdjsonWriter:
+    """Write one JSON document per line."""
+
+    extension = "ndjson"
+    binary = False
+    resumable = True
+
+    def __init__(
+        self,
+        handle: IO,
+        fields: Optional[List[str]] = None,
+        append: bool = False,
+        resource: Optional[str] = None,
+    ):
+        self.handle = handle
+        self.fields = fields
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        """Append a batch of records."""
+        for record in records:
+            if self.fields:
+                record = {field: record.get(field) for field in self.fields}
+            self.handle.write(json.dumps(record, ensure_ascii=False))
+            self.handle.write("\n")
+
+    def close(self) -> None:
+        """Nothing to finalize; every batch is complete on disk."""
+
+
+class CsvWriter:
+    """Write records as CSV rows, JSON-encoding nested values.
+
+    Columns are ``fields`` when given, otherwise the keys of the first record.
+    """
+
+    extension = "csv"
+    binary = False
+    resumable = True
+
+    def __init__(
+        self,
+        handle: IO,
+        fields: Optional[List[str]] = None,
+        append: bool = False,
+        resource: Optional[str] = None,
+    ):
+        self.handle = handle
+        self.fields = fields
+        self._writer: Optional[csv.DictWriter] = None
+        self._header_written = append
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        """Append a batch of records."""
+        if not records:
+            return
+        if self._writer is None:
+            self.fields = self.fields or list(records[0].keys())
+            self._writer = csv.DictWriter(self.handle, fieldnames=self.fields, extrasaction="ignore")
+        if not self._header_written:
+            self._writer.writeheader()
+            self._header_written = True
+        for record in records:
+            self._writer.writerow({
+                field: json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else value
+                for field, value in record.items()
+            })
+
+    def close(self) -> None:
+        """Nothing to finalize; every batch is complete on disk."""
+
+
+def _require_pyarrow():
+    """Import pyarrow or explain how to install the optional dependency."""
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise RuntimeError(
+            "The parquet and arrow export formats require pyarrow: "
+            "pip install 'dolibarr-mcp[export]'"
+        ) from exc
+    return pyarrow
+
+
+def _coerce(value: Any, kind: str) -> Any:
+    """Convert a Dolibarr JSON value to the Python value of a column kind."""
+    if value is None or value == "":
+        return None
+    try:
+        if kind == "int":
+            try:
+                return int(value)
+            except ValueError:
+                return int(float(value))
+        if kind in ("float", "timestamp"):
+            number = float(value)
+            return int(number) if kind == "timestamp" else number
+        if kind == "bool":
+            return str(value).lower() in ("1", "true")
+    except (TypeError, ValueError):
+        return None
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+class ArrowWriter:
+    """Write records as typed columns in the Arrow IPC file format.
+
+    Columns come from :data:`COLUMNAR_SCHEMAS` for known resources (narrowed
+    to ``fields`` when given) and are strings otherwise. Pages are converted
+    to record batches as they arrive and written in chunks of at least
+    ``row_group_size`` rows. The file is only valid once :meth:`close` has
+    written its footer, so these exports cannot be resumed.
+    """
+
+    extension = "arrow"
+    binary = True
+    resumable = False
+
+    def __init__(
+        self,
+        handle: IO,
+        fields: Optional[List[str]] = None,
+        append: bool = False,
+        resource: Optional[str] = None,
+        row_group_size: Optional[int] = None,
+    ):
+        self._pa = _require_pyarrow()
+        self.handle = handle
+        self.fields = fields
+        self.row_group_size = row_group_size or ROW_GROUP_SIZE
+        self._columns: Optional[List[Tuple[str, str]]] = None
+        self._schema = None
+        self._writer = None
+        self._pending: List[Any] = []
+        self._pending_rows = 0
+
+        known = COLUMNAR_SCHEMAS.get(resource or "")
+        if known is not None:
+            kinds = dict(known)
+            names = fields or [name for name, _ in known]
+            self._set_columns([(name, kinds.get(name, "str")) for name in names])
+
+    _TYPES = {
+        "int": lambda pa: pa.int64(),
+        "float": lambda pa: pa.float64(),
+        "bool": lambda pa: pa.bool_(),
+        "timestamp": lambda pa: pa.timestamp("s", tz="UTC"),
+        "str": lambda pa: pa.string(),
+    }
+
+    def _set_columns(self, columns: List[Tuple[str, str]]) -> None:
+        self._columns = columns
+        self.fields = [name for name, _ in columns]
+        self._schema = self._pa.schema(
+            [(name, self._TYPES[kind](self._pa)) for name, kind in columns]
+        )
+        self._writer = self._open(self._schema)
+
+    def _open(self, schema):
+        return self._pa.ipc.new_file(self.handle, schema)
+
+    def _write_table(self, table) -> None:
+        self._writer.write_table(table)
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        """Convert a batch of records to columns, flushing full row groups."""
+        if not records:
+            return
+        if self._columns is None:
+            names = self.fields or list(records[0].keys())
+            self._set_columns([(name, "str") for name in names])
+        batch = self._pa.RecordBatch.from_pydict(
+            {name: [_coerce(record.get(name), kind) for record in records] for name, kind in self._columns},
+            schema=self._schema,
+        )
+        self._pending.append(batch)
+        self._pending_rows += batch.num_rows
+        if self._pending_rows >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._pending:
+            table = self._pa.Table.from_batches(self._pending, schema=self._schema).combine_chunks()
+            self._write_table(table)
+            self._pending = []
+            self._pending_rows = 0
+
+    def close(self) -> None:
+        """Write buffered rows and the file footer."""
+        if self._writer is None:
+            if not self.fields:
+                return
+            self._set_columns([(name, "str") for name in self.fields])
+        self._flush()
+        self._writer.close()
+
+
+class ParquetWriter(ArrowWriter):
+    """Write records as typed columns to a Parquet file, one row group per flush."""
+
+    extension = "parquet"
+
+    def _open(self, schema):
+        import pyarrow.parquet as pq
+
+        return pq.ParquetWriter(self.handle, schema)
+
+    def _write_table(self, table) -> None:
+        self._writer.write_table(table, row_group_size=table.num_rows)
+
+
+EXPORT_FORMATS = {
+    "ndjson": NdjsonWriter,
+    "csv": CsvWriter,
+    "parquet": ParquetWriter,
+    "arrow": ArrowWriter,
+}
+
+
+def _save_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    """Atomically persist export progress next to the output file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(state, handle)
+    os.replace(tmp_path, path)
+
+
+async def _batched(
+    records: AsyncIterator[Dict[str, Any]],
+    size: int,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Group a record stream into lists of ``size`` records."""
+    batch: List[Dict[str, Any]] = []
+    async for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def export_resource(
+    client: DolibarrClient,
+    resource: str,
+    path: str,
+    fmt: str = "ndjson",
+    fields: Optional[List[str]] = None,
+    sqlfilters: Optional[str] = None,
+    page_size: Optional[int] = None,
+    workers: int = 1,
+    resume: bool = False,
+    progress: Optional[Callable[[int], None]] = None,
+) -> Dict[str, Any]:
+    """Stream every record of ``resource`` into ``path`` one page at a time.
+
+    Sequential NDJSON and CSV exports walk the table with keyset pagination
+    and record the last rowid and file offset in ``<path>.checkpoint`` after
+    each page, so ``resume=True`` continues an interrupted export without
+    duplicates. With ``workers`` above 1 the table is scanned as concurrent
+    rowid shards; such exports are faster but cannot be resumed, and neither
+    can Parquet or Arrow files. ``progress`` is called with the running row
+    count after each page.
+    """
+    endpoint = EXPORT_RESOURCES.get(resource, resource)
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}', expected one of: {', '.join(EXPORT_FORMATS)}")
+    writer_class = EXPORT_FORMATS[fmt]
+    if resume and not writer_class.resumable:
+        raise ValueError(f"{fmt} exports cannot be resumed")
+    if resume and workers > 1:
+        raise ValueError("Sharded exports (workers > 1) cannot be resumed")
+    checkpointing = workers <= 1 and writer_class.resumable
+    expand = RECORD_EXPANDERS.get(resource)
+    page_size = page_size or client.config.dolibarr_page_size
+    params = {"sqlfilters": sqlfilters} if sqlfilters else None
+    checkpoint_path = f"{path}.checkpoint"
+
+    state: Dict[str, Any] = {
+        "resource": resource,
+        "format": fmt,
+        "sqlfilters": sqlfilters,
+        "fields": fields,
+        "last_id": None,
+        "records": 0,
+        "offset": 0,
+    }
+    resumed = False
+    if resume and checkpointing and os.path.exists(checkpoint_path) and os.path.exists(path):
+        with open(checkpoint_path, encoding="utf-8") as handle:
+            saved = json.load(handle)
+        for key in ("resource", "format", "sqlfilters"):
+            if saved.get(key) != state[key]:
+                raise ValueError(
+                    f"Checkpoint {checkpoint_path} belongs to a different export ({key} differs)"
+                )
+        state.update(saved)
+        resumed = True
+
+    if writer_class.binary:
+        handle = open(path, "wb")
+    else:
+        handle = open(path, "r+" if resumed else "w", encoding="utf-8", newline="")
+    with handle:
+        if resumed:
+            # Drop anything written after the last checkpointed page
+            handle.seek(state["offset"])
+            handle.truncate()
+        writer = writer_class(handle, state["fields"], append=resumed, resource=resource)
+
+        if workers > 1:
+            records = client.iter_records_sharded(
+                endpoint, params=params, workers=workers, page_size=page_size
+            )
+            pages = _batched(records, page_size)
+        else:
+            pages = client.iter_pages(
+                endpoint,
+                params=params,
+                page_size=page_size,
+                mode="keyset",
+                after_id=state["last_id"],
+            )
+
+        async for batch in pages:
+            rows = expand(batch) if expand else batch
+            writer.write(rows)
+            handle.flush()
+            state["records"] += len(rows)
+            if checkpointing:
+                state["last_id"] = int(batch[-1]["id"])
+                state["offset"] = handle.tell()
+                state["fields"] = writer.fields
+                _save_checkpoint(checkpoint_path, state)
+            if progress:
+                progress(state["records"])
+        writer.close()
+
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    return {
+        "path": os.path.abspath(path),
+        "format": fmt,
+        "resource": endpoint,
+        "records": state["records"],
+        "resumed": resumed,
+    }
+
+
+def export_path(
+    directory: str,
+    resource: str,
+    fmt: str,
+    filename: Optional[str] = None,
+) -> str:
+    """Return a file path inside the export directory, creating the directory if needed.
+
+    Only the base name of ``filename`` is used so callers cannot write elsewhere.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}', expected one of: {', '.join(EXPORT_FORMATS)}")
+    directory = directory or os.path.join(tempfile.gettempdir(), "dolibarr-mcp-exports")
+    os.makedirs(directory, exist_ok=True)
+    if filename:
+        name = os.path.basename(filename)
+    else:
+        name = f"{resource}-{time.strftime('%Y%m%d-%H%M%S')}.{EXPORT_FORMATS[fmt].extension}"
+    name = re.sub(r"[^A-Za-z0-9._-]", "_", name).lstrip(".")
+    if not name:
+        raise ValueError("Invalid export filename")
+    return os.path.join(directory, name)
@@ -0,0 +1,210 @@
+"""Pluggable JSON codecs with an optional orjson fast path."""
+
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Union
+
+from .json_stream import ArrayItemParser
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the installed extras
+    orjson = None
+
+
+class StdlibCodec:
+    """JSON codec backed by the standard library."""
+
+    name = "json"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Decode a JSON document from bytes or text."""
+        return json.loads(data)
+
+    def dumps(self, obj: Any, compact: bool = False) -> str:
+        """Encode ``obj`` as indented JSON, or without whitespace when ``compact``."""
+        if compact:
+            return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+        return json.dumps(obj, indent=2)
+
+
+class OrjsonCodec:
+    """JSON codec backed by orjson, parsing straight from bytes.
+
+    Values orjson cannot encode (integers wider than 64 bits, non-string
+    keys) fall back to the standard library so output never fails where the
+    stdlib codec would succeed.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise RuntimeError("orjson is not installed: pip install 'dolibarr-mcp[speedups]'")
+        self._fallback = StdlibCodec()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Decode a JSON document from bytes or text."""
+        return orjson.loads(data)
+
+    def dumps(self, obj: Any, compact: bool = False) -> str:
+        """Encode ``obj`` as indented JSON, or without whitespace when ``compact``."""
+        try:
+            return orjson.dumps(obj, option=0 if compact else orjson.OPT_INDENT_2).decode("utf-8")
+        except TypeError:
+            return self._fallback.dumps(obj, compact)
+
+
+CODECS = {
+    "json": StdlibCodec,
+    "orjson": OrjsonCodec,
+}
+
+
+def get_codec(name: str = "auto") -> Union[StdlibCodec, OrjsonCodec]:
+    """Return the codec called ``name``; ``auto`` prefers orjson when installed.
+
+    Decode errors from every codec are :class:`ValueError` subclasses.
+    """
+    if name == "auto":
+        name = "orjson" if orjson is not None else "json"
+    if name == "orjson" and orjson is None:
+        print("⚠️ DOLIBARR_JSON_BACKEND=orjson but orjson is not installed, using json", file=sys.stderr)
+        name = "json"
+    return CODECS[name]()
+
+
+def estimate_size(obj: Any, codec: Union[StdlibCodec, OrjsonCodec]) -> int:
+    """Cheaply estimate the encoded size of ``obj`` from its first list items.
+
+    Lists are assumed to hold similar records, so only the first element of
+    each list is encoded; dicts are walked value by value.
+    """
+    if isinstance(obj, list):
+        if not obj:
+            return 2
+        return len(obj) * estimate_size(obj[0], codec)
+    if isinstance(obj, dict):
+        return 2 + sum(len(str(key)) + 4 + estimate_size(value, codec) for key, value in obj.items())
+    try:
+        return len(codec.dumps(obj, compact=True))
+    except TypeError:
+        return len(str(obj))
+
+
+# Read size used when parsing spilled response files
+FILE_CHUNK_SIZE = 256 * 1024
+
+
+def load_json_file(codec: Union[StdlibCodec, OrjsonCodec], path: str) -> Any:
+    """Decode a JSON file, streaming top-level arrays element by element.
+
+    Arrays never hold more than one chunk of raw input in memory, but the
+    decoded elements are all returned, so the result still has to fit in
+    memory; other documents are read whole and decoded with ``codec``.
+    """
+    with open(path, "rb") as handle:
+        head = handle.read(FILE_CHUNK_SIZE)
+        if head.lstrip()[:1] != b"[":
+            return codec.loads(head + handle.read())
+        parser = ArrayItemParser()
+        items = parser.feed(head)
+        for chunk in iter(lambda: handle.read(FILE_CHUNK_SIZE), b""):
+            items.extend(parser.feed(chunk))
+        items.extend(parser.close())
+        return items
+
+
+def _worker_loads(name: str, data: Union[bytes, str]) -> Any:
+    return CODECS[name]().loads(data)
+
+
+def _worker_dumps(name: str, obj: Any, compact: bool) -> str:
+    return CODECS[name]().dumps(obj, compact)
+
+
+def _worker_load_file(name: str, path: str) -> Any:
+    return load_json_file(CODECS[name](), path)
+
+
+class JsonOffloader:
+    """Run large JSON decode/encode jobs in a worker pool instead of the event loop.
+
+    Payloads below ``threshold`` bytes (estimated for encoding) are handled
+    inline; ``threshold=0`` disables offloading. With a ``thread`` pool other
+    coroutines run between the decode and encode steps and while pure-Python
+    encoding yields the GIL. A ``process`` pool moves the work out of the
+    interpreter but pays for pickling the data both ways. The pool is created
+    on first use.
+    """
+
+    def __init__(
+        self,
+        codec: Union[StdlibCodec, OrjsonCodec],
+        threshold: int = 0,
+        executor: str = "thread",
+        max_workers: Optional[int] = None,
+    ):
+        self.codec = codec
+        self.threshold = threshold
+        self.executor = executor
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self._pool: Optional[Executor] = None
+        self.offloaded_loads = 0
+        self.offloaded_dumps = 0
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            pool_class = ProcessPoolExecutor if self.executor == "process" else ThreadPoolExecutor
+            self._pool = pool_class(max_workers=self.max_workers)
+        return self._pool
+
+    async def _run(self, func, *args) -> Any:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_pool(), func, self.codec.name, *args)
+        except BrokenProcessPool:
+            # A crashed worker poisons the pool; start a fresh one next time
+            self.shutdown()
+            return func(self.codec.name, *args)
+
+    async def loads(self, data: Union[bytes, str]) -> Any:
+        """Decode ``data``, in the pool when it is at least ``threshold`` bytes."""
+        if not self.threshold or len(data) < self.threshold:
+            return self.codec.loads(data)
+        self.offloaded_loads += 1
+        return await self._run(_worker_loads, data)
+
+    async def load_file(self, path: str) -> Any:
+        """Decode a JSON file with :func:`load_json_file`, in the pool when enabled."""
+        if not self.threshold:
+            return load_json_file(self.codec, path)
+        self.offloaded_loads += 1
+        return await self._run(_worker_load_file, path)
+
+    async def dumps(self, obj: Any, compact: bool = False) -> str:
+        """Encode ``obj``, in the pool when its estimated size reaches ``threshold``."""
+        if not self.threshold or estimate_size(obj, self.codec) < self.threshold:
+            return self.codec.dumps(obj, compact)
+        self.offloaded_dumps += 1
+        return await self._run(_worker_dumps, obj, compact)
+
+    def shutdown(self) -> None:
+        """Stop the worker pool without waiting for queued jobs."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return offload settings and counters for diagnostics."""
+        return {
+            "codec": self.codec.name,
+            "threshold": self.threshold,
+            "executor": self.executor,
+            "offloaded_loads": self.offloaded_loads,
+            "offloaded_dumps": self.offloaded_dumps,
+        }
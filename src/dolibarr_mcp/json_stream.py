@@ -0,0 +1,108 @@
+"""Incremental parsing of top-level JSON arrays from byte chunks."""
+
+import codecs
+import json
+import re
+from typing import Any, List
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Characters that can continue a number, so a number ending here may be partial
+_NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+
+class ArrayItemParser:
+    """Extract the elements of a top-level JSON array as its bytes arrive.
+
+    Feed raw chunks with :meth:`feed`, which returns the elements completed
+    so far, and call :meth:`close` at end of input. Only the unparsed tail of
+    the input is buffered. A partial element is retried once the buffer has
+    doubled, so a single huge element is still parsed in linear time.
+    Malformed input raises :class:`ValueError`.
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pending: List[str] = []
+        self._pending_size = 0
+        self._state = "start"  # start -> first -> (item <-> separator) -> done
+        self._retry_at = 0
+        self.items_parsed = 0
+
+    @property
+    def done(self) -> bool:
+        """Whether the closing bracket has been seen."""
+        return self._state == "done"
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Add ``chunk`` and return the array elements it completed."""
+        text = self._text.decode(chunk)
+        self._pending.append(text)
+        self._pending_size += len(text)
+        if len(self._buffer) + self._pending_size < self._retry_at:
+            return []
+        return self._parse(final=False)
+
+    def close(self) -> List[Any]:
+        """Parse what is left at end of input, raising if the array is incomplete."""
+        self._pending.append(self._text.decode(b"", final=True))
+        items = self._parse(final=True)
+        if self._state != "done":
+            raise ValueError("Truncated JSON array")
+        return items
+
+    def _parse(self, final: bool) -> List[Any]:
+        items: List[Any] = []
+        buffer = self._buffer + "".join(self._pending)
+        self._pending = []
+        self._pending_size = 0
+        size = len(buffer)
+        pos = 0
+        self._retry_at = 0
+
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos >= size:
+                break
+            char = buffer[pos]
+
+            if self._state == "start":
+                if char != "[":
+                    raise ValueError("Expected a JSON array")
+                self._state = "first"
+                pos += 1
+            elif self._state == "done":
+                raise ValueError("Extra data after JSON array")
+            elif self._state == "separator":
+                if char == ",":
+                    self._state = "item"
+                elif char == "]":
+                    self._state = "done"
+                else:
+                    raise ValueError(f"Unexpected {char!r} in JSON array")
+                pos += 1
+            elif char == "]" and self._state == "first":
+                self._state = "done"
+                pos += 1
+            else:
+                try:
+                    value, end = self._decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    # Incomplete element: wait until the buffered tail has doubled
+                    self._retry_at = 2 * (size - pos)
+                    break
+                if not final and (end >= size or buffer[end] in _NUMBER_CHARS):
+                    # A number may continue in the next chunk
+                    self._retry_at = size - pos + 1
+                    break
+                items.append(value)
+                self._state = "separator"
+                pos = end
+
+        self._buffer = buffer[pos:]
+        self.items_parsed += len(items)
+        return items
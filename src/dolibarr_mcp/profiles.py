@@ -0,0 +1,43 @@
+"""Named tool profiles limiting which tools a deployment or session exposes."""
+
+from typing import Dict, FrozenSet, Optional
+
+# Profile used when none is configured: every registered tool
+DEFAULT_TOOL_PROFILE = "full"
+
+_SYSTEM_TOOLS = ("test_connection", "get_status", "get_client_diagnostics")
+
+_LOOKUP_TOOLS = (
+    "search_products_by_ref",
+    "search_customers",
+    "search_products_by_label",
+    "resolve_product_ref",
+    "search_projects",
+)
+
+# Tool names per profile; ``None`` stands for every registered tool
+TOOL_PROFILES: Dict[str, Optional[FrozenSet[str]]] = {
+    "full": None,
+    "readonly": frozenset(_SYSTEM_TOOLS + _LOOKUP_TOOLS + (
+        "get_users", "get_user_by_id",
+        "get_customers", "get_customer_by_id",
+        "get_products", "get_product_by_id",
+        "get_invoices", "get_invoice_by_id",
+        "get_orders", "get_order_by_id",
+        "get_contacts", "get_contact_by_id",
+        "get_projects", "get_project_by_id",
+    )),
+    "invoicing": frozenset(_SYSTEM_TOOLS + _LOOKUP_TOOLS + (
+        "get_customer_by_id", "get_product_by_id", "get_project_by_id",
+        "get_invoices", "get_invoice_by_id",
+        "create_invoice", "update_invoice", "delete_invoice",
+        "create_invoice_draft", "add_invoice_line", "update_invoice_line", "delete_invoice_line",
+        "set_invoice_project", "validate_invoice",
+    )),
+    "crm": frozenset(_SYSTEM_TOOLS + (
+        "search_customers", "search_projects",
+        "get_customers", "get_customer_by_id", "create_customer", "update_customer", "delete_customer",
+        "get_contacts", "get_contact_by_id", "create_contact", "update_contact", "delete_contact",
+        "get_projects", "get_project_by_id", "create_project", "update_project", "delete_project",
+    )),
+}
@@ -0,0 +1,252 @@
+"""Resilience helpers for outbound Dolibarr API requests."""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional
+
+import aiohttp
+
+from .config import Config
+
+# Statuses that signal a transient condition on the Dolibarr web server
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 502, 503, 504})
+
+# Statuses meaning Dolibarr itself is unreachable or overloaded; any other
+# answer, including a 500 raised by Dolibarr for a business error, is healthy
+BACKEND_FAILURE_STATUS_CODES = frozenset({502, 503, 504})
+
+# Methods that can be repeated without changing the outcome
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a ``Retry-After`` header (delta seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+@dataclass
+class RetryPolicy:
+    """Capped exponential backoff with full jitter for transient Dolibarr failures.
+
+    Idempotent methods are retried on connection errors, timeouts and
+    :data:`RETRYABLE_STATUS_CODES`. POST is only retried when ``retry_post`` is
+    enabled, and then only when the request cannot have been processed: the
+    connection was never established, or Dolibarr answered ``429``. No retry
+    starts later than ``max_elapsed`` seconds after the first attempt, so a
+    hung backend is not waited on for ``max_retries`` full timeouts.
+    """
+
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 10.0
+    retry_post: bool = False
+    max_elapsed: float = 30.0
+
+    @classmethod
+    def from_config(cls, config: Config) -> "RetryPolicy":
+        """Build the policy from ``DOLIBARR_RETRY_*`` settings."""
+        return cls(
+            max_retries=config.dolibarr_retry_max_retries,
+            backoff_base=config.dolibarr_retry_backoff_base,
+            backoff_max=config.dolibarr_retry_backoff_max,
+            retry_post=config.dolibarr_retry_post,
+            max_elapsed=config.dolibarr_retry_max_elapsed,
+        )
+
+    def is_retryable(
+        self,
+        method: str,
+        attempt: int,
+        status: Optional[int] = None,
+        error: Optional[BaseException] = None,
+        idempotent: Optional[bool] = None,
+    ) -> bool:
+        """Return whether a failed attempt (0-based) may be repeated."""
+        if attempt >= self.max_retries:
+            return False
+
+        method = method.upper()
+        safe = idempotent if idempotent is not None else method in IDEMPOTENT_METHODS
+        post_allowed = method == "POST" and self.retry_post
+
+        if status is not None:
+            if status not in RETRYABLE_STATUS_CODES:
+                return False
+            return safe or (post_allowed and status == 429)
+
+        if isinstance(error, aiohttp.ClientConnectorError):
+            return safe or post_allowed
+        return safe
+
+    def within_deadline(self, elapsed: float, delay: float) -> bool:
+        """Return whether a retry after ``delay`` starts within ``max_elapsed`` (0 = no limit)."""
+        return self.max_elapsed <= 0 or elapsed + delay < self.max_elapsed
+
+    def compute_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Return the sleep before retry ``attempt`` (0-based), honouring ``Retry-After``."""
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker guarding one Dolibarr resource family.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    requests fail fast. Once ``recovery_timeout`` seconds have passed a single
+    probe request is let through (half-open); its outcome closes or re-opens
+    the circuit. A threshold of 0 disables the breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probes = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the timeout elapsed."""
+        if self._state == self.OPEN and self.retry_in() == 0:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit lets a probe request through."""
+        if self._state != self.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.recovery_timeout - self._clock())
+
+    def allow_request(self) -> bool:
+        """Return whether a request may be sent now."""
+        if self.failure_threshold <= 0:
+            return True
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            self._probes += 1
+            return True
+        return False
+
+    @property
+    def probe_id(self) -> Optional[int]:
+        """Identifier of the half-open probe in flight, or ``None``.
+
+        Read right after :meth:`allow_request` it tells whether the caller
+        holds the probe.
+        """
+        return self._probes if self._probe_in_flight else None
+
+    def release_probe(self, probe_id: Optional[int]) -> None:
+        """Let another probe through after probe ``probe_id`` ended without an outcome, e.g. when cancelled."""
+        if probe_id is not None and probe_id == self.probe_id:
+            self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        """Record a request that reached a healthy backend."""
+        self._state = self.CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a connection error, timeout or gateway failure (HTTP 502/503/504)."""
+        if self.failure_threshold <= 0:
+            return
+        self._failures += 1
+        self._probe_in_flight = False
+        if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            self._state = self.OPEN
+            self._opened_at = self._clock()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the breaker state for diagnostics."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "retry_in": round(self.retry_in(), 3),
+        }
+
+
+class TokenBucket:
+    """Token-bucket limiter that queues callers instead of rejecting them.
+
+    Tokens refill at ``rate`` per second up to ``burst``. Waiters are served in
+    arrival order, so bursts are smoothed to the sustainable rate. A rate of 0
+    disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._clock = clock
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+        self._lock: Optional[asyncio.Lock] = None
+        self._waits = 0
+        self._wait_time = 0.0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Take one token, sleeping until one is available."""
+        if self.rate <= 0:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                delay = (1 - self._tokens) / self.rate
+                self._waits += 1
+                self._wait_time += delay
+                await asyncio.sleep(delay)
+                self._refill()
+            self._tokens -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return limiter settings and wait statistics for diagnostics."""
+        return {
+            "rate": self.rate,
+            "burst": self.capacity,
+            "delayed_requests": self._waits,
+            "total_wait_seconds": round(self._wait_time, 3),
+        }
@@ -0,0 +1,1394 @@
+"""Declarative registry of the MCP tools: schema, argument mapping and client method."""
+
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from mcp.types import Tool
+
+from .dolibarr_client import DolibarrClient
+from .export import EXPORT_FORMATS, EXPORT_RESOURCES, export_path, export_resource
+from .profiles import TOOL_PROFILES
+from .validation import ArgumentValidator, compile_validator
+
+ToolHandler = Callable[[DolibarrClient, Dict[str, Any]], Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """An MCP tool and how a call to it maps onto :class:`DolibarrClient`.
+
+    Most tools name a client ``method``: the arguments listed in
+    ``positional`` are passed positionally in that order and the rest as
+    keyword arguments, after filling in ``defaults`` and renaming keys with
+    ``rename`` (e.g. ``customer_id`` to Dolibarr's ``socid``). Tools that
+    need more than that provide a ``handler(client, arguments)`` coroutine.
+    """
+
+    name: str
+    description: str
+    input_schema: Dict[str, Any]
+    method: Optional[str] = None
+    positional: Tuple[str, ...] = ()
+    rename: Mapping[str, str] = field(default_factory=dict)
+    defaults: Mapping[str, Any] = field(default_factory=dict)
+    handler: Optional[ToolHandler] = None
+
+    @cached_property
+    def validator(self) -> ArgumentValidator:
+        """The input schema compiled into a validator, built on first use."""
+        return compile_validator(self.name, self.input_schema)
+
+    def validate(self, arguments: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Return the problems with ``arguments``; empty when they match the schema."""
+        return self.validator(arguments)
+
+    def to_tool(self) -> Tool:
+        """Return the MCP tool definition."""
+        return Tool(name=self.name, description=self.description, inputSchema=self.input_schema)
+
+    async def call(self, client: DolibarrClient, arguments: Dict[str, Any]) -> Any:
+        """Run the tool with ``client`` and return its result."""
+        if self.handler is not None:
+            return await self.handler(client, arguments)
+        kwargs = {**self.defaults, **arguments}
+        args = [kwargs.pop(name) for name in self.positional]
+        for source, target in self.rename.items():
+            if source in kwargs:
+                kwargs[target] = kwargs.pop(source)
+        return await getattr(client, self.method)(*args, **kwargs)
+
+
+def _escape_sqlfilter(value: str) -> str:
+    """Escape single quotes for SQL filters."""
+    return value.replace("'", "''")
+
+
+def _search(method: str, argument: str, template: str) -> ToolHandler:
+    """Build a handler that searches with ``template`` filled with the escaped ``argument``."""
+    async def handler(client: DolibarrClient, arguments: Dict[str, Any]) -> Any:
+        sqlfilters = template.format(_escape_sqlfilter(arguments[argument]))
+        return await getattr(client, method)(sqlfilters=sqlfilters, limit=arguments.get("limit", 20))
+    return handler
+
+
+async def _test_connection(client: DolibarrClient, arguments: Dict[str, Any]) -> Any:
+    """Check the API connection, wrapping the status in a success envelope."""
+    result = await client.get_status()
+    if 'success' not in result:
+        result = {"status": "success", "message": "API connection working", "data": result}
+    return result
+
+
+async def _get_client_diagnostics(client: DolibarrClient, arguments: Dict[str, Any]) -> Any:
+    """Report the client's own state without contacting Dolibarr."""
+    return client.get_diagnostics()
+
+
+async def _resolve_product_ref(client: DolibarrClient, arguments: Dict[str, Any]) -> Any:
+    """Map an exact product ref to one product, or report 'not_found'/'ambiguous'."""
+    ref = arguments['ref']
+    sqlfilters = f"(t.ref:like:'{_escape_sqlfilter(ref)}')"
+    products = await client.search_products(sqlfilters=sqlfilters, limit=2)
+
+    if not products:
+        return {"status": "not_found", "message": f"Product with ref '{ref}' not found"}
+    if len(products) == 1:
+        return {"status": "ok", "product": products[0]}
+    # Check if one is exact match
+    exact_matches = [p for p in products if p.get('ref') == ref]
+    if len(exact_matches) == 1:
+        return {"status": "ok", "product": exact_matches[0]}
+    return {"status": "ambiguous", "message": f"Multiple products found for ref '{ref}'", "products": products}
+
+
+async def _export_resource(client: DolibarrClient, arguments: Dict[str, Any]) -> Any:
+    """Export a resource to a file in the configured export directory."""
+    fmt = arguments.get("format", "ndjson")
+    path = export_path(
+        client.config.dolibarr_export_dir,
+        arguments["resource"],
+        fmt,
+        arguments.get("filename"),
+    )
+    return await export_resource(
+        client,
+        arguments["resource"],
+        path,
+        fmt=fmt,
+        fields=arguments.get("fields"),
+        sqlfilters=arguments.get("sqlfilters"),
+        resume=arguments.get("resume", False),
+    )
+
+
+TOOLS: Tuple[ToolSpec, ...] = (
+    # System & Info
+    ToolSpec(
+        name="test_connection",
+        description="Test Dolibarr API connection",
+        input_schema={"type": "object", "properties": {}, "additionalProperties": False},
+        handler=_test_connection,
+    ),
+    ToolSpec(
+        name="get_status",
+        description="Get Dolibarr system status and version information",
+        input_schema={"type": "object", "properties": {}, "additionalProperties": False},
+        method="get_status",
+    ),
+    ToolSpec(
+        name="get_client_diagnostics",
+        description=(
+            "Get diagnostics of the MCP server's Dolibarr client, such as circuit breaker states per "
+            "resource family. Use this to explain why calls are failing fast; it does not contact Dolibarr."
+        ),
+        input_schema={"type": "object", "properties": {}, "additionalProperties": False},
+        handler=_get_client_diagnostics,
+    ),
+
+    # Search Tools
+    ToolSpec(
+        name="search_products_by_ref",
+        description=(
+            "Search products by (partial) reference. Use this when a product reference appears in the text "
+            "but may be incomplete or slightly uncertain. This tool returns a small, filtered list and should "
+            "be preferred over get_products for any kind of lookup by reference."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "ref_prefix": {
+                    "type": "string",
+                    "description": "Prefix of the product reference",
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of results",
+                    "default": 20,
+                },
+            },
+            "required": ["ref_prefix"],
+            "additionalProperties": False,
+        },
+        handler=_search("search_products", "ref_prefix", "(t.ref:like:'{}%')"),
+    ),
+    ToolSpec(
+        name="search_customers",
+        description=(
+            "Search customers/third parties by name or alias. Use this whenever you need to find a customer "
+            "from a name in text instead of loading a full list. Pay attention to legal suffixes and exact matches "
+            "(e.g. 'GmbH' vs 'OG', 'Inc', etc.). Do not use get_customers for name-based search."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Search term for name or alias",
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of results",
+                    "default": 20,
+                },
+            },
+            "required": ["query"],
+            "additionalProperties": False,
+        },
+        handler=_search(
+            "search_customers", "query", "((t.nom:like:'%{0}%') OR (t.name_alias:like:'%{0}%'))"
+        ),
+    ),
+    ToolSpec(
+        name="search_products_by_label",
+        description=(
+            "Search products by label/description text. Use this when you only know the human-readable product "
+            "name or part of it. Prefer this over get_products for any label-based lookup to keep result sets small."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "label_search": {
+                    "type": "string",
+                    "description": "Search term in product label",
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of results",
+                    "default": 20,
+                },
+            },
+            "required": ["label_search"],
+            "additionalProperties": False,
+        },
+        handler=_search("search_products", "label_search", "(t.label:like:'%{}%')"),
+    ),
+    ToolSpec(
+        name="resolve_product_ref",
+        description=(
+            "Resolve an exact product reference (ref) to a single product. Use this only when the exact reference "
+            "string is known and you need a deterministic mapping to a product ID before creating orders or invoices. "
+            "Returns a structured result with status 'ok', 'not_found', or 'ambiguous'. Do not use this for fuzzy search."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "ref": {"type": "string", "description": "Exact product reference"}
+            },
+            "required": ["ref"],
+            "additionalProperties": False,
+        },
+        handler=_resolve_product_ref,
+    ),
+
+    # User Management CRUD
+    ToolSpec(
+        name="get_users",
+        description=(
+            "Get an unfiltered paginated list of users from Dolibarr. "
+            "Use this only when you explicitly need a page of users for inspection or debugging. "
+            "Do not use this tool to search by name, login or email (there is no server-side filter here)."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of users to return (default: 100)",
+                    "default": 100,
+                },
+                "page": {
+                    "type": "integer",
+                    "description": "Page number for pagination (default: 1)",
+                    "default": 1,
+                },
+            },
+            "additionalProperties": False,
+        },
+        method="get_users",
+        defaults={"limit": 100, "page": 1},
+    ),
+    ToolSpec(
+        name="get_user_by_id",
+        description=(
+            "Get the details of exactly one user by numeric ID. "
+            "Use this only when you already know the internal Dolibarr user_id. "
+            "Do not pass login, email or name here."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "user_id": {
+                    "type": "integer",
+                    "description": "Exact numeric Dolibarr user ID (not login, not email).",
+                }
+            },
+            "required": ["user_id"],
+            "additionalProperties": False,
+        },
+        method="get_user_by_id",
+        positional=("user_id",),
+    ),
+    ToolSpec(
+        name="create_user",
+        description="Create a new user",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "login": {"type": "string", "description": "User login"},
+                "lastname": {"type": "string", "description": "Last name"},
+                "firstname": {"type": "string", "description": "First name"},
+                "email": {"type": "string", "description": "Email address"},
+                "password": {"type": "string", "description": "Password"},
+                "admin": {
+                    "type": "integer",
+                    "description": "Admin level (0=No, 1=Yes)",
+                    "default": 0,
+                },
+            },
+            "required": ["login", "lastname"],
+            "additionalProperties": False,
+        },
+        method="create_user",
+    ),
+    ToolSpec(
+        name="update_user",
+        description="Update an existing user",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "user_id": {"type": "integer", "description": "User ID to update"},
+                "login": {"type": "string", "description": "User login"},
+                "lastname": {"type": "string", "description": "Last name"},
+                "firstname": {"type": "string", "description": "First name"},
+                "email": {"type": "string", "description": "Email address"},
+                "admin": {
+                    "type": "integer",
+                    "description": "Admin level (0=No, 1=Yes)",
+                },
+            },
+            "required": ["user_id"],
+            "additionalProperties": False,
+        },
+        method="update_user",
+        positional=("user_id",),
+    ),
+    ToolSpec(
+        name="delete_user",
+        description="Delete a user",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "user_id": {"type": "integer", "description": "User ID to delete"}
+            },
+            "required": ["user_id"],
+            "additionalProperties": False,
+        },
+        method="delete_user",
+        positional=("user_id",),
+    ),
+
+    # Customer/Third Party Management CRUD
+    ToolSpec(
+        name="get_customers",
+        description=(
+            "Get an unfiltered paginated list of customers/third parties from Dolibarr. "
+            "Intended for debugging or browsing only. DO NOT use this tool to search by name or alias "
+            "(use the dedicated search_* tools such as search_customers instead)."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of customers to return (default: 100)",
+                    "default": 100,
+                },
+                "page": {
+                    "type": "integer",
+                    "description": "Page number for pagination (default: 1)",
+                    "default": 1,
+                },
+            },
+            "additionalProperties": False,
+        },
+        method="get_customers",
+        defaults={"limit": 100, "page": 1},
+    ),
+    ToolSpec(
+        name="get_customer_by_id",
+        description=(
+            "Get the details of exactly one customer by numeric ID. "
+            "Use this only when you already know the internal Dolibarr customer_id. "
+            "Do not pass name or email here."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "customer_id": {
+                    "type": "integer",
+                    "description": "Exact numeric Dolibarr customer ID (not name).",
+                }
+            },
+            "required": ["customer_id"],
+            "additionalProperties": False,
+        },
+        method="get_customer_by_id",
+        positional=("customer_id",),
+    ),
+    ToolSpec(
+        name="create_customer",
+        description="Create a new customer/third party",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "name": {"type": "string", "description": "Customer name"},
+                "email": {"type": "string", "description": "Email address"},
+                "phone": {"type": "string", "description": "Phone number"},
+                "address": {"type": "string", "description": "Customer address"},
+                "town": {"type": "string", "description": "City/Town"},
+                "zip": {"type": "string", "description": "Postal code"},
+                "country_id": {
+                    "type": "integer",
+                    "description": "Country ID (default: 1)",
+                    "default": 1,
+                },
+                "type": {
+                    "type": "integer",
+                    "description": "Customer type (1=Customer, 2=Supplier, 3=Both)",
+                    "default": 1,
+                },
+                "status": {
+                    "type": "integer",
+                    "description": "Status (1=Active, 0=Inactive)",
+                    "default": 1,
+                },
+            },
+            "required": ["name"],
+            "additionalProperties": False,
+        },
+        method="create_customer",
+    ),
+    ToolSpec(
+        name="update_customer",
+        description="Update an existing customer",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "customer_id": {
+                    "type": "integer",
+                    "description": "Customer ID to update",
+                },
+                "name": {"type": "string", "description": "Customer name"},
+                "email": {"type": "string", "description": "Email address"},
+                "phone": {"type": "string", "description": "Phone number"},
+                "address": {"type": "string", "description": "Customer address"},
+                "town": {"type": "string", "description": "City/Town"},
+                "zip": {"type": "string", "description": "Postal code"},
+                "status": {
+                    "type": "integer",
+                    "description": "Status (1=Active, 0=Inactive)",
+                },
+            },
+            "required": ["customer_id"],
+            "additionalProperties": False,
+        },
+        method="update_customer",
+        positional=("customer_id",),
+    ),
+    ToolSpec(
+        name="delete_customer",
+        description="Delete a customer",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "customer_id": {
+                    "type": "integer",
+                    "description": "Customer ID to delete",
+                }
+            },
+            "required": ["customer_id"],
+            "additionalProperties": False,
+        },
+        method="delete_customer",
+        positional=("customer_id",),
+    ),
+
+    # Product Management CRUD
+    ToolSpec(
+        name="get_products",
+        description=(
+            "Get an unfiltered list of products from Dolibarr. "
+            "Intended for debugging or bulk inspection only. DO NOT use this tool to search by reference or label "
+            "(use search_products_by_ref or search_products_by_label instead)."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of products to return (default: 100)",
+                    "default": 100,
+                },
+                "page": {
+                    "type": "integer",
+                    "description": "Page number for pagination (default: 1)",
+                    "default": 1,
+                },
+            },
+            "additionalProperties": False,
+        },
+        method="get_products",
+        defaults={"limit": 100, "page": 1},
+    ),
+    ToolSpec(
+        name="get_product_by_id",
+        description=(
+            "Get the details of exactly one product by numeric ID. "
+            "Use this only when you already know the internal Dolibarr product_id. "
+            "Do not pass reference or label here."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "product_id": {
+                    "type": "integer",
+                    "description": "Exact numeric Dolibarr product ID (not ref).",
+                }
+            },
+            "required": ["product_id"],
+            "additionalProperties": False,
+        },
+        method="get_product_by_id",
+        positional=("product_id",),
+    ),
+    ToolSpec(
+        name="create_product",
+        description="Create a new product",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "label": {"type": "string", "description": "Product name/label"},
+                "price": {"type": "number", "description": "Product price"},
+                "description": {"type": "string", "description": "Product description"},
+                "stock": {
+                    "type": "integer",
+                    "description": "Initial stock quantity",
+                },
+            },
+            "required": ["label", "price"],
+            "additionalProperties": False,
+        },
+        method="create_product",
+    ),
+    ToolSpec(
+        name="update_product",
+        description="Update an existing product",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "product_id": {
+                    "type": "integer",
+                    "description": "Product ID to update",
+                },
+                "label": {"type": "string", "description": "Product name/label"},
+                "price": {"type": "number", "description": "Product price"},
+                "description": {
+                    "type": "string",
+                    "description": "Product description",
+                },
+            },
+            "required": ["product_id"],
+            "additionalProperties": False,
+        },
+        method="update_product",
+        positional=("product_id",),
+    ),
+    ToolSpec(
+        name="delete_product",
+        description="Delete a product",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "product_id": {
+                    "type": "integer",
+                    "description": "Product ID to delete",
+                }
+            },
+            "required": ["product_id"],
+            "additionalProperties": False,
+        },
+        method="delete_product",
+        positional=("product_id",),
+    ),
+
+    # Invoice Management CRUD
+    ToolSpec(
+        name="get_invoices",
+        description=(
+            "Get a paginated list of invoices from Dolibarr, optionally filtered by status. "
+            "Use this only if you really need a list of many invoices (e.g. overviews, reports). "
+            "Do not use this as a search-by-customer or search-by-reference tool."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of invoices to return (default: 100)",
+                    "default": 100,
+                },
+                "status": {
+                    "type": "string",
+                    "description": "Invoice status filter (draft, unpaid, paid, etc.)",
+                },
+            },
+            "additionalProperties": False,
+        },
+        method="get_invoices",
+        defaults={"limit": 100, "status": None},
+    ),
+    ToolSpec(
+        name="get_invoice_by_id",
+        description=(
+            "Get the details of exactly one invoice by numeric ID. "
+            "Use this only when you already know the internal Dolibarr invoice_id. "
+            "Do not pass invoice reference here."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "invoice_id": {
+                    "type": "integer",
+                    "description": "Exact numeric Dolibarr invoice ID.",
+                }
+            },
+            "required": ["invoice_id"],
+            "additionalProperties": False,
+        },
+        method="get_invoice_by_id",
+        positional=("invoice_id",),
+    ),
+    ToolSpec(
+        name="create_invoice",
+        description=(
+            "ALWAYS creates a new invoice. Do not use this tool to modify an existing invoice. "
+            "Before calling this, resolve the correct customer and product IDs using the appropriate search_* tools "
+            "(e.g. search_customers, search_products_by_ref, resolve_product_ref). "
+            "For lines: Use product_id for existing products whenever possible and set product_type=0 for goods "
+            "and product_type=1 for services. Use free-text lines only if no matching product exists in Dolibarr."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "customer_id": {
+                    "type": "integer",
+                    "description": "Customer ID (Dolibarr socid of the third party to invoice)",
+                },
+                "date": {
+                    "type": "string",
+                    "description": "Invoice date (YYYY-MM-DD)",
+                },
+                "due_date": {
+                    "type": "string",
+                    "description": "Due date (YYYY-MM-DD)",
+                },
+                "lines": {
+                    "type": "array",
+                    "description": "Invoice lines",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "desc": {
+                                "type": "string",
+                                "description": "Line description",
+                            },
+                            "qty": {"type": "number", "description": "Quantity"},
+                            "subprice": {
+                                "type": "number",
+                                "description": "Unit price",
+                            },
+                            "total_ht": {
+                                "type": "number",
+                                "description": "Total excluding tax",
+                            },
+                            "total_ttc": {
+                                "type": "number",
+                                "description": "Total including tax",
+                            },
+                            "vat": {"type": "number", "description": "VAT rate"},
+                            "product_id": {
+                                "type": "integer",
+                                "description": "Product ID to link (optional)",
+                            },
+                            "product_type": {
+                                "type": "integer",
+                                "description": "Type of line (0=Product, 1=Service)",
+                            },
+                        },
+                        "required": ["desc", "qty", "subprice"],
+                        "additionalProperties": False,
+                    },
+                },
+            },
+            "required": ["customer_id", "lines"],
+            "additionalProperties": False,
+        },
+        method="create_invoice",
+    ),
+    ToolSpec(
+        name="update_invoice",
+        description="Update an existing invoice",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "invoice_id": {
+                    "type": "integer",
+                    "description": "Invoice ID to update",
+                },
+                "date": {
+                    "type": "string",
+                    "description": "Invoice date (YYYY-MM-DD)",
+                },
+                "due_date": {
+                    "type": "string",
+                    "description": "Due date (YYYY-MM-DD)",
+                },
+            },
+            "required": ["invoice_id"],
+            "additionalProperties": False,
+        },
+        method="update_invoice",
+        positional=("invoice_id",),
+    ),
+    ToolSpec(
+        name="delete_invoice",
+        description="Delete an invoice",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "invoice_id": {
+                    "type": "integer",
+                    "description": "Invoice ID to delete",
+                }
+            },
+            "required": ["invoice_id"],
+            "additionalProperties": False,
+        },
+        method="delete_invoice",
+        positional=("invoice_id",),
+    ),
+
+    ToolSpec(
+        name="create_invoice_draft",
+        description=(
+            "Create a new invoice draft (header only). "
+            "Use this to start a new invoice, then use add_invoice_line to add items. "
+            "Returns the new invoice_id."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "customer_id": {
+                    "type": "integer",
+                    "description": "Customer ID (Dolibarr socid)",
+                },
+                "date": {
+                    "type": "string",
+                    "description": "Invoice date (YYYY-MM-DD)",
+                },
+                "project_id": {
+                    "type": "integer",
+                    "description": "Linked project ID (optional)",
+                },
+            },
+            "required": ["customer_id", "date"],
+            "additionalProperties": False,
+        },
+        method="create_invoice",
+        rename={"customer_id": "socid", "project_id": "fk_project"},
+    ),
+    ToolSpec(
+        name="add_invoice_line",
+        description="Add a line item to an existing draft invoice.",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "invoice_id": {
+                    "type": "integer",
+                    "description": "Invoice ID",
+                },
+                "desc": {
+                    "type": "string",
+                    "description": "Line description",
+                },
+                "qty": {
+                    "type": "number",
+                    "description": "Quantity",
+                },
+                "subprice": {
+                    "type": "number",
+                    "description": "Unit price (net)",
+                },
+                "product_id": {
+                    "type": "integer",
+                    "description": "Product ID (optional)",
+                },
+                "product_type": {
+                    "type": "integer",
+                    "description": "Type (0=Product, 1=Service)",
+                    "default": 0,
+                },
+                "vat": {
+                    "type": "number",
+                    "description": "VAT rate (optional)",
+                },
+            },
+            "required": ["invoice_id", "desc", "qty", "subprice"],
+            "additionalProperties": False,
+        },
+        method="add_invoice_line",
+        positional=("invoice_id",),
+    ),
+    ToolSpec(
+        name="update_invoice_line",
+        description="Update an existing line in a draft invoice.",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "invoice_id": {
+                    "type": "integer",
+                    "description": "Invoice ID",
+                },
+                "line_id": {
+                    "type": "integer",
+                    "description": "Line ID to update",
+                },
+                "desc": {
+                    "type": "string",
+                    "description": "New description",
+                },
+                "qty": {
+                    "type": "number",
+                    "description": "New quantity",
+                },
+                "subprice": {
+                    "type": "number",
+                    "description": "New unit price",
+                },
+                "vat": {
+                    "type": "number",
+                    "description": "New VAT rate",
+                },
+            },
+            "required": ["invoice_id", "line_id"],
+            "additionalProperties": False,
+        },
+        method="update_invoice_line",
+        positional=("invoice_id", "line_id"),
+    ),
+    ToolSpec(
+        name="delete_invoice_line",
+        description="Delete a line from a draft invoice.",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "invoice_id": {
+                    "type": "integer",
+                    "description": "Invoice ID",
+                },
+                "line_id": {
+                    "type": "integer",
+                    "description": "Line ID to delete",
+                },
+            },
+            "required": ["invoice_id", "line_id"],
+            "additionalProperties": False,
+        },
+        method="delete_invoice_line",
+        positional=("invoice_id", "line_id"),
+    ),
+    ToolSpec(
+        name="set_invoice_project",
+        description="Link an invoice to a project.",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "invoice_id": {
+                    "type": "integer",
+                    "description": "Invoice ID",
+                },
+                "project_id": {
+                    "type": "integer",
+                    "description": "Project ID",
+                },
+            },
+            "required": ["invoice_id", "project_id"],
+            "additionalProperties": False,
+        },
+        method="update_invoice",
+        positional=("invoice_id",),
+        rename={"project_id": "fk_project"},
+    ),
+    ToolSpec(
+        name="validate_invoice",
+        description="Validate a draft invoice (change status to unpaid).",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "invoice_id": {
+                    "type": "integer",
+                    "description": "Invoice ID",
+                },
+                "warehouse_id": {
+                    "type": "integer",
+                    "description": "Warehouse ID for stock decrease (optional)",
+                    "default": 0,
+                },
+            },
+            "required": ["invoice_id"],
+            "additionalProperties": False,
+        },
+        method="validate_invoice",
+        positional=("invoice_id",),
+    ),
+
+    # Order Management CRUD
+    ToolSpec(
+        name="get_orders",
+        description=(
+            "Get a paginated list of orders from Dolibarr, optionally filtered by status. "
+            "Use this for overviews or reporting. Not suitable for searching specific orders by customer, project "
+            "or reference (there is no server-side search here)."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of orders to return (default: 100)",
+                    "default": 100,
+                },
+                "status": {
+                    "type": "string",
+                    "description": "Order status filter",
+                },
+            },
+            "additionalProperties": False,
+        },
+        method="get_orders",
+        defaults={"limit": 100, "status": None},
+    ),
+    ToolSpec(
+        name="get_order_by_id",
+        description=(
+            "Get the details of exactly one order by numeric ID. "
+            "Use this only when you already know the internal Dolibarr order_id. "
+            "Do not pass order reference here."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "order_id": {
+                    "type": "integer",
+                    "description": "Exact numeric Dolibarr order ID.",
+                }
+            },
+            "required": ["order_id"],
+            "additionalProperties": False,
+        },
+        method="get_order_by_id",
+        positional=("order_id",),
+    ),
+    ToolSpec(
+        name="create_order",
+        description=(
+            "Create a new customer order. Use this only when you have already resolved the correct customer "
+            "ID (socid) using search_customers or related tools. This tool does not update existing orders."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "customer_id": {
+                    "type": "integer",
+                    "description": "Customer ID (socid)",
+                },
+                "date": {
+                    "type": "string",
+                    "description": "Order date (YYYY-MM-DD)",
+                },
+            },
+            "required": ["customer_id"],
+            "additionalProperties": False,
+        },
+        method="create_order",
+    ),
+    ToolSpec(
+        name="update_order",
+        description="Update an existing order",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "order_id": {
+                    "type": "integer",
+                    "description": "Order ID to update",
+                },
+                "date": {
+                    "type": "string",
+                    "description": "Order date (YYYY-MM-DD)",
+                },
+            },
+            "required": ["order_id"],
+            "additionalProperties": False,
+        },
+        method="update_order",
+        positional=("order_id",),
+    ),
+    ToolSpec(
+        name="delete_order",
+        description="Delete an order",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "order_id": {
+                    "type": "integer",
+                    "description": "Order ID to delete",
+                }
+            },
+            "required": ["order_id"],
+            "additionalProperties": False,
+        },
+        method="delete_order",
+        positional=("order_id",),
+    ),
+
+    # Contact Management CRUD
+    ToolSpec(
+        name="get_contacts",
+        description=(
+            "Get a paginated list of contacts from Dolibarr. "
+            "Use this only if you need a generic list of contacts. "
+            "Do not treat this as a name search; if you need search-by-name, a dedicated search tool should be used."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of contacts to return (default: 100)",
+                    "default": 100,
+                },
+                "page": {
+                    "type": "integer",
+                    "description": "Page number for pagination (default: 1)",
+                    "default": 1,
+                },
+            },
+            "additionalProperties": False,
+        },
+        method="get_contacts",
+        defaults={"limit": 100, "page": 1},
+    ),
+    ToolSpec(
+        name="get_contact_by_id",
+        description=(
+            "Get the details of exactly one contact by numeric ID. "
+            "Use this only when you already know the internal Dolibarr contact_id. "
+            "Do not pass name or email here."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "contact_id": {
+                    "type": "integer",
+                    "description": "Exact numeric Dolibarr contact ID.",
+                }
+            },
+            "required": ["contact_id"],
+            "additionalProperties": False,
+        },
+        method="get_contact_by_id",
+        positional=("contact_id",),
+    ),
+    ToolSpec(
+        name="create_contact",
+        description="Create a new contact",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "firstname": {"type": "string", "description": "First name"},
+                "lastname": {"type": "string", "description": "Last name"},
+                "email": {"type": "string", "description": "Email address"},
+                "phone": {"type": "string", "description": "Phone number"},
+                "socid": {
+                    "type": "integer",
+                    "description": "Associated company ID (thirdparty socid)",
+                },
+            },
+            "required": ["firstname", "lastname"],
+            "additionalProperties": False,
+        },
+        method="create_contact",
+    ),
+    ToolSpec(
+        name="update_contact",
+        description="Update an existing contact",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "contact_id": {
+                    "type": "integer",
+                    "description": "Contact ID to update",
+                },
+                "firstname": {"type": "string", "description": "First name"},
+                "lastname": {"type": "string", "description": "Last name"},
+                "email": {"type": "string", "description": "Email address"},
+                "phone": {"type": "string", "description": "Phone number"},
+            },
+            "required": ["contact_id"],
+            "additionalProperties": False,
+        },
+        method="update_contact",
+        positional=("contact_id",),
+    ),
+    ToolSpec(
+        name="delete_contact",
+        description="Delete a contact",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "contact_id": {
+                    "type": "integer",
+                    "description": "Contact ID to delete",
+                }
+            },
+            "required": ["contact_id"],
+            "additionalProperties": False,
+        },
+        method="delete_contact",
+        positional=("contact_id",),
+    ),
+
+    # Project Management CRUD
+    ToolSpec(
+        name="get_projects",
+        description=(
+            "Get a paginated list of projects from Dolibarr, optionally filtered by status. "
+            "Use this for overviews or when you need to iterate through project pages. "
+            "Do not use this to search for a project by name or reference (use search_projects instead)."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of projects to return (default: 100)",
+                    "default": 100,
+                },
+                "page": {
+                    "type": "integer",
+                    "description": "Page number for pagination (default: 1)",
+                    "default": 1,
+                },
+                "status": {
+                    "type": "integer",
+                    "description": "Project status filter (e.g. 0=draft, 1=open, 2=closed)",
+                    "default": 1,
+                },
+            },
+            "additionalProperties": False,
+        },
+        method="get_projects",
+        defaults={"limit": 100, "page": 1, "status": None},
+    ),
+    ToolSpec(
+        name="get_project_by_id",
+        description=(
+            "Get the details of exactly one project by numeric ID. "
+            "Use this only when you already know the internal Dolibarr project_id. "
+            "Do not pass project reference here."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "project_id": {
+                    "type": "integer",
+                    "description": "Exact numeric Dolibarr project ID.",
+                }
+            },
+            "required": ["project_id"],
+            "additionalProperties": False,
+        },
+        method="get_project_by_id",
+        positional=("project_id",),
+    ),
+    ToolSpec(
+        name="search_projects",
+        description=(
+            "Search projects by reference or title. Use this when you have a partial or full project ref/title "
+            "and need to find matching projects without loading full project lists."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Search term for project ref or title",
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of results",
+                    "default": 20,
+                },
+            },
+            "required": ["query"],
+            "additionalProperties": False,
+        },
+        handler=_search(
+            "search_projects", "query", "((t.ref:like:'%{0}%') OR (t.title:like:'%{0}%'))"
+        ),
+    ),
+    ToolSpec(
+        name="create_project",
+        description="Create a new project",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "ref": {
+                    "type": "string",
+                    "description": "Project reference (optional, if Dolibarr auto-generates)",
+                },
+                "title": {"type": "string", "description": "Project title"},
+                "description": {
+                    "type": "string",
+                    "description": "Project description",
+                },
+                "socid": {
+                    "type": "integer",
+                    "description": "Linked customer ID (thirdparty)",
+                },
+                "status": {
+                    "type": "integer",
+                    "description": "Project status (e.g. 1=open)",
+                    "default": 1,
+                },
+            },
+            "required": ["title"],
+            "additionalProperties": False,
+        },
+        method="create_project",
+    ),
+    ToolSpec(
+        name="update_project",
+        description="Update an existing project",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "project_id": {
+                    "type": "integer",
+                    "description": "Project ID to update",
+                },
+                "title": {"type": "string", "description": "Project title"},
+                "description": {
+                    "type": "string",
+                    "description": "Project description",
+                },
+                "status": {
+                    "type": "integer",
+                    "description": "Project status",
+                },
+            },
+            "required": ["project_id"],
+            "additionalProperties": False,
+        },
+        method="update_project",
+        positional=("project_id",),
+    ),
+    ToolSpec(
+        name="delete_project",
+        description="Delete a project",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "project_id": {
+                    "type": "integer",
+                    "description": "Project ID to delete",
+                }
+            },
+            "required": ["project_id"],
+            "additionalProperties": False,
+        },
+        method="delete_project",
+        positional=("project_id",),
+    ),
+
+    # Bulk Export
+    ToolSpec(
+        name="export_resource",
+        description=(
+            "Export every record of a resource to a file on the MCP server and return its path and record count. "
+            "Use this for bulk data extraction instead of paging through get_* tools; the records are not "
+            "returned in the response. Parquet and Arrow produce typed columnar files for analytics; "
+            "invoice_lines flattens the lines of every invoice. An interrupted NDJSON or CSV export can be "
+            "continued with resume=true and the same filename."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "resource": {
+                    "type": "string",
+                    "description": "Resource to export",
+                    "enum": sorted(EXPORT_RESOURCES),
+                },
+                "format": {
+                    "type": "string",
+                    "description": "Output file format (default: ndjson)",
+                    "enum": sorted(EXPORT_FORMATS),
+                    "default": "ndjson",
+                },
+                "filename": {
+                    "type": "string",
+                    "description": "File name inside the server's export directory (generated when omitted)",
+                },
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Only export these fields (output columns)",
+                },
+                "sqlfilters": {
+                    "type": "string",
+                    "description": "Dolibarr SQL filter, e.g. \"(t.fk_statut:=:1)\"",
+                },
+                "resume": {
+                    "type": "boolean",
+                    "description": "Continue an interrupted export of the same filename",
+                    "default": False,
+                },
+            },
+            "required": ["resource"],
+            "additionalProperties": False,
+        },
+        handler=_export_resource,
+    ),
+
+    # Raw API Access
+    ToolSpec(
+        name="dolibarr_raw_api",
+        description=(
+            "Low-level escape hatch to call any Dolibarr REST endpoint directly. "
+            "Use this ONLY if there is no dedicated high-level tool available for your use case. "
+            "You must pass a valid Dolibarr API path and parameters yourself; the server does not validate them. "
+            "Incorrect usage can cause errors or side effects (such as creating or deleting unexpected data)."
+        ),
+        input_schema={
+            "type": "object",
+            "properties": {
+                "method": {
+                    "type": "string",
+                    "description": "HTTP method",
+                    "enum": ["GET", "POST", "PUT", "DELETE"],
+                },
+                "endpoint": {
+                    "type": "string",
+                    "description": "Dolibarr API endpoint path (e.g. '/thirdparties', '/invoices/123'). Must be a valid existing endpoint.",
+                },
+                "params": {
+                    "type": "object",
+                    "description": "Query parameters",
+                },
+                "data": {
+                    "type": "object",
+                    "description": "Request payload for POST/PUT requests",
+                },
+            },
+            "required": ["method", "endpoint"],
+            "additionalProperties": False,
+        },
+        method="dolibarr_raw_api",
+    ),
+)
+
+# Dispatch table for tool calls
+TOOL_REGISTRY: Dict[str, ToolSpec] = {spec.name: spec for spec in TOOLS}
+
+
+def profile_tools(*profiles: str) -> FrozenSet[str]:
+    """Return the names of the tools enabled by every one of ``profiles``."""
+    names = frozenset(TOOL_REGISTRY)
+    for profile in profiles:
+        if profile not in TOOL_PROFILES:
+            raise ValueError(f"Unknown tool profile '{profile}' (expected one of: {', '.join(TOOL_PROFILES)})")
+        if TOOL_PROFILES[profile] is not None:
+            names &= TOOL_PROFILES[profile]
+    return names
+
+
+@lru_cache(maxsize=None)
+def tool_list(names: Optional[FrozenSet[str]] = None) -> List[Tool]:
+    """Return the ``tools/list`` tools, built on first use and shared by every session.
+
+    ``names`` limits the list to those tools, e.g. the tools of a profile;
+    one list is cached per set of names and must not be modified. A plain
+    list is what every supported SDK accepts from a ``list_tools`` handler.
+    """
+    return [spec.to_tool() for spec in TOOLS if names is None or spec.name in names]
@@ -0,0 +1,75 @@
+"""Compile tool input schemas into pydantic validators for fast local argument checks."""
+
+from typing import Any, Callable, Dict, List, Literal, Type
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, create_model
+
+ArgumentValidator = Callable[[Dict[str, Any]], List[Dict[str, Any]]]
+
+_SCALAR_TYPES = {"string": str, "integer": int, "number": float, "boolean": bool}
+
+
+def _annotation(schema: Dict[str, Any], name: str) -> Any:
+    """Return the Python type accepted by a JSON schema fragment."""
+    if "enum" in schema:
+        return Literal[tuple(schema["enum"])]
+    kind = schema.get("type")
+    if kind == "array":
+        return List[_annotation(schema.get("items", {}), name)]
+    if kind == "object":
+        return _compile_model(name, schema) if "properties" in schema else Dict[str, Any]
+    return _SCALAR_TYPES.get(kind, Any)
+
+
+def _compile_model(name: str, schema: Dict[str, Any]) -> Type[BaseModel]:
+    """Build a strict model for an object schema.
+
+    Properties are declared through aliases so names such as ``json`` or
+    ``schema`` cannot clash with ``BaseModel`` attributes. Optional
+    properties default to ``None`` but an explicit ``null`` is rejected,
+    as in JSON Schema.
+    """
+    required = set(schema.get("required", ()))
+    fields = {}
+    for index, (prop, prop_schema) in enumerate(schema.get("properties", {}).items()):
+        default = ... if prop in required else None
+        annotation = _annotation(prop_schema, f"{name}_{prop}")
+        fields[f"field_{index}"] = (annotation, Field(default, alias=prop))
+    extra = "forbid" if schema.get("additionalProperties") is False else "allow"
+    return create_model(name, __config__=ConfigDict(extra=extra, strict=True), **fields)
+
+
+def _allowed_fields(schema: Dict[str, Any], loc: tuple) -> List[str]:
+    """Return the property names of the object schema at ``loc``."""
+    for part in loc:
+        if isinstance(part, int):
+            schema = schema.get("items", {})
+        else:
+            schema = schema.get("properties", {}).get(part, {})
+    return list(schema.get("properties", {}))
+
+
+def compile_validator(name: str, schema: Dict[str, Any]) -> ArgumentValidator:
+    """Compile ``schema`` once and return a function listing the problems of an argument dict.
+
+    Each problem names the offending ``field`` (dotted path, list indexes
+    included) and the ``problem``; unexpected fields also list the
+    ``allowed`` ones. An empty list means the arguments are valid.
+    """
+    model = _compile_model(f"{name}_arguments", schema)
+
+    def validate(arguments: Dict[str, Any]) -> List[Dict[str, Any]]:
+        try:
+            model.model_validate(arguments)
+        except ValidationError as e:
+            problems = []
+            for error in e.errors(include_url=False):
+                loc = error["loc"]
+                problem = {"field": ".".join(str(part) for part in loc), "problem": error["msg"]}
+                if error["type"] == "extra_forbidden":
+                    problem["allowed"] = _allowed_fields(schema, loc[:-1])
+                problems.append(problem)
+            return problems
+        return []
+
+    return validate
@@ -0,0 +1,99 @@
+"""Shared fixtures for the test suite."""
+
+import asyncio
+import json
+import re
+from unittest.mock import MagicMock
+
+import aiohttp
+import pytest
+
+from dolibarr_mcp.dolibarr_client import DolibarrAPIError
+
+
+class FakeTable:
+    """Stand-in for a paged Dolibarr list endpoint serving the rows ``ids``.
+
+    Requests honour ``limit``, ``page``, ``sortorder`` and ``t.rowid``
+    bounds in ``sqlfilters`` and are recorded in ``calls``. Options:
+
+    * ``not_found_past_end``: answer 404 instead of ``[]`` past the last row
+    * ``fail_after``: fail every request after that many with HTTP 504
+    * ``keyset``: assert that no request uses ``page``
+    * ``record``: build each record from its id
+    * ``chunk_size`` / ``fail_at_page``: for :meth:`http_request`, the body
+      chunk size and the page whose body breaks off halfway
+    """
+
+    def __init__(
+        self,
+        ids,
+        not_found_past_end=False,
+        fail_after=None,
+        keyset=False,
+        record=None,
+        chunk_size=16,
+        fail_at_page=None,
+    ):
+        self.ids = list(ids)
+        self.not_found_past_end = not_found_past_end
+        self.fail_after = fail_after
+        self.keyset = keyset
+        self.record = record or (lambda i: {"id": str(i)})
+        self.chunk_size = chunk_size
+        self.fail_at_page = fail_at_page
+        self.calls = []
+        self.chunks_sent = 0
+        self.responses = []
+
+    def rows(self, params):
+        """Return the records of the page described by ``params``."""
+        self.calls.append(dict(params))
+        if self.keyset:
+            assert "page" not in params
+        ids = sorted(self.ids, reverse=params.get("sortorder") == "DESC")
+        for op, value in re.findall(r"t\.rowid:(<=|>):(\d+)", params.get("sqlfilters", "")):
+            bound = int(value)
+            ids = [i for i in ids if (i <= bound if op == "<=" else i > bound)]
+        start = params.get("page", 0) * params["limit"]
+        return [self.record(i) for i in ids[start:start + params["limit"]]]
+
+    async def request(self, method, endpoint, params=None, data=None, idempotent=None):
+        """Replace ``DolibarrClient._request_with_retries``."""
+        await asyncio.sleep(0)
+        rows = self.rows(params)
+        if self.fail_after is not None and len(self.calls) > self.fail_after:
+            raise DolibarrAPIError("Gateway timeout", status_code=504)
+        if not rows and self.not_found_past_end:
+            raise DolibarrAPIError("Not found", status_code=404)
+        return rows
+
+    async def http_request(self, method, url, params=None, **kwargs):
+        """Replace ``aiohttp.ClientSession.request``, streaming the body in small chunks.
+
+        Past the last row it answers 404, like older Dolibarr versions.
+        """
+        rows = self.rows(params)
+        body = json.dumps(rows if rows else {"error": {"code": 404}}).encode()
+        failing = self.fail_at_page is not None and self.fail_at_page == params.get("page")
+
+        async def iter_chunked(size):
+            for offset in range(0, len(body), self.chunk_size):
+                if failing and offset > len(body) // 2:
+                    raise aiohttp.ClientPayloadError("connection reset")
+                self.chunks_sent += 1
+                yield body[offset:offset + self.chunk_size]
+
+        response = MagicMock()
+        response.status = 200 if rows else 404
+        response.reason = "OK" if rows else "Not Found"
+        response.headers = {}
+        response.content.iter_chunked = iter_chunked
+        self.responses.append(response)
+        return response
+
+
+@pytest.fixture
+def fake_table():
+    """Return a factory for :class:`FakeTable` stand-ins."""
+    return FakeTable
@@ -0,0 +1,16 @@
+"""Shared helpers for the test suite."""
+
+from unittest.mock import MagicMock
+
+
+def content_stream(body: bytes) -> MagicMock:
+    """Return a stand-in for ``response.content`` yielding ``body`` in two chunks."""
+    async def iter_chunked(size):
+        half = len(body) // 2
+        for chunk in (body[:half], body[half:]):
+            if chunk:
+                yield chunk
+
+    content = MagicMock()
+    content.iter_chunked = iter_chunked
+    return content
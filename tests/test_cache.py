@@ -0,0 +1,213 @@
+"""Tests for the in-process response cache."""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, patch
+
+from dolibarr_mcp.cache import ResponseCache, split_endpoint
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrAPIError, DolibarrClient
+
+
+def _key(endpoint, **params):
+    return endpoint, tuple(sorted(params.items()))
+
+
+@pytest.fixture
+def cached_config():
+    return Config(
+        dolibarr_url="https://test.dolibarr.com/api/index.php",
+        api_key="test_key",
+        dolibarr_cache_ttl=60,
+        dolibarr_cache_resource_ttls="users=0",
+    )
+
+
+class TestResponseCache:
+    """Test cases for ResponseCache."""
+
+    def test_split_endpoint(self):
+        assert split_endpoint("invoices/12/lines") == ("invoices", "invoices/12")
+        assert split_endpoint("/thirdparties") == ("thirdparties", None)
+        assert split_endpoint("users?limit=1") == ("users", None)
+
+    def test_entries_expire(self):
+        now = [0.0]
+        cache = ResponseCache(clock=lambda: now[0])
+        cache.set(_key("products/1"), {"id": 1}, ttl=10)
+
+        assert cache.get(_key("products/1")) == (True, {"id": 1})
+        now[0] = 10.0
+        assert cache.get(_key("products/1")) == (False, None)
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_stale_entry_is_served_within_grace_window(self):
+        now = [0.0]
+        cache = ResponseCache(stale_ttl=5, clock=lambda: now[0])
+        cache.set(_key("status"), {"ok": 1}, ttl=10)
+
+        now[0] = 12.0
+        assert cache.get(_key("status")) == (True, {"ok": 1})
+        assert cache.claim_refresh(_key("status"))
+        assert not cache.claim_refresh(_key("status"))
+        cache.release_refresh(_key("status"))
+        assert cache.claim_refresh(_key("status"))
+
+        now[0] = 15.0
+        assert cache.get(_key("status"))[0] is False
+        assert cache.stats()["stale_hits"] == 1
+
+    def test_hot_entry_is_refreshed_ahead_of_expiry(self):
+        now = [0.0]
+        cache = ResponseCache(refresh_ahead=0.2, clock=lambda: now[0])
+        cache.set(_key("products"), [], ttl=10)
+
+        now[0] = 9.0
+        cache.get(_key("products"))
+        assert not cache.claim_refresh(_key("products"))  # not hot yet
+        cache.get(_key("products"))
+        assert cache.claim_refresh(_key("products"))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ResponseCache(max_entries=2)
+        cache.set(_key("products/1"), 1, ttl=10)
+        cache.set(_key("products/2"), 2, ttl=10)
+        cache.get(_key("products/1"))
+        cache.set(_key("products/3"), 3, ttl=10)
+
+        assert cache.get(_key("products/2"))[0] is False
+        assert cache.get(_key("products/1"))[0] is True
+        assert len(cache) == 2
+
+    def test_write_invalidates_entity_and_collections_only(self):
+        cache = ResponseCache()
+        for endpoint in ("invoices/1", "invoices/1/lines", "invoices/2", "invoices", "products/1"):
+            cache.set(_key(endpoint), {}, ttl=10)
+        cache.set(_key("invoices", limit=5), [], ttl=10)
+
+        assert cache.invalidate("invoices/1/lines") == 4
+        assert cache.get(_key("invoices/2"))[0] is True
+        assert cache.get(_key("products/1"))[0] is True
+
+    def test_store_is_skipped_after_concurrent_invalidation(self):
+        cache = ResponseCache()
+        generation = cache.generation("invoices/1")
+        cache.invalidate("invoices/1")
+        cache.set(_key("invoices/1"), {"stale": True}, ttl=10, generation=generation)
+        assert len(cache) == 0
+
+
+class TestClientCaching:
+    """Test caching behaviour of DolibarrClient reads and writes."""
+
+    @pytest.mark.asyncio
+    async def test_entity_reads_are_cached_until_mutated(self, cached_config):
+        client = DolibarrClient(cached_config)
+        with patch.object(client, "_request_with_retries", new_callable=AsyncMock) as mock_send:
+            mock_send.return_value = {"id": 1, "lines": []}
+            await client.get_invoice_by_id(1)
+            await client.get_invoice_by_id(1)
+            assert mock_send.await_count == 1
+
+            await client.add_invoice_line(1, desc="Line", qty=1, subprice=10)
+            await client.get_invoice_by_id(1)
+            assert mock_send.await_count == 3
+
+        stats = client.get_diagnostics()["cache"]
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+        await client.close_session()
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_revalidated_in_background(self):
+        config = Config(
+            dolibarr_url="https://test.dolibarr.com/api/index.php",
+            api_key="test_key",
+            dolibarr_cache_ttl=60,
+            dolibarr_cache_stale_ttl=30,
+        )
+        client = DolibarrClient(config)
+        now = [0.0]
+        client.cache._clock = lambda: now[0]
+
+        with patch.object(client, "_request_with_retries", new_callable=AsyncMock) as mock_send:
+            mock_send.return_value = {"id": 1, "label": "Old"}
+            await client.get_product_by_id(1)
+
+            now[0] = 70.0
+            mock_send.return_value = {"id": 1, "label": "New"}
+            assert (await client.get_product_by_id(1))["label"] == "Old"
+            await asyncio.gather(*client._background)
+
+            assert (await client.get_product_by_id(1))["label"] == "New"
+            assert mock_send.await_count == 2
+        await client.close_session()
+
+    @pytest.mark.asyncio
+    async def test_resource_override_disables_caching(self, cached_config):
+        client = DolibarrClient(cached_config)
+        with patch.object(client, "_request_with_retries", new_callable=AsyncMock) as mock_send:
+            mock_send.return_value = {"id": 1}
+            await client.get_user_by_id(1)
+            await client.get_user_by_id(1)
+            assert mock_send.await_count == 2
+        await client.close_session()
+
+    def test_invalid_resource_ttls_are_rejected(self):
+        with pytest.raises(ValueError, match="resource=seconds"):
+            Config(dolibarr_url="https://test.com", api_key="key", dolibarr_cache_resource_ttls="products")
+
+
+class TestNegativeCaching:
+    """Test caching of not-found lookups."""
+
+    @pytest_asyncio.fixture
+    async def client(self):
+        config = Config(
+            dolibarr_url="https://test.dolibarr.com/api/index.php",
+            api_key="test_key",
+            dolibarr_cache_negative_ttl=15,
+        )
+        client = DolibarrClient(config)
+        yield client
+        await client.close_session()
+
+    @pytest.mark.asyncio
+    async def test_not_found_entity_is_cached_until_create(self, client):
+        not_found = DolibarrAPIError("Object not found", status_code=404, response_data={})
+        with patch.object(client, "_request_with_retries", new_callable=AsyncMock) as mock_send:
+            mock_send.side_effect = not_found
+            for _ in range(3):
+                with pytest.raises(DolibarrAPIError) as exc_info:
+                    await client.get_customer_by_id(42)
+                assert exc_info.value.status_code == 404
+            assert mock_send.await_count == 1
+
+            mock_send.side_effect = None
+            mock_send.return_value = {"id": 42}
+            await client.create_customer(name="Acme")
+            assert await client.get_customer_by_id(42) == {"id": 42}
+
+        assert client.get_diagnostics()["cache"]["negative_hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_empty_search_is_cached_until_create(self, client):
+        with patch.object(client, "_request_with_retries", new_callable=AsyncMock) as mock_send:
+            mock_send.return_value = []
+            await client.search_products("(t.ref:like:'MISSING')", limit=2)
+            await client.search_products("(t.ref:like:'MISSING')", limit=2)
+            assert mock_send.await_count == 1
+
+            # Non-empty results are not cached without a positive TTL
+            mock_send.return_value = [{"id": 1}]
+            await client.search_products("(t.ref:like:'OTHER')", limit=2)
+            await client.search_products("(t.ref:like:'OTHER')", limit=2)
+            assert mock_send.await_count == 3
+
+            mock_send.return_value = {"id": 5}
+            await client.create_product(ref="MISSING", label="Now exists")
+            mock_send.return_value = [{"id": 5, "ref": "MISSING"}]
+            assert await client.search_products("(t.ref:like:'MISSING')", limit=2) == [{"id": 5, "ref": "MISSING"}]
@@ -0,0 +1,107 @@
+"""Tests for response compression negotiation and decoding."""
+
+import gzip
+import json
+import zlib
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from dolibarr_mcp import compression
+from dolibarr_mcp.compression import MAX_DECODED_PIECE, ContentDecoder, accepted_encodings
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrClient
+
+RECORDS = [{"id": str(i), "ref": f"FA{i:04d}", "note_public": "Facture mensuelle"} for i in range(200)]
+BODY = json.dumps(RECORDS).encode()
+
+
+def _decode_in_chunks(encoding, data, size=100):
+    decoder = ContentDecoder(encoding)
+    out = b"".join(
+        piece for start in range(0, len(data), size) for piece in decoder.decompress(data[start:start + size])
+    )
+    return out + decoder.flush()
+
+
+class TestNegotiation:
+    """Test cases for the requested encodings."""
+
+    def test_auto_requests_brotli_only_when_installed(self, monkeypatch):
+        monkeypatch.setattr(compression, "brotli", None)
+        assert accepted_encodings("auto") == ["gzip", "deflate"]
+        monkeypatch.setattr(compression, "brotli", object())
+        assert accepted_encodings("auto") == ["br", "gzip", "deflate"]
+
+    def test_explicit_and_disabled_settings(self):
+        assert accepted_encodings("none") == []
+        assert accepted_encodings("gzip") == ["gzip"]
+
+    def test_invalid_setting_falls_back_to_auto(self):
+        config = Config(dolibarr_url="https://test.com", api_key="key", dolibarr_http_compression="zstd")
+        assert config.dolibarr_http_compression == "auto"
+
+
+class TestContentDecoder:
+    """Test cases for ContentDecoder."""
+
+    def test_gzip(self):
+        assert _decode_in_chunks("gzip", gzip.compress(BODY)) == BODY
+
+    @pytest.mark.parametrize("wbits", [zlib.MAX_WBITS, -zlib.MAX_WBITS])
+    def test_deflate_with_and_without_zlib_header(self, wbits):
+        compressor = zlib.compressobj(wbits=wbits)
+        data = compressor.compress(BODY) + compressor.flush()
+        assert _decode_in_chunks("deflate", data) == BODY
+
+    def test_brotli(self):
+        brotli = pytest.importorskip("brotli")
+        assert _decode_in_chunks("br", brotli.compress(BODY)) == BODY
+
+    def test_identity_and_unknown_encodings_pass_through(self):
+        assert _decode_in_chunks(None, BODY) == BODY
+        assert not ContentDecoder("zstd").compressed
+
+    def test_decoded_pieces_are_bounded(self):
+        bomb = gzip.compress(b"0" * (4 * MAX_DECODED_PIECE))
+        pieces = list(ContentDecoder("gzip").decompress(bomb))
+        assert len(pieces) >= 4
+        assert max(len(piece) for piece in pieces) <= MAX_DECODED_PIECE
+
+    def test_corrupt_body_raises_value_error(self):
+        with pytest.raises(ValueError, match="Invalid gzip"):
+            _decode_in_chunks("gzip", b"\x1f\x8b not really gzip")
+
+
+class TestClientCompression:
+    """Test compression handling in DolibarrClient."""
+
+    @pytest.mark.asyncio
+    @patch('aiohttp.ClientSession.request')
+    async def test_gzip_response_is_decoded_and_measured(self, mock_request):
+        wire = gzip.compress(BODY)
+
+        async def iter_chunked(size):
+            for start in range(0, len(wire), 512):
+                yield wire[start:start + 512]
+
+        mock_response = MagicMock()
+        mock_response.status = 200
+        mock_response.headers = {"Content-Encoding": "gzip"}
+        mock_response.content.iter_chunked = iter_chunked
+        mock_request.return_value.__aenter__.return_value = mock_response
+
+        config = Config(
+            dolibarr_url="https://test.dolibarr.com/api/index.php",
+            api_key="test_key",
+            dolibarr_http_compression="gzip,deflate",
+        )
+        async with DolibarrClient(config) as client:
+            assert client.session.headers["Accept-Encoding"] == "gzip, deflate"
+            assert await client.get_invoices(limit=200) == RECORDS
+            transfer = client.get_diagnostics()["transfer"]
+
+        assert transfer["compressed_responses"] == 1
+        assert transfer["bytes_on_wire"] == len(wire)
+        assert transfer["bytes_decoded"] == len(BODY)
+        assert transfer["compression_ratio"] > 5
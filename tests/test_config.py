@@ -37,6 +37,7 @@ class TestConfig:
         with patch.dict(os.environ, {}, clear=True):
             config = Config()
             assert config.log_level == 'INFO'  # Default log level
+            assert config.dolibarr_max_response_size == 64 * 1024 * 1024
     
     def test_config_url_normalization(self):
         """Test URL normalization (adding API path)."""
@@ -126,3 +127,45 @@ class TestConfig:
             dolibarr_api_key='test_key'
         )
         assert config.api_key == 'test_key'  # Should work via alias
+
+    def test_connection_pool_settings_from_env(self):
+        """Test connection pool settings are read from the environment."""
+        with patch.dict(os.environ, {
+            'DOLIBARR_HTTP_POOL_LIMIT': '20',
+            'DOLIBARR_HTTP_POOL_LIMIT_PER_HOST': '8',
+            'DOLIBARR_HTTP_KEEPALIVE_TIMEOUT': '60',
+            'DOLIBARR_HTTP_TIMEOUT': '45',
+        }):
+            config = Config(dolibarr_url='https://test.com', dolibarr_api_key='key')
+            assert config.dolibarr_http_pool_limit == 20
+            assert config.dolibarr_http_pool_limit_per_host == 8
+            assert config.dolibarr_http_keepalive_timeout == 60.0
+            assert config.dolibarr_http_timeout == 45.0
+            assert config.dolibarr_http_connect_timeout == 10.0
+
+    def test_invalid_connection_pool_settings(self):
+        """Test negative pool sizes and non-positive timeouts are rejected."""
+        with pytest.raises(ValueError):
+            Config(dolibarr_url='https://test.com', dolibarr_api_key='key', dolibarr_http_pool_limit=-1)
+        with pytest.raises(ValueError):
+            Config(dolibarr_url='https://test.com', dolibarr_api_key='key', dolibarr_http_timeout=0)
+
+    def test_reload_env_file(self, tmp_path, monkeypatch):
+        """Test .env changes reach the environment without overriding process variables."""
+        from dolibarr_mcp import config as config_module
+
+        env_file = tmp_path / ".env"
+        env_file.write_text("MCP_TOOL_PROFILE=crm\nLOG_LEVEL=DEBUG\n")
+        monkeypatch.setattr(config_module, "_DOTENV_PATH", str(env_file))
+        monkeypatch.setattr(config_module, "_PROCESS_ENV", frozenset({"LOG_LEVEL"}))
+        monkeypatch.setattr(config_module, "_dotenv_keys", set())
+        monkeypatch.setenv("LOG_LEVEL", "WARNING")
+        monkeypatch.delenv("MCP_TOOL_PROFILE", raising=False)
+
+        config_module.reload_env_file()
+        assert os.environ["MCP_TOOL_PROFILE"] == "crm"
+        assert os.environ["LOG_LEVEL"] == "WARNING"
+
+        env_file.write_text("LOG_LEVEL=DEBUG\n")
+        config_module.reload_env_file()
+        assert "MCP_TOOL_PROFILE" not in os.environ
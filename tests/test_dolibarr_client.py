@@ -1,10 +1,21 @@
 """Tests for Dolibarr client functionality."""
 
+import asyncio
+import json
+import tempfile
+
 import pytest
 from unittest.mock import AsyncMock, patch
 
 from dolibarr_mcp.config import Config
-from dolibarr_mcp.dolibarr_client import DolibarrClient, DolibarrAPIError
+from dolibarr_mcp.dolibarr_client import (
+    DolibarrAPIError,
+    DolibarrClient,
+    DolibarrResponseTooLargeError,
+)
+
+from .helpers import content_stream
+
 
 
 class TestDolibarrClient:
@@ -52,6 +63,23 @@ class TestDolibarrClient:
         await client.close_session()
         assert client.session is None
     
+    @pytest.mark.asyncio
+    async def test_connection_pool_configuration(self):
+        """Test connector and timeouts follow the configuration."""
+        config = Config(
+            dolibarr_url="https://test.dolibarr.com/api/index.php",
+            api_key="test_key",
+            dolibarr_http_pool_limit=12,
+            dolibarr_http_pool_limit_per_host=4,
+            dolibarr_http_timeout=5,
+        )
+
+        async with DolibarrClient(config) as client:
+            connector = client.session.connector
+            assert connector.limit == 12
+            assert connector.limit_per_host == 4
+            assert client.session.timeout.total == 5
+    
     @pytest.mark.asyncio
     async def test_context_manager(self):
         """Test async context manager functionality."""
@@ -73,7 +101,8 @@ class TestDolibarrClient:
         # Mock response
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.text.return_value = '{"success": {"code": 200, "dolibarr_version": "21.0.1"}}'
+        mock_response.content = content_stream(b'{"success": {"code": 200, "dolibarr_version": "21.0.1"}}')
+        mock_response.headers = {}
         mock_request.return_value.__aenter__.return_value = mock_response
         
         config = Config(
@@ -96,7 +125,8 @@ class TestDolibarrClient:
         mock_response = AsyncMock()
         mock_response.status = 404
         mock_response.reason = "Not Found"
-        mock_response.text.return_value = '{"error": "Object not found"}'
+        mock_response.content = content_stream(b'{"error": "Object not found"}')
+        mock_response.headers = {}
         mock_request.return_value.__aenter__.return_value = mock_response
         
         config = Config(
@@ -111,6 +141,61 @@ class TestDolibarrClient:
             assert exc_info.value.status_code == 404
             assert "Object not found" in str(exc_info.value)
     
+    @pytest.mark.asyncio
+    @patch('aiohttp.ClientSession.request')
+    async def test_concurrent_identical_gets_are_coalesced(self, mock_request):
+        """Test identical concurrent GETs share one HTTP request."""
+        release = asyncio.Event()
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.content = content_stream(b'{"id": 7, "name": "Acme"}')
+        mock_response.headers = {}
+
+        async def slow_enter(*args, **kwargs):
+            await release.wait()
+            return mock_response
+
+        mock_request.return_value.__aenter__.side_effect = slow_enter
+
+        config = Config(
+            dolibarr_url="https://test.dolibarr.com/api/index.php",
+            api_key="test_key"
+        )
+
+        async with DolibarrClient(config) as client:
+            calls = [asyncio.ensure_future(client.get_customer_by_id(7)) for _ in range(5)]
+            other = asyncio.ensure_future(client.get_customer_by_id(8))
+            await asyncio.sleep(0)
+            release.set()
+            results = await asyncio.gather(*calls, other)
+
+            assert all(result["id"] == 7 for result in results[:5])
+            assert mock_request.call_count == 2
+            assert client.get_diagnostics()["coalesced_requests"] == 4
+
+            # Completed requests are not reused
+            await client.get_customer_by_id(7)
+            assert mock_request.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_list_pages_are_mapped_to_zero_based(self):
+        """Test 1-based tool pages are sent as Dolibarr's 0-based pages."""
+        config = Config(
+            dolibarr_url="https://test.dolibarr.com/api/index.php",
+            api_key="test_key"
+        )
+        client = DolibarrClient(config)
+
+        with patch.object(client, 'request') as mock_request:
+            mock_request.return_value = []
+            for method in (
+                client.get_users, client.get_customers, client.get_products, client.get_contacts, client.get_projects
+            ):
+                await method(limit=10)
+                assert "page" not in mock_request.call_args[1]["params"]
+                await method(limit=10, page=3)
+                assert mock_request.call_args[1]["params"]["page"] == 2
+
     def test_url_building(self):
         """Test URL building functionality."""
         config = Config(
@@ -158,6 +243,50 @@ class TestDolibarrAPIError:
         assert error.response_data is None
 
 
+class TestResponseSizeLimits:
+    """Test the in-memory body limit and the response size ceiling."""
+
+    @staticmethod
+    def _client(**limits):
+        return DolibarrClient(Config(
+            dolibarr_url="https://test.dolibarr.com/api/index.php",
+            api_key="test_key",
+            **limits,
+        ))
+
+    @pytest.mark.asyncio
+    @patch('aiohttp.ClientSession.request')
+    async def test_large_body_is_spilled_and_parsed_from_disk(self, mock_request, tmp_path, monkeypatch):
+        monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+        records = [{"id": str(i), "ref": f"FA{i:04d}"} for i in range(50)]
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.content = content_stream(json.dumps(records).encode())
+        mock_response.headers = {}
+        mock_request.return_value.__aenter__.return_value = mock_response
+
+        async with self._client(dolibarr_max_body_size=100) as client:
+            assert await client.get_invoices(limit=50) == records
+            assert client.get_diagnostics()["large_responses"]["spilled"] == 1
+
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    @patch('aiohttp.ClientSession.request')
+    async def test_oversized_response_is_rejected(self, mock_request):
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.content = content_stream(b"[" + b'{"id": "1"},' * 100 + b'{"id": "2"}]')
+        mock_response.headers = {}
+        mock_request.return_value.__aenter__.return_value = mock_response
+
+        async with self._client(dolibarr_max_body_size=100, dolibarr_max_response_size=500) as client:
+            with pytest.raises(DolibarrResponseTooLargeError, match="500-byte limit"):
+                await client.dolibarr_raw_api(method="GET", endpoint="/invoices")
+            assert client.get_diagnostics()["large_responses"]["rejected"] == 1
+            assert mock_request.call_count == 1
+
+
 # Example of how to add integration tests
 @pytest.mark.integration
 class TestDolibarrIntegration:
@@ -0,0 +1,142 @@
+"""Tests for streaming exports."""
+
+import csv
+import json
+
+import pytest
+import pytest_asyncio
+from unittest.mock import patch
+
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrAPIError, DolibarrClient
+from dolibarr_mcp.export import export_path, export_resource
+
+
+def _invoice(i):
+    return {"id": str(i), "ref": f"FA{i:04d}", "lines": [{"qty": i}]}
+
+
+@pytest_asyncio.fixture
+async def client():
+    config = Config(
+        dolibarr_url="https://test.dolibarr.com/api/index.php",
+        api_key="test_key",
+        dolibarr_page_size=10,
+    )
+    client = DolibarrClient(config)
+    yield client
+    await client.close_session()
+
+
+class TestExport:
+    """Test cases for export_resource."""
+
+    @pytest.mark.asyncio
+    async def test_ndjson_export_streams_all_records(self, client, fake_table, tmp_path):
+        source = fake_table(range(1, 26), record=_invoice)
+        progress = []
+        path = tmp_path / "invoices.ndjson"
+
+        with patch.object(client, "_request_with_retries", side_effect=source.request):
+            result = await export_resource(client, "invoices", str(path), progress=progress.append)
+
+        lines = path.read_text().splitlines()
+        assert result["records"] == 25
+        assert [json.loads(line)["ref"] for line in lines][:2] == ["FA0001", "FA0002"]
+        assert progress == [10, 20, 25]
+        assert not (tmp_path / "invoices.ndjson.checkpoint").exists()
+
+    @pytest.mark.asyncio
+    async def test_csv_export_encodes_nested_values(self, client, fake_table, tmp_path):
+        source = fake_table(range(1, 4), record=_invoice)
+        path = tmp_path / "invoices.csv"
+
+        with patch.object(client, "_request_with_retries", side_effect=source.request):
+            await export_resource(client, "invoices", str(path), fmt="csv", fields=["id", "lines"])
+
+        with path.open() as fh:
+            rows = list(csv.DictReader(fh))
+        assert list(rows[0].keys()) == ["id", "lines"]
+        assert json.loads(rows[2]["lines"]) == [{"qty": 3}]
+
+    @pytest.mark.asyncio
+    async def test_interrupted_export_resumes_without_duplicates(self, client, fake_table, tmp_path):
+        path = tmp_path / "invoices.csv"
+        source = fake_table(range(1, 36), record=_invoice, fail_after=2)
+        with patch.object(client, "_request_with_retries", side_effect=source.request):
+            with pytest.raises(DolibarrAPIError):
+                await export_resource(client, "invoices", str(path), fmt="csv")
+
+        checkpoint = json.loads((tmp_path / "invoices.csv.checkpoint").read_text())
+        assert checkpoint["last_id"] == 20
+
+        source = fake_table(range(1, 36), record=_invoice)
+        with patch.object(client, "_request_with_retries", side_effect=source.request):
+            result = await export_resource(client, "invoices", str(path), fmt="csv", resume=True)
+
+        with path.open() as fh:
+            rows = list(csv.DictReader(fh))
+        assert result["resumed"] is True
+        assert result["records"] == 35
+        assert [int(r["id"]) for r in rows] == list(range(1, 36))
+        assert source.calls[0]["sqlfilters"] == "(t.rowid:>:20)"
+
+    @pytest.mark.asyncio
+    async def test_sharded_exports_cannot_be_resumed(self, client, tmp_path):
+        path = tmp_path / "invoices.csv"
+        path.write_text("id\n1\n")
+        with pytest.raises(ValueError, match="cannot be resumed"):
+            await export_resource(client, "invoices", str(path), fmt="csv", workers=4, resume=True)
+        assert path.read_text() == "id\n1\n"
+
+    def test_export_path_stays_in_export_directory(self, tmp_path):
+        path = export_path(str(tmp_path), "invoices", "csv", "../../etc/passwd")
+        assert path == str(tmp_path / "passwd")
+        assert export_path(str(tmp_path), "invoices", "ndjson").endswith(".ndjson")
+        with pytest.raises(ValueError):
+            export_path(str(tmp_path), "invoices", "xml")
+
+
+class TestColumnarExport:
+    """Test cases for the Parquet and Arrow formats."""
+
+    @pytest.mark.asyncio
+    async def test_parquet_export_writes_typed_row_groups(self, client, fake_table, tmp_path, monkeypatch):
+        pq = pytest.importorskip("pyarrow.parquet")
+        monkeypatch.setattr("dolibarr_mcp.export.ROW_GROUP_SIZE", 20)
+        source = fake_table(range(1, 46), record=_invoice)
+        path = tmp_path / "invoices.parquet"
+
+        with patch.object(client, "_request_with_retries", side_effect=source.request):
+            result = await export_resource(client, "invoices", str(path), fmt="parquet")
+
+        parquet = pq.ParquetFile(str(path))
+        table = parquet.read()
+        assert result["records"] == 45
+        assert parquet.num_row_groups == 3
+        assert str(table.schema.field("id").type) == "int64"
+        assert str(table.schema.field("total_ht").type) == "double"
+        assert table.column("id").to_pylist() == list(range(1, 46))
+        assert not (tmp_path / "invoices.parquet.checkpoint").exists()
+
+    @pytest.mark.asyncio
+    async def test_arrow_export_flattens_invoice_lines(self, client, fake_table, tmp_path):
+        pa = pytest.importorskip("pyarrow")
+        source = fake_table(range(1, 5), record=_invoice)
+        path = tmp_path / "lines.arrow"
+
+        with patch.object(client, "_request_with_retries", side_effect=source.request):
+            result = await export_resource(
+                client, "invoice_lines", str(path), fmt="arrow", fields=["fk_facture", "invoice_ref", "qty"]
+            )
+
+        table = pa.ipc.open_file(str(path)).read_all()
+        assert result["records"] == 4
+        assert table.column_names == ["fk_facture", "invoice_ref", "qty"]
+        assert table.column("fk_facture").to_pylist() == [1, 2, 3, 4]
+        assert table.column("qty").to_pylist() == [1.0, 2.0, 3.0, 4.0]
+
+    @pytest.mark.asyncio
+    async def test_columnar_exports_cannot_be_resumed(self, client, tmp_path):
+        with pytest.raises(ValueError, match="cannot be resumed"):
+            await export_resource(client, "invoices", str(tmp_path / "x.parquet"), fmt="parquet", resume=True)
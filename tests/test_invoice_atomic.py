@@ -3,6 +3,9 @@ from unittest.mock import AsyncMock, patch
 from dolibarr_mcp.config import Config
 from dolibarr_mcp.dolibarr_client import DolibarrClient
 
+from .helpers import content_stream
+
+
 @pytest.mark.asyncio
 class TestInvoiceAtomic:
     
@@ -18,7 +21,8 @@ class TestInvoiceAtomic:
     async def test_add_invoice_line(self, mock_request, client):
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.text.return_value = '123' # Returns line ID usually
+        mock_response.content = content_stream(b'123') # Returns line ID usually
+        mock_response.headers = {}
         mock_request.return_value.__aenter__.return_value = mock_response
 
         async with client:
@@ -45,7 +49,8 @@ class TestInvoiceAtomic:
     async def test_update_invoice_line(self, mock_request, client):
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.text.return_value = '{"success": 1}'
+        mock_response.content = content_stream(b'{"success": 1}')
+        mock_response.headers = {}
         mock_request.return_value.__aenter__.return_value = mock_response
 
         async with client:
@@ -64,7 +69,8 @@ class TestInvoiceAtomic:
     async def test_delete_invoice_line(self, mock_request, client):
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.text.return_value = '{"success": 1}'
+        mock_response.content = content_stream(b'{"success": 1}')
+        mock_response.headers = {}
         mock_request.return_value.__aenter__.return_value = mock_response
 
         async with client:
@@ -78,7 +84,8 @@ class TestInvoiceAtomic:
     async def test_validate_invoice(self, mock_request, client):
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.text.return_value = '{"success": 1}'
+        mock_response.content = content_stream(b'{"success": 1}')
+        mock_response.headers = {}
         mock_request.return_value.__aenter__.return_value = mock_response
 
         async with client:
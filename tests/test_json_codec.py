@@ -0,0 +1,93 @@
+"""Tests for the pluggable JSON codecs."""
+
+import json
+
+import pytest
+
+from dolibarr_mcp import json_codec
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.json_codec import JsonOffloader, StdlibCodec, estimate_size, get_codec
+
+CODEC_NAMES = ["json"] + (["orjson"] if json_codec.orjson is not None else [])
+
+
+@pytest.mark.parametrize("name", CODEC_NAMES)
+class TestCodecs:
+    """Behaviour shared by every codec."""
+
+    def test_loads_bytes_and_text(self, name):
+        codec = get_codec(name)
+        assert codec.loads(b'{"ref": "FA\xc3\xa9", "lines": [1, 2]}') == {"ref": "FAé", "lines": [1, 2]}
+        assert codec.loads('[{"id": "1"}]') == [{"id": "1"}]
+
+    def test_decode_errors_are_value_errors(self, name):
+        with pytest.raises(ValueError):
+            get_codec(name).loads(b"<html>Fatal error</html>")
+
+    def test_pretty_and_compact_output(self, name):
+        codec = get_codec(name)
+        data = {"id": 1, "lines": [{"qty": 2.5, "label": "Café"}]}
+        pretty = codec.dumps(data)
+        compact = codec.dumps(data, compact=True)
+
+        assert json.loads(pretty) == json.loads(compact) == data
+        assert "\n  " in pretty
+        assert " " not in compact.replace("Café", "")
+        assert len(compact) < len(pretty)
+
+    def test_big_integers_fall_back_to_stdlib(self, name):
+        assert json.loads(get_codec(name).dumps({"id": 2 ** 70})) == {"id": 2 ** 70}
+
+
+class TestCodecSelection:
+    """Test backend resolution."""
+
+    def test_auto_prefers_orjson_when_installed(self):
+        expected = "orjson" if json_codec.orjson is not None else "json"
+        assert get_codec("auto").name == expected
+
+    def test_missing_orjson_falls_back_to_stdlib(self, monkeypatch):
+        monkeypatch.setattr(json_codec, "orjson", None)
+        assert isinstance(get_codec("orjson"), StdlibCodec)
+
+    def test_invalid_settings_use_defaults(self):
+        config = Config(
+            dolibarr_url="https://test.com",
+            api_key="key",
+            dolibarr_json_backend="simdjson",
+            mcp_json_output="tiny",
+        )
+        assert config.dolibarr_json_backend == "auto"
+        assert config.mcp_json_output == "pretty"
+
+
+class TestJsonOffloader:
+    """Test offloading of large payloads to a worker pool."""
+
+    def test_estimate_size_extrapolates_from_first_record(self):
+        records = [{"id": str(i), "ref": "FA0001"} for i in range(1000)]
+        exact = len(StdlibCodec().dumps(records, compact=True))
+        assert 0.8 * exact <= estimate_size(records, StdlibCodec()) <= 1.2 * exact
+
+    @pytest.mark.asyncio
+    async def test_small_payloads_stay_inline(self):
+        offloader = JsonOffloader(get_codec(), threshold=1024)
+        assert await offloader.loads(b'{"id": 1}') == {"id": 1}
+        assert await offloader.dumps({"id": 1}, compact=True) == '{"id":1}'
+        assert offloader.stats()["offloaded_loads"] == 0
+        assert offloader._pool is None
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    @pytest.mark.asyncio
+    async def test_large_payloads_run_in_pool(self, executor):
+        offloader = JsonOffloader(get_codec(), threshold=64, executor=executor, max_workers=1)
+        records = [{"id": i, "label": "Line"} for i in range(50)]
+        try:
+            assert await offloader.loads(json.dumps(records).encode()) == records
+            assert json.loads(await offloader.dumps(records)) == records
+        finally:
+            offloader.shutdown()
+
+        stats = offloader.stats()
+        assert (stats["offloaded_loads"], stats["offloaded_dumps"]) == (1, 1)
+        assert stats["executor"] == executor
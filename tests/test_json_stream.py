@@ -0,0 +1,68 @@
+"""Tests for incremental JSON array parsing."""
+
+import json
+
+import pytest
+
+from dolibarr_mcp.json_codec import StdlibCodec, load_json_file
+from dolibarr_mcp.json_stream import ArrayItemParser
+
+
+def _parse_in_chunks(data: bytes, size: int):
+    parser = ArrayItemParser()
+    items = []
+    for start in range(0, len(data), size):
+        items.extend(parser.feed(data[start:start + size]))
+    items.extend(parser.close())
+    return items
+
+
+RECORDS = [
+    {"id": "1", "ref": "FA0001", "note": "Café, \"quoted\" ]", "lines": [{"qty": 2}]},
+    12345,
+    -0.5e3,
+    True,
+    None,
+    "plain",
+    [],
+    {},
+]
+
+
+class TestArrayItemParser:
+    """Test cases for ArrayItemParser."""
+
+    @pytest.mark.parametrize("size", [1, 2, 7, 4096])
+    def test_any_chunking_yields_the_same_items(self, size):
+        data = json.dumps(RECORDS, ensure_ascii=False, indent=1).encode("utf-8")
+        assert _parse_in_chunks(data, size) == RECORDS
+
+    def test_items_are_returned_as_soon_as_complete(self):
+        parser = ArrayItemParser()
+        assert parser.feed(b'[{"id": 1}, {"id"') == [{"id": 1}]
+        assert parser.feed(b': 2}, 3') == [{"id": 2}]
+        assert parser.feed(b'4]') == [34]
+        assert parser.done
+        assert parser.close() == []
+
+    def test_empty_array(self):
+        assert _parse_in_chunks(b"  [ ] ", 1) == []
+
+    @pytest.mark.parametrize("data, message", [
+        (b'{"id": 1}', "Expected a JSON array"),
+        (b'[1, 2', "Truncated"),
+        (b'[1; 2]', "Unexpected"),
+        (b'[1] [2]', "Extra data"),
+    ])
+    def test_malformed_input_raises(self, data, message):
+        with pytest.raises(ValueError, match=message):
+            _parse_in_chunks(data, 3)
+
+    def test_load_json_file_streams_arrays_and_reads_objects(self, tmp_path):
+        array_file = tmp_path / "array.json"
+        array_file.write_text(json.dumps(RECORDS))
+        object_file = tmp_path / "object.json"
+        object_file.write_text('{"error": {"code": 500}}')
+
+        assert load_json_file(StdlibCodec(), str(array_file)) == RECORDS
+        assert load_json_file(StdlibCodec(), str(object_file)) == {"error": {"code": 500}}
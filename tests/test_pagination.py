@@ -0,0 +1,265 @@
+"""Tests for paginated iteration over Dolibarr list endpoints."""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, patch
+
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrAPIError, DolibarrClient
+
+
+@pytest_asyncio.fixture
+async def client():
+    config = Config(
+        dolibarr_url="https://test.dolibarr.com/api/index.php",
+        api_key="test_key",
+        dolibarr_page_size=10,
+    )
+    client = DolibarrClient(config)
+    yield client
+    await client.close_session()
+
+
+class TestPagination:
+    """Test cases for the iter_* helpers."""
+
+    @pytest.mark.asyncio
+    async def test_iterates_all_records_and_stops_on_short_page(self, client, fake_table):
+        table = fake_table(range(1, 26))
+        with patch.object(client, "_request_with_retries", side_effect=table.request):
+            records = [record async for record in client.iter_customers()]
+
+        assert [int(r["id"]) for r in records] == list(range(1, 26))
+        assert [c["page"] for c in table.calls] == [0, 1, 2]
+        assert table.calls[0]["limit"] == 10
+        assert table.calls[0]["sortfield"] == "t.rowid"
+
+    @pytest.mark.asyncio
+    async def test_exact_multiple_ends_on_empty_or_not_found_page(self, client, fake_table):
+        table = fake_table(range(1, 21), not_found_past_end=True)
+        with patch.object(client, "_request_with_retries", side_effect=table.request):
+            records = [record async for record in client.iter_invoices(status="paid", page_size=5)]
+
+        assert len(records) == 20
+        assert len(table.calls) == 5
+        assert all(c["status"] == "paid" for c in table.calls)
+
+    @pytest.mark.asyncio
+    async def test_pages_are_yielded_as_lists(self, client, fake_table):
+        table = fake_table(range(1, 8))
+        with patch.object(client, "_request_with_retries", side_effect=table.request):
+            pages = [page async for page in client.iter_pages("products", page_size=3)]
+
+        assert [len(page) for page in pages] == [3, 3, 1]
+
+    @pytest.mark.asyncio
+    async def test_other_errors_propagate(self, client):
+        async def failing(*args, **kwargs):
+            raise DolibarrAPIError("Forbidden", status_code=403)
+
+        with patch.object(client, "_request_with_retries", side_effect=failing):
+            with pytest.raises(DolibarrAPIError):
+                [record async for record in client.iter_contacts()]
+
+    @pytest.mark.asyncio
+    async def test_pages_bypass_the_cache(self, fake_table):
+        config = Config(
+            dolibarr_url="https://test.dolibarr.com/api/index.php",
+            api_key="test_key",
+            dolibarr_page_size=2,
+            dolibarr_cache_ttl=60,
+            dolibarr_cache_negative_ttl=60,
+        )
+        table = fake_table([1, 2], not_found_past_end=True, keyset=True)
+
+        async with DolibarrClient(config) as client:
+            with patch.object(client, "_request_with_retries", side_effect=table.request):
+                records = [r async for r in client.iter_records("invoices", mode="keyset")]
+
+            assert [int(r["id"]) for r in records] == [1, 2]
+            assert len(client.cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_prefetch_keeps_pages_in_flight_and_in_order(self, client, fake_table):
+        table = fake_table(range(1, 46))
+        in_flight = []
+        active = [0]
+
+        async def tracking_request(*args, **kwargs):
+            active[0] += 1
+            in_flight.append(active[0])
+            await asyncio.sleep(0)
+            try:
+                return await table.request(*args, **kwargs)
+            finally:
+                active[0] -= 1
+
+        with patch.object(client, "_request_with_retries", side_effect=tracking_request):
+            records = [record async for record in client.iter_records("invoices", prefetch=3)]
+
+        assert [int(r["id"]) for r in records] == list(range(1, 46))
+        assert max(in_flight) == 3
+        # Pages 0-4 hold data; at most prefetch - 1 requests overshoot the end
+        assert len(table.calls) <= 5 + 2
+
+    @pytest.mark.asyncio
+    async def test_prefetch_cancels_outstanding_pages_on_early_exit(self, client, fake_table):
+        table = fake_table(range(1, 1001))
+        with patch.object(client, "_request_with_retries", side_effect=table.request):
+            pages = client.iter_pages("thirdparties", prefetch=4)
+            first = await pages.__anext__()
+            await pages.aclose()
+
+        assert len(first) == 10
+        assert len(table.calls) <= 5
+
+
+class TestKeysetPagination:
+    """Test cases for rowid-based keyset pagination."""
+
+    @pytest.mark.asyncio
+    async def test_pages_by_last_rowid(self, client, fake_table):
+        table = fake_table([3, 5, 8, 13, 21, 34, 55], keyset=True)
+        calls = table.calls
+        with patch.object(client, "_request_with_retries", side_effect=table.request):
+            records = [r async for r in client.iter_records("invoices", page_size=3, mode="keyset")]
+
+        assert [int(r["id"]) for r in records] == [3, 5, 8, 13, 21, 34, 55]
+        assert "sqlfilters" not in calls[0]
+        assert calls[1]["sqlfilters"] == "(t.rowid:>:8)"
+        assert calls[2]["sqlfilters"] == "(t.rowid:>:34)"
+
+    @pytest.mark.asyncio
+    async def test_combines_with_user_filters_and_start_id(self, client, fake_table):
+        table = fake_table(range(1, 30), keyset=True)
+        calls = table.calls
+        with patch.object(client, "_request_with_retries", side_effect=table.request):
+            records = [
+                r async for r in client.iter_records(
+                    "thirdparties",
+                    params={"sqlfilters": "(t.client:=:1)"},
+                    page_size=10,
+                    mode="keyset",
+                    after_id=20,
+                )
+            ]
+
+        assert len(records) == 9
+        assert calls[0]["sqlfilters"] == "((t.client:=:1) AND (t.rowid:>:20))"
+
+    def test_unknown_mode_is_rejected(self, client):
+        with pytest.raises(ValueError, match="pagination mode"):
+            client.iter_pages("invoices", mode="cursor")
+
+
+class TestShardedScan:
+    """Test cases for rowid-range sharded scans."""
+
+    @pytest.mark.asyncio
+    async def test_shards_cover_every_row_once(self, client, fake_table):
+        ids = [1, 2, 3, 7, 8, 20, 21, 22, 40, 99, 100]
+        table = fake_table(ids)
+        calls = table.calls
+        with patch.object(client, "_request_with_retries", side_effect=table.request):
+            records = [
+                r async for r in client.iter_records_sharded("invoices", workers=3, shards=5, page_size=2)
+            ]
+
+        assert sorted(int(r["id"]) for r in records) == ids
+        assert any("(t.rowid:<=:20)" in c.get("sqlfilters", "") for c in calls)
+
+    @pytest.mark.asyncio
+    async def test_empty_table_yields_nothing(self, client, fake_table):
+        table = fake_table([])
+        calls = table.calls
+        with patch.object(client, "_request_with_retries", side_effect=table.request):
+            records = [r async for r in client.iter_records_sharded("thirdparties")]
+
+        assert records == []
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_shard_errors_propagate(self, client, fake_table):
+        request = fake_table(range(1, 50)).request
+
+        async def flaky(method, endpoint, params=None, data=None, idempotent=None):
+            if "t.rowid:>:" in params.get("sqlfilters", "") and params.get("limit") != 1:
+                raise DolibarrAPIError("Server error", status_code=500)
+            return await request(method, endpoint, params=params)
+
+        with patch.object(client, "_request_with_retries", side_effect=flaky):
+            with pytest.raises(DolibarrAPIError):
+                [r async for r in client.iter_records_sharded("invoices", workers=2)]
+
+
+class TestStreamedScan:
+    """Test cases for incrementally parsed list scans."""
+
+    @pytest_asyncio.fixture
+    async def client(self):
+        config = Config(
+            dolibarr_url="https://test.dolibarr.com/api/index.php",
+            api_key="test_key",
+            dolibarr_page_size=10,
+            dolibarr_stream_records=True,
+        )
+        client = DolibarrClient(config)
+        yield client
+        await client.close_session()
+
+    @pytest.mark.asyncio
+    async def test_records_arrive_before_the_page_finishes_downloading(self, client, fake_table):
+        table = fake_table(range(1, 21))
+        with patch("aiohttp.ClientSession.request", new_callable=AsyncMock, side_effect=table.http_request):
+            async with client:
+                records = client.iter_records("invoices")
+                first = await records.__anext__()
+                chunks_at_first_record = table.chunks_sent
+                rest = [r async for r in records]
+
+        assert first == {"id": "1"}
+        assert chunks_at_first_record < 3
+        assert [int(r["id"]) for r in [first] + rest] == list(range(1, 21))
+        # Pages 0 and 1 are full, page 2 answers 404 and ends the scan
+        assert [p["page"] for p in table.calls] == [0, 1, 2]
+        assert all(r.release.called for r in table.responses)
+
+    @pytest.mark.asyncio
+    async def test_keyset_scan_streams_and_filters_on_last_id(self, client, fake_table):
+        table = fake_table(range(1, 16), keyset=True)
+        calls = table.calls
+        with patch("aiohttp.ClientSession.request", new_callable=AsyncMock, side_effect=table.http_request):
+            async with client:
+                records = [r async for r in client.iter_records("thirdparties", mode="keyset")]
+
+        assert len(records) == 15
+        assert calls[1]["sqlfilters"] == "(t.rowid:>:10)"
+        assert "page" not in calls[1]
+
+    @pytest.mark.asyncio
+    async def test_streamed_scan_starts_after_id_like_whole_pages(self, client, fake_table):
+        table = fake_table(range(1, 31))
+        with patch("aiohttp.ClientSession.request", new_callable=AsyncMock, side_effect=table.http_request):
+            async with client:
+                streamed = [r async for r in client.iter_records("invoices", after_id=25)]
+        with patch.object(client, "_request_with_retries", side_effect=table.request):
+            paged = [r async for r in client.iter_records("invoices", after_id=25, stream=False)]
+
+        assert streamed == paged == [{"id": str(i)} for i in range(26, 31)]
+        assert table.calls[0] == table.calls[1]
+        assert table.calls[0]["sqlfilters"] == "(t.rowid:>:25)"
+
+    @pytest.mark.asyncio
+    async def test_failure_mid_stream_is_raised_without_retry(self, client, fake_table):
+        table = fake_table(range(1, 31), fail_at_page=1)
+        received = []
+        with patch("aiohttp.ClientSession.request", new_callable=AsyncMock, side_effect=table.http_request):
+            async with client:
+                with pytest.raises(DolibarrAPIError, match="failed after"):
+                    async for record in client.iter_records("invoices"):
+                        received.append(record)
+
+        assert 10 < len(received) < 20
+        assert len(table.calls) == 2
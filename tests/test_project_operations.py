@@ -108,5 +108,5 @@ class TestProjectOperations:
             params = kwargs["params"]
             
             assert params["limit"] == 50
-            assert params["page"] == 2
+            assert params["page"] == 1
             assert params["status"] == 1
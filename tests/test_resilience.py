@@ -0,0 +1,351 @@
+"""Tests for retry and resilience helpers."""
+
+import asyncio
+
+import aiohttp
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrAPIError, DolibarrCircuitOpenError, DolibarrClient
+from dolibarr_mcp.resilience import CircuitBreaker, RetryPolicy, TokenBucket, parse_retry_after
+
+from .helpers import content_stream
+
+
+def _response(status, text, headers=None):
+    response = AsyncMock()
+    response.status = status
+    response.reason = "Error" if status >= 400 else "OK"
+    response.content = content_stream(text.encode())
+    response.headers = headers or {}
+    return response
+
+
+@pytest.fixture
+def config():
+    return Config(
+        dolibarr_url="https://test.dolibarr.com/api/index.php",
+        api_key="test_key",
+    )
+
+
+class TestRetryPolicy:
+    """Test cases for RetryPolicy decisions."""
+
+    def test_idempotent_methods_retry_transient_statuses(self):
+        policy = RetryPolicy(max_retries=2)
+        assert policy.is_retryable("GET", 0, status=503)
+        assert policy.is_retryable("DELETE", 1, status=429)
+        assert not policy.is_retryable("GET", 2, status=503)
+
+    def test_validation_errors_are_never_retried(self):
+        policy = RetryPolicy(retry_post=True)
+        for status in (400, 401, 404, 422):
+            assert not policy.is_retryable("GET", 0, status=status)
+            assert not policy.is_retryable("POST", 0, status=status)
+
+    def test_post_requires_opt_in_and_safe_failure(self):
+        connect_error = aiohttp.ClientConnectorError(MagicMock(), OSError("refused"))
+        assert not RetryPolicy().is_retryable("POST", 0, status=429)
+        assert not RetryPolicy().is_retryable("POST", 0, error=connect_error)
+
+        policy = RetryPolicy(retry_post=True)
+        assert policy.is_retryable("POST", 0, status=429)
+        assert policy.is_retryable("POST", 0, error=connect_error)
+        assert not policy.is_retryable("POST", 0, status=503)
+        assert not policy.is_retryable("POST", 0, error=aiohttp.ServerDisconnectedError())
+        assert RetryPolicy().is_retryable("POST", 0, status=503, idempotent=True)
+
+    def test_delay_is_capped_and_honours_retry_after(self):
+        policy = RetryPolicy(backoff_base=1.0, backoff_max=4.0)
+        for attempt in range(6):
+            assert 0 <= policy.compute_delay(attempt) <= 4.0
+        assert policy.compute_delay(0, retry_after=2.5) == 2.5
+        assert policy.compute_delay(0, retry_after=60) == 4.0
+
+    def test_retries_stop_at_deadline(self):
+        policy = RetryPolicy(max_elapsed=30.0)
+        assert policy.within_deadline(10.0, 5.0)
+        assert not policy.within_deadline(30.0, 0.5)
+        assert RetryPolicy(max_elapsed=0).within_deadline(300.0, 10.0)
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after("3") == 3.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("garbage") is None
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+class TestClientRetries:
+    """Test retry behaviour of DolibarrClient requests."""
+
+    @pytest.mark.asyncio
+    @patch("dolibarr_mcp.dolibarr_client.asyncio.sleep", new_callable=AsyncMock)
+    @patch("aiohttp.ClientSession.request")
+    async def test_get_retries_transient_status(self, mock_request, mock_sleep, config):
+        mock_request.return_value.__aenter__.side_effect = [
+            _response(503, "", {"Retry-After": "1"}),
+            _response(200, '{"id": 1}'),
+        ]
+
+        async with DolibarrClient(config) as client:
+            result = await client.get_customer_by_id(1)
+
+        assert result == {"id": 1}
+        assert mock_request.call_count == 2
+        mock_sleep.assert_awaited_once_with(1.0)
+
+    @pytest.mark.asyncio
+    @patch("dolibarr_mcp.dolibarr_client.asyncio.sleep", new_callable=AsyncMock)
+    @patch("aiohttp.ClientSession.request")
+    async def test_get_retries_dropped_connection(self, mock_request, mock_sleep, config):
+        mock_request.return_value.__aenter__.side_effect = [
+            aiohttp.ServerDisconnectedError(),
+            _response(200, "[]"),
+        ]
+
+        async with DolibarrClient(config) as client:
+            result = await client.get_users()
+
+        assert result == []
+        assert mock_request.call_count == 2
+
+    @pytest.mark.asyncio
+    @patch("dolibarr_mcp.dolibarr_client.asyncio.sleep", new_callable=AsyncMock)
+    @patch("aiohttp.ClientSession.request")
+    async def test_post_is_not_retried_by_default(self, mock_request, mock_sleep, config):
+        mock_request.return_value.__aenter__.return_value = _response(503, "")
+
+        async with DolibarrClient(config) as client:
+            with pytest.raises(DolibarrAPIError) as exc_info:
+                await client.create_product(label="Widget")
+
+        assert exc_info.value.status_code == 503
+        assert mock_request.call_count == 1
+        mock_sleep.assert_not_awaited()
+
+
+    @pytest.mark.asyncio
+    @patch("dolibarr_mcp.dolibarr_client.asyncio.sleep", new_callable=AsyncMock)
+    @patch("aiohttp.ClientSession.request")
+    async def test_timed_out_request_is_not_retried_past_deadline(self, mock_request, mock_sleep, config):
+        config.dolibarr_retry_max_elapsed = 1.0
+        mock_request.return_value.__aenter__.side_effect = asyncio.TimeoutError()
+
+        async with DolibarrClient(config) as client:
+            client.retry_policy.compute_delay = MagicMock(return_value=1.0)
+            with pytest.raises(DolibarrAPIError, match="timed out"):
+                await client.get_users()
+
+        assert mock_request.call_count == 1
+        mock_sleep.assert_not_awaited()
+
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker state transitions."""
+
+    def test_opens_after_threshold_and_probes_after_timeout(self):
+        now = [0.0]
+        breaker = CircuitBreaker("invoices", failure_threshold=2, recovery_timeout=10, clock=lambda: now[0])
+
+        breaker.record_failure()
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+
+        now[0] = 10.0
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request()
+        assert not breaker.allow_request()  # only one probe at a time
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_failed_probe_reopens(self):
+        now = [0.0]
+        breaker = CircuitBreaker("products", failure_threshold=1, recovery_timeout=5, clock=lambda: now[0])
+        breaker.record_failure()
+        now[0] = 5.0
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.snapshot()["retry_in"] == 5.0
+
+    def test_only_the_probe_holder_releases_the_probe(self):
+        now = [0.0]
+        breaker = CircuitBreaker("orders", failure_threshold=1, recovery_timeout=5, clock=lambda: now[0])
+        assert breaker.allow_request()
+        ordinary = breaker.probe_id
+        assert ordinary is None
+
+        breaker.record_failure()
+        now[0] = 5.0
+        assert breaker.allow_request()
+        probe = breaker.probe_id
+
+        breaker.release_probe(ordinary)
+        assert not breaker.allow_request()
+        breaker.release_probe(probe)
+        assert breaker.allow_request()
+        assert breaker.probe_id != probe
+
+    def test_zero_threshold_disables_breaker(self):
+        breaker = CircuitBreaker("users", failure_threshold=0)
+        for _ in range(10):
+            breaker.record_failure()
+        assert breaker.allow_request()
+
+    @pytest.mark.asyncio
+    @patch("dolibarr_mcp.dolibarr_client.asyncio.sleep", new_callable=AsyncMock)
+    @patch("aiohttp.ClientSession.request")
+    async def test_client_fails_fast_per_family(self, mock_request, mock_sleep):
+        config = Config(
+            dolibarr_url="https://test.dolibarr.com/api/index.php",
+            api_key="test_key",
+            dolibarr_retry_max_retries=0,
+            dolibarr_circuit_failure_threshold=2,
+        )
+        mock_request.return_value.__aenter__.return_value = _response(502, "")
+
+        async with DolibarrClient(config) as client:
+            for _ in range(2):
+                with pytest.raises(DolibarrAPIError):
+                    await client.get_invoice_by_id(1)
+            with pytest.raises(DolibarrCircuitOpenError):
+                await client.get_invoices()
+            assert mock_request.call_count == 2
+
+            mock_request.return_value.__aenter__.return_value = _response(200, '{"id": 3}')
+            assert await client.get_product_by_id(3) == {"id": 3}
+
+            circuits = client.get_diagnostics()["circuits"]
+            assert circuits["invoices"]["state"] == "open"
+            assert circuits["products"]["state"] == "closed"
+
+
+    @pytest.mark.asyncio
+    @patch("aiohttp.ClientSession.request")
+    async def test_business_errors_do_not_open_circuit(self, mock_request):
+        config = Config(
+            dolibarr_url="https://test.dolibarr.com/api/index.php",
+            api_key="test_key",
+            dolibarr_circuit_failure_threshold=1,
+        )
+        mock_request.return_value.__aenter__.return_value = _response(500, '{"error": "Bad ref"}')
+
+        async with DolibarrClient(config) as client:
+            for _ in range(3):
+                with pytest.raises(DolibarrAPIError) as exc_info:
+                    await client.get_invoice_by_id(1)
+                assert exc_info.value.status_code == 500
+            assert client.get_diagnostics()["circuits"]["invoices"]["state"] == "closed"
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_is_released(self, config):
+        config.dolibarr_circuit_failure_threshold = 1
+        config.dolibarr_circuit_recovery_timeout = 0
+        async with DolibarrClient(config) as client:
+            client._circuit_for("invoices").record_failure()
+            started = asyncio.Event()
+
+            async def hang(*args, **kwargs):
+                started.set()
+                await asyncio.Event().wait()
+
+            probe = asyncio.ensure_future(client._request_with_retries("GET", "invoices", send=hang))
+            await started.wait()
+            probe.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await probe
+
+            async def answer(*args, **kwargs):
+                return {"id": 1}
+
+            assert await client._request_with_retries("GET", "invoices", send=answer) == {"id": 1}
+            assert client.get_diagnostics()["circuits"]["invoices"]["state"] == "closed"
+
+
+    @pytest.mark.asyncio
+    async def test_cancelled_ordinary_request_keeps_probe(self, config):
+        config.dolibarr_circuit_failure_threshold = 1
+        config.dolibarr_circuit_recovery_timeout = 0
+        async with DolibarrClient(config) as client:
+            circuit = client._circuit_for("invoices")
+            started = asyncio.Event()
+
+            async def hang(*args, **kwargs):
+                started.set()
+                await asyncio.Event().wait()
+
+            ordinary = asyncio.ensure_future(client._request_with_retries("GET", "invoices", send=hang))
+            await started.wait()
+            circuit.record_failure()
+            assert circuit.allow_request()  # another caller's probe
+
+            ordinary.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await ordinary
+            assert not circuit.allow_request()
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_before_rate_limit(self, config):
+        config.dolibarr_circuit_failure_threshold = 1
+        async with DolibarrClient(config) as client:
+            client._circuit_for("invoices").record_failure()
+            client._read_limiter.acquire = AsyncMock()
+
+            with pytest.raises(DolibarrCircuitOpenError):
+                await client.get_invoices()
+
+            client._read_limiter.acquire.assert_not_awaited()
+
+
+class TestTokenBucket:
+    """Test cases for the TokenBucket rate limiter."""
+
+    @pytest.mark.asyncio
+    @patch("dolibarr_mcp.resilience.asyncio.sleep", new_callable=AsyncMock)
+    async def test_waits_for_refill_once_burst_is_spent(self, mock_sleep):
+        now = [0.0]
+        bucket = TokenBucket(rate=2, burst=2, clock=lambda: now[0])
+
+        await bucket.acquire()
+        await bucket.acquire()
+        mock_sleep.assert_not_awaited()
+
+        await bucket.acquire()
+        mock_sleep.assert_awaited_once_with(0.5)
+        assert bucket.snapshot()["delayed_requests"] == 1
+
+    @pytest.mark.asyncio
+    @patch("dolibarr_mcp.resilience.asyncio.sleep", new_callable=AsyncMock)
+    async def test_zero_rate_is_unlimited(self, mock_sleep):
+        bucket = TokenBucket(rate=0, burst=1)
+        for _ in range(100):
+            await bucket.acquire()
+        mock_sleep.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    @patch("aiohttp.ClientSession.request")
+    async def test_client_uses_separate_read_and_write_buckets(self, mock_request):
+        config = Config(
+            dolibarr_url="https://test.dolibarr.com/api/index.php",
+            api_key="test_key",
+            dolibarr_rate_limit_reads=50,
+            dolibarr_rate_limit_writes=5,
+        )
+        mock_request.return_value.__aenter__.return_value = _response(200, '{"id": 1}')
+
+        async with DolibarrClient(config) as client:
+            with patch.object(client._read_limiter, "acquire", new_callable=AsyncMock) as read_acquire, \
+                    patch.object(client._write_limiter, "acquire", new_callable=AsyncMock) as write_acquire:
+                await client.get_product_by_id(1)
+                await client.update_product(1, label="New")
+
+            read_acquire.assert_awaited_once()
+            write_acquire.assert_awaited_once()
+            limits = client.get_diagnostics()["rate_limits"]
+            assert limits["read"]["rate"] == 50
+            assert limits["write"]["rate"] == 5
@@ -0,0 +1,139 @@
+import asyncio
+import os
+from types import SimpleNamespace
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from dolibarr_mcp import dolibarr_mcp_server
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_mcp_server import handle_call_tool, reload_config, shared_client
+
+
+@pytest.fixture
+def config():
+    return Config(
+        dolibarr_url="https://test.dolibarr.com/api/index.php",
+        api_key="test_key",
+    )
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_reuse_shared_client(config):
+    async with shared_client(config) as client:
+        session = client.session
+        client.get_user_by_id = AsyncMock(return_value={"id": 1})
+
+        with patch("dolibarr_mcp.dolibarr_mcp_server.DolibarrClient") as MockClient:
+            await handle_call_tool("get_user_by_id", {"user_id": 1})
+            await handle_call_tool("get_user_by_id", {"user_id": 1})
+
+        MockClient.assert_not_called()
+        assert client.get_user_by_id.await_count == 2
+        assert client.session is session
+
+    assert client.session is None
+    assert dolibarr_mcp_server._shared_client is None
+
+
+@pytest.mark.asyncio
+async def test_tool_call_without_lifespan_uses_short_lived_client():
+    with patch("dolibarr_mcp.dolibarr_mcp_server.DolibarrClient") as MockClient:
+        mock_instance = MockClient.return_value
+        mock_instance.__aenter__.return_value = mock_instance
+        mock_instance.get_status = AsyncMock(return_value={"success": 1})
+
+        result = await handle_call_tool("get_status", {})
+
+    MockClient.assert_called_once()
+    mock_instance.__aexit__.assert_awaited_once()
+    assert "success" in result[0].text
+
+
+@pytest.mark.asyncio
+async def test_compact_output_mode():
+    config = Config(
+        dolibarr_url="https://test.dolibarr.com/api/index.php",
+        api_key="test_key",
+        mcp_json_output="compact",
+    )
+    async with shared_client(config) as client:
+        client.get_user_by_id = AsyncMock(return_value={"id": 1, "login": "admin"})
+        result = await handle_call_tool("get_user_by_id", {"user_id": 1})
+
+    assert result[0].text == '{"id":1,"login":"admin"}'
+
+
+@pytest.fixture
+def reload_env(monkeypatch):
+    """Point configuration reloads at a controlled environment."""
+    monkeypatch.setattr(dolibarr_mcp_server, "reload_env_file", lambda: None)
+    monkeypatch.setattr(dolibarr_mcp_server, "RETIRE_POLL_INTERVAL", 0.01)
+    monkeypatch.setenv("DOLIBARR_URL", "https://test.dolibarr.com/api/index.php")
+    monkeypatch.setenv("DOLIBARR_API_KEY", "test_key")
+    return monkeypatch
+
+
+@pytest.mark.asyncio
+async def test_reload_swaps_client_without_dropping_in_flight_calls(config, reload_env):
+    release = asyncio.Event()
+
+    async def slow_lookup(user_id):
+        await release.wait()
+        return {"id": user_id}
+
+    async with shared_client(config) as old_client:
+        old_client.get_user_by_id = slow_lookup
+        call = asyncio.create_task(handle_call_tool("get_user_by_id", {"user_id": 7}))
+        await asyncio.sleep(0)
+
+        reload_env.setenv("MCP_TOOL_PROFILE", "readonly")
+        assert await reload_config() is True
+        new_client = dolibarr_mcp_server._shared_client
+
+        assert new_client is not old_client
+        assert dolibarr_mcp_server.get_config().mcp_tool_profile == "readonly"
+        assert old_client.session is not None
+
+        release.set()
+        result = await call
+        await asyncio.sleep(0.05)
+
+        assert '"id": 7' in result[0].text
+        assert old_client.session is None
+        assert new_client.session is not None
+
+    assert new_client.session is None
+
+
+@pytest.mark.asyncio
+async def test_failed_reload_keeps_current_config(config, reload_env):
+    async with shared_client(config) as client:
+        with patch("dolibarr_mcp.dolibarr_mcp_server.Config", side_effect=ValueError("bad value")):
+            assert await reload_config() is False
+
+        assert dolibarr_mcp_server._shared_client is client
+        assert dolibarr_mcp_server.get_config() is config
+
+
+@pytest.mark.asyncio
+async def test_env_file_change_triggers_reload(tmp_path, monkeypatch):
+    env_file = tmp_path / ".env"
+    env_file.write_text("LOG_LEVEL=INFO\n")
+    monkeypatch.setattr(dolibarr_mcp_server, "env_file_path", lambda: str(env_file))
+    reload = AsyncMock(return_value=True)
+    monkeypatch.setattr(dolibarr_mcp_server, "reload_config", reload)
+    settings = SimpleNamespace(mcp_config_watch_interval=0.01)
+    monkeypatch.setattr(dolibarr_mcp_server, "get_config", lambda: settings)
+
+    watcher = asyncio.create_task(dolibarr_mcp_server._watch_env_file())
+    await asyncio.sleep(0.03)
+    reload.assert_not_called()
+
+    os.utime(env_file, (0, 0))
+    await asyncio.sleep(0.05)
+    reload.assert_awaited_once()
+
+    # A reloaded interval is picked up on the next check; 0 stops the watcher
+    settings.mcp_config_watch_interval = 0
+    await asyncio.wait_for(watcher, timeout=1)
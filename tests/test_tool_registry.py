@@ -0,0 +1,180 @@
+"""Tests for the declarative tool registry."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from mcp.server.lowlevel.server import request_ctx
+from mcp.shared.context import RequestContext
+
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrClient
+from dolibarr_mcp.dolibarr_mcp_server import handle_call_tool, handle_list_tools, shared_client
+from dolibarr_mcp.profiles import TOOL_PROFILES
+from dolibarr_mcp.tools import TOOL_REGISTRY, TOOLS, profile_tools
+
+
+class TestToolRegistry:
+    """Test the registry definitions and dict-based dispatch."""
+
+    def test_specs_are_consistent(self):
+        assert len(TOOL_REGISTRY) == len(TOOLS)
+        for spec in TOOLS:
+            assert (spec.method is None) != (spec.handler is None), spec.name
+            if spec.method:
+                assert hasattr(DolibarrClient, spec.method), spec.name
+            properties = spec.input_schema["properties"]
+            for name in list(spec.positional) + list(spec.rename):
+                assert name in properties, spec.name
+            for name in spec.positional:
+                assert name in spec.input_schema.get("required", []), spec.name
+
+    @pytest.mark.asyncio
+    async def test_list_tools_is_built_from_registry(self):
+        tools = await handle_list_tools()
+        assert [tool.name for tool in tools] == [spec.name for spec in TOOLS]
+        assert tools[0].inputSchema == TOOLS[0].input_schema
+
+    @pytest.mark.asyncio
+    async def test_tool_list_is_built_once(self):
+        assert await handle_list_tools() is await handle_list_tools()
+
+    @pytest.mark.parametrize("name, arguments, method, args, kwargs", [
+        ("get_users", {}, "get_users", (), {"limit": 100, "page": 1}),
+        ("get_invoices", {"limit": 5}, "get_invoices", (), {"limit": 5, "status": None}),
+        ("update_customer", {"customer_id": 7, "name": "Acme"}, "update_customer", (7,), {"name": "Acme"}),
+        ("delete_invoice_line", {"invoice_id": 1, "line_id": 2}, "delete_invoice_line", (1, 2), {}),
+        ("create_invoice_draft", {"customer_id": 3, "date": "2024-01-01", "project_id": 9}, "create_invoice",
+         (), {"socid": 3, "date": "2024-01-01", "fk_project": 9}),
+        ("set_invoice_project", {"invoice_id": 1, "project_id": 9}, "update_invoice", (1,), {"fk_project": 9}),
+    ])
+    @pytest.mark.asyncio
+    async def test_arguments_are_mapped_to_client_calls(self, name, arguments, method, args, kwargs):
+        with patch("dolibarr_mcp.dolibarr_mcp_server.DolibarrClient") as MockClient:
+            mock_instance = MockClient.return_value
+            mock_instance.__aenter__.return_value = mock_instance
+            setattr(mock_instance, method, AsyncMock(return_value={"id": 1}))
+
+            await handle_call_tool(name, dict(arguments))
+
+        getattr(mock_instance, method).assert_awaited_once_with(*args, **kwargs)
+
+    @pytest.mark.asyncio
+    async def test_unknown_tool_does_not_open_a_client(self):
+        with patch("dolibarr_mcp.dolibarr_mcp_server.DolibarrClient") as MockClient:
+            result = await handle_call_tool("no_such_tool", {})
+
+        MockClient.assert_not_called()
+        assert "Unknown tool: no_such_tool" in result[0].text
+
+
+def _config(profile):
+    return Config(
+        dolibarr_url="https://test.dolibarr.com/api/index.php",
+        api_key="test_key",
+        mcp_tool_profile=profile,
+    )
+
+
+def _http_request(headers):
+    """Make the handlers see an HTTP request carrying ``headers``."""
+    return request_ctx.set(RequestContext(
+        request_id=1, meta=None, session=None, lifespan_context=None,
+        request=SimpleNamespace(headers=headers),
+    ))
+
+
+class TestToolProfiles:
+    """Test named tool profiles."""
+
+    def test_profiles_only_name_registered_tools(self):
+        for names in TOOL_PROFILES.values():
+            assert names is None or names <= set(TOOL_REGISTRY)
+        assert profile_tools("full") == set(TOOL_REGISTRY)
+        assert profile_tools("full", "crm") == TOOL_PROFILES["crm"]
+        with pytest.raises(ValueError, match="Unknown tool profile"):
+            profile_tools("admin")
+
+    @pytest.mark.asyncio
+    async def test_configured_profile_limits_list_and_calls(self):
+        async with shared_client(_config("readonly")) as client:
+            client.delete_customer = AsyncMock()
+            tools = await handle_list_tools()
+            result = await handle_call_tool("delete_customer", {"customer_id": 1})
+
+        assert {tool.name for tool in tools} == TOOL_PROFILES["readonly"]
+        assert len(tools) < len(TOOLS)
+        assert "profile_error" in result[0].text
+        client.delete_customer.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_http_session_header_narrows_the_profile(self):
+        async with shared_client(_config("invoicing")) as client:
+            client.get_invoice_by_id = AsyncMock(return_value={"id": 1})
+            token = _http_request({"mcp-tool-profile": "readonly"})
+            try:
+                names = {tool.name for tool in await handle_list_tools()}
+                allowed = await handle_call_tool("get_invoice_by_id", {"invoice_id": 1})
+                rejected = await handle_call_tool("validate_invoice", {"invoice_id": 1})
+            finally:
+                request_ctx.reset(token)
+
+        assert names == TOOL_PROFILES["invoicing"] & TOOL_PROFILES["readonly"]
+        assert '"id": 1' in allowed[0].text
+        assert "not available in the 'readonly' tool profile" in rejected[0].text
+
+    @pytest.mark.asyncio
+    async def test_unknown_session_profile_falls_back_to_configured(self, caplog):
+        async with shared_client(_config("crm")):
+            token = _http_request({"mcp-tool-profile": "admin"})
+            try:
+                names = {tool.name for tool in await handle_list_tools()}
+            finally:
+                request_ctx.reset(token)
+
+        assert names == TOOL_PROFILES["crm"]
+        assert "Ignoring unknown mcp-tool-profile header 'admin'" in caplog.text
+
+
+class TestArgumentValidation:
+    """Test the precompiled argument validators."""
+
+    def test_every_schema_compiles(self):
+        for spec in TOOLS:
+            problems = spec.validate({})
+            assert [problem["field"] for problem in problems] == spec.input_schema.get("required", []), spec.name
+
+    @pytest.mark.parametrize("name, arguments", [
+        ("create_invoice", {"customer_id": 1, "lines": [{"desc": "Consulting", "qty": 2, "subprice": 99.5}]}),
+        ("dolibarr_raw_api", {"method": "GET", "endpoint": "/status", "params": {"limit": 1}}),
+        ("export_resource", {"resource": "invoices", "fields": ["id", "ref"], "resume": True}),
+        ("get_users", {}),
+    ])
+    def test_valid_arguments_pass(self, name, arguments):
+        assert TOOL_REGISTRY[name].validate(arguments) == []
+
+    def test_problems_name_each_field(self):
+        problems = TOOL_REGISTRY["create_invoice"].validate({
+            "customer_id": "12",
+            "lines": [{"desc": "Consulting", "qty": "two", "subprice": 99.5, "price": 1}],
+        })
+
+        by_field = {problem["field"]: problem for problem in problems}
+        assert set(by_field) == {"customer_id", "lines.0.qty", "lines.0.price"}
+        assert "valid integer" in by_field["customer_id"]["problem"]
+        assert "desc" in by_field["lines.0.price"]["allowed"]
+
+    def test_missing_null_and_enum_values_are_rejected(self):
+        problems = TOOL_REGISTRY["dolibarr_raw_api"].validate({"method": "PATCH", "data": None})
+        fields = {problem["field"] for problem in problems}
+        assert fields == {"method", "endpoint", "data"}
+
+    @pytest.mark.asyncio
+    async def test_invalid_call_is_rejected_before_any_request(self):
+        with patch("dolibarr_mcp.dolibarr_mcp_server.DolibarrClient") as MockClient:
+            result = await handle_call_tool("get_user_by_id", {"user_id": "admin", "login": "admin"})
+
+        MockClient.assert_not_called()
+        assert '"type": "validation_error"' in result[0].text
+        assert '"field": "user_id"' in result[0].text
+        assert '"allowed": [' in result[0].text